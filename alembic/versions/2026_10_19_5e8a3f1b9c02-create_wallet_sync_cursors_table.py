@@ -0,0 +1,36 @@
+"""Create WalletSyncCursor Table
+
+Revision ID: 5e8a3f1b9c02
+Revises: c41d7e9a2b6f
+Create Date: 2026-10-19 11:47:21.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a3f1b9c02'
+down_revision: Union[str, None] = 'c41d7e9a2b6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'wallet_sync_cursors',
+        sa.Column('wallet_address', sa.String(), nullable=False),
+        sa.Column('last_fetch_signature', sa.String(), nullable=True),
+        sa.Column('first_verified_signature', sa.String(), nullable=True),
+        sa.Column('backfill_completed', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP'), onupdate=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('wallet_address')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('wallet_sync_cursors')
@@ -0,0 +1,36 @@
+"""Create TokenPrice Table
+
+Revision ID: 9d2b6c4e7a15
+Revises: 5e8a3f1b9c02
+Create Date: 2026-10-19 14:05:37.226481
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2b6c4e7a15'
+down_revision: Union[str, None] = '5e8a3f1b9c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'token_prices',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('mint', sa.String(), nullable=False),
+        sa.Column('bucket_timestamp', sa.BigInteger(), nullable=False),
+        sa.Column('price_usd', sa.Float(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False, server_default='codex'),
+        sa.Column('created_at', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mint', 'bucket_timestamp', name='uq_token_prices_mint_bucket_timestamp'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('token_prices')
@@ -0,0 +1,50 @@
+"""Create TokenTransfer Table
+
+Revision ID: c41d7e9a2b6f
+Revises: 8b53b08a3db2
+Create Date: 2026-10-19 09:12:04.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a2b6f'
+down_revision: Union[str, None] = '8b53b08a3db2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'token_transfers',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('signature', sa.String(), nullable=False),
+        sa.Column('timestamp', sa.BigInteger(), nullable=True),
+        sa.Column('slot', sa.BigInteger(), nullable=True),
+        sa.Column('fee', sa.BigInteger(), nullable=True),
+        sa.Column('fee_payer', sa.String(), nullable=True),
+        sa.Column('from_user', sa.String(), nullable=False, server_default=''),
+        sa.Column('to_user', sa.String(), nullable=False, server_default=''),
+        sa.Column('mint', sa.String(), nullable=False),
+        sa.Column('token_amount', sa.Float(), nullable=True),
+        sa.Column('decimals', sa.Integer(), nullable=True),
+        sa.Column('source', sa.String(), nullable=True),
+        sa.Column('transaction_type', sa.String(length=50), nullable=False),
+        sa.Column('gmt_creator', sa.String(), nullable=True),
+        sa.Column('gmt_created', sa.DateTime(), nullable=True, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('signature', 'mint', 'from_user', 'to_user', name='uq_token_transfers_signature_mint_from_to'),
+    )
+    # Wallet history lookups
+    op.create_index(op.f('ix_token_transfers_from_user'), 'token_transfers', ['from_user'], unique=False)
+    op.create_index(op.f('ix_token_transfers_to_user'), 'token_transfers', ['to_user'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_token_transfers_to_user'), table_name='token_transfers')
+    op.drop_index(op.f('ix_token_transfers_from_user'), table_name='token_transfers')
+    op.drop_table('token_transfers')
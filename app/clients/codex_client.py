@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+import httpx
+
+from app.infrastructure.metrics import observe_upstream
+from app.infrastructure.settings import settings
+from app.infrastructure.upstream_policy import UpstreamPolicy
+from app.utils.constant import CODEX_API_URL, CODEX_GET_PRICE_API_BATCH_SIZE
+
+GET_TOKEN_PRICES_QUERY = """
+query GetTokenPrices($inputs: [GetPriceInput]) {
+  getTokenPrices(inputs: $inputs) {
+    address
+    networkId
+    priceUsd
+    timestamp
+  }
+}
+"""
+
+
+class CodexApiError(Exception):
+    """Raised when the Codex GraphQL API returns errors."""
+
+
+@UpstreamPolicy("codex", settings.CODEX_API_KEY)
+@observe_upstream("codex", "getTokenPrices")
+async def get_token_prices(client: httpx.AsyncClient, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any] | None]:
+    """
+    Get token prices at given timestamps with one GraphQL call.
+
+    Args:
+        client: HTTP client to send the request with
+        inputs: Up to CODEX_GET_PRICE_API_BATCH_SIZE {"address", "networkId", "timestamp"} dicts
+
+    Returns:
+        One {"address", "networkId", "priceUsd", "timestamp"} dict per input, None if unknown
+    """
+    if len(inputs) > CODEX_GET_PRICE_API_BATCH_SIZE:
+        raise ValueError(f"At most {CODEX_GET_PRICE_API_BATCH_SIZE} prices per Codex call")
+
+    response = await client.post(
+        CODEX_API_URL,
+        json={"query": GET_TOKEN_PRICES_QUERY, "variables": {"inputs": inputs}},
+        headers={"Authorization": settings.CODEX_API_KEY or "", "Content-Type": "application/json"},
+        timeout=30,
+    )
+    response.raise_for_status()
+    body = response.json()
+    if body.get("errors"):
+        raise CodexApiError(str(body["errors"]))
+    return body["data"]["getTokenPrices"]
@@ -0,0 +1,167 @@
+"""
+Offline stand-in for the OpenAI chat model.
+
+Selected with LLM_PROVIDER=fake. It answers structured output calls
+(`llm.with_structured_output(Schema)`) with plausible values derived from the
+prompt tables after a configurable delay, so the optimization flow can be
+load-tested without network access or API costs.
+"""
+
+import asyncio
+import random
+import re
+import time
+import uuid
+from typing import Any, Callable, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from app.utils.constant import JITOSOL_TOKEN_ADDRESS, SOLANA_NATIVE_TOKEN_ADDRESS
+
+GAS_RESERVE_SOL = 0.04
+
+STABLECOIN_SYMBOLS = {"USDC", "USDT", "PYUSD", "USDS", "USDE", "DAI", "FDUSD", "USDG"}
+LIQUIDITY_STAKING_TOKEN_SYMBOLS = {"JITOSOL", "MSOL", "JUPSOL", "BSOL", "INF", "BNSOL", "HSOL", "STSOL", "DSOL"}
+
+# "#|symbol|name|value_usd" rows of the classification prompt
+CLASSIFICATION_ROW_REGEX = re.compile(r"^\s*(\d+)\|([^|\n]*)\|", re.MULTILINE)
+# "symbol|type|amount|value_usd|pct|mint" rows of the advice prompt
+CLASSIFIED_ASSET_ROW_REGEX = re.compile(
+    r"^\s*([^|\n]+)\|(solana|stablecoin|meme_token|yield_bearing_token|liquidity_staking_token|other)\|([^|\n]*)\|([^|\n]*)\|",
+    re.MULTILINE,
+)
+
+
+def _classify_symbol(symbol: str) -> str:
+    symbol = symbol.strip().upper()
+    if symbol == "SOL":
+        return "solana"
+    if symbol in STABLECOIN_SYMBOLS:
+        return "stablecoin"
+    if symbol in LIQUIDITY_STAKING_TOKEN_SYMBOLS:
+        return "liquidity_staking_token"
+    return "other"
+
+
+def _fake_asset_classification_list(prompt: str) -> dict[str, Any]:
+    return {
+        "classifications": [
+            {"index": int(index), "type": _classify_symbol(symbol)}
+            for index, symbol in CLASSIFICATION_ROW_REGEX.findall(prompt)
+        ]
+    }
+
+
+def _fake_optimization_response(prompt: str) -> dict[str, Any]:
+    sol_amount = 0.0
+    idle_value = 0.0
+    total_value = 0.0
+    for symbol, asset_type, amount, value in CLASSIFIED_ASSET_ROW_REGEX.findall(prompt):
+        asset_value = float(value or 0)
+        total_value += asset_value
+        if asset_type == "solana":
+            sol_amount += float(amount or 0)
+        if asset_type in ("solana", "stablecoin"):
+            idle_value += asset_value
+
+    idle_share = idle_value / total_value if total_value else 0
+    wallet_score = "A" if idle_share < 0.2 else "B" if idle_share < 0.5 else "C"
+
+    recommendations = []
+    actions = []
+    stake_amount = round(sol_amount - GAS_RESERVE_SOL, 6)
+    if stake_amount > 0:
+        recommendations.append(
+            {
+                "title": "Stake idle SOL",
+                "description": f"{sol_amount} SOL is idle, stake it through JitoSOL to earn staking and MEV rewards.",
+                "action": f"Swap {stake_amount} SOL to JITOSOL",
+                "potentialReturn": "~7% APY",
+                "riskLevel": "Low",
+                "implementationDifficulty": "Easy",
+                "timeHorizon": "Long term",
+            }
+        )
+        actions.append(
+            {
+                "input_mint": SOLANA_NATIVE_TOKEN_ADDRESS,
+                "output_mint": JITOSOL_TOKEN_ADDRESS,
+                "amount": stake_amount,
+                "optimization_action_detail": f"swap {stake_amount} SOL to JITOSOL to get more yield",
+            }
+        )
+
+    return {
+        "wallet_score": wallet_score,
+        "wallet_total_suggestion": f"{idle_share:.0%} of the portfolio is idle SOL or stablecoins.",
+        "recommendations_list": recommendations,
+        "optimization_actions": actions,
+    }
+
+
+FAKE_TOOL_RESPONSES: dict[str, Callable[[str], dict[str, Any]]] = {
+    "AssetClassificationList": _fake_asset_classification_list,
+    "OptimizationResponse": _fake_optimization_response,
+}
+
+
+class FakeStructuredChatModel(BaseChatModel):
+    """Chat model answering structured output calls offline with a simulated latency."""
+
+    latency_seconds: float = 1.0
+    latency_jitter_seconds: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-structured-chat"
+
+    def bind_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        tool_choice: str | None = None,
+        **kwargs: Any,
+    ) -> Runnable:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _latency(self) -> float:
+        return self.latency_seconds + random.uniform(0, self.latency_jitter_seconds)
+
+    def _respond(self, messages: list[BaseMessage], tools: list[dict] | None) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        if not tools:
+            message = AIMessage(content="Hold SOL and stake idle balances.")
+        else:
+            tool_name = tools[0]["function"]["name"]
+            fake_response = FAKE_TOOL_RESPONSES.get(tool_name, lambda _: {})
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": tool_name, "args": fake_response(prompt), "id": f"call_{uuid.uuid4().hex}"}
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._latency())
+        return self._respond(messages, kwargs.get("tools"))
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._latency())
+        return self._respond(messages, kwargs.get("tools"))
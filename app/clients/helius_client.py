@@ -1,8 +1,18 @@
 import requests
+from typing import Any, Dict, List, Optional, Tuple
+from app.infrastructure.metrics import observe_upstream
 from app.infrastructure.settings import settings
-from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO, AssetDTO
+from app.infrastructure.upstream_policy import UpstreamPolicy
+from app.utils.constant import HELIUS_API_BASE_URL, HELIUS_TRANSACTION_HISTORY_PAGE_SIZE, WALLET_PROVIDER_TIMEOUT_SECONDS
+from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
 from app.enums.chain_enum import ChainEnum
+from app.dtos.mint_metadata_dto import MintMetadataDTO
+from app.services.mint_metadata_service import mint_metadata_registry
+from app.utils.token_amount_util import from_base_units
+from app.utils.wallet_asset_util import AssetRow, build_wallet_response
 
+@UpstreamPolicy("helius", settings.HELIUS_API_KEY)
+@observe_upstream("helius", "getAssetsByOwner")
 def get_wallet_data_by_helius(wallet_address: str) -> WalletTotalResponseDTO:
     """
     Fetch asset data from Helius API and return as a validated DTO.
@@ -23,66 +33,106 @@ def get_wallet_data_by_helius(wallet_address: str) -> WalletTotalResponseDTO:
             }
         }
     }
-    response = requests.post(url, headers=headers, json=payload)
+    response = requests.post(url, headers=headers, json=payload, timeout=WALLET_PROVIDER_TIMEOUT_SECONDS)
     response.raise_for_status()
-    data = response.json()
-    result = data.get('result', {})
+    wallet, mint_metadata = parse_helius_assets(wallet_address, response.json().get('result', {}))
+    # The balances already carry mint decimals and programs, keep them for building swaps later
+    mint_metadata_registry.remember_many(mint_metadata)
+    return wallet
+
+
+def parse_helius_assets(
+    wallet_address: str, result: Dict[str, Any]
+) -> Tuple[WalletTotalResponseDTO, List[MintMetadataDTO]]:
+    """
+    Turn a getAssetsByOwner result into the wallet response, plus the mint metadata it reveals.
+    """
     items = result.get('items', [])
     native_balance = result.get('nativeBalance', {})
-    assets = []
+    rows = []
+    mint_metadata = []
     total_value = 0.0
     # Parse fungible tokens
     for item in items:
         if item.get('interface') == 'FungibleToken' and 'token_info' in item:
-            meta = item.get('content', {}).get('metadata', {})
+            content = item.get('content', {})
+            meta = content.get('metadata', {})
             token_info = item.get('token_info', {})
             price_info = token_info.get('price_info', {})
-            image_url = item.get('content', {}).get('links', {}).get('image')
-            amount = token_info.get('balance', 0) / (10 ** token_info.get('decimals', 0))
+            decimals = token_info.get('decimals', 0)
+            mint = item.get('id', '')
+            if 'decimals' in token_info and token_info.get('token_program'):
+                mint_metadata.append(MintMetadataDTO(
+                    mint=mint,
+                    decimals=decimals,
+                    token_program=token_info['token_program'],
+                ))
             value = price_info.get('total_price', 0)
-            price = price_info.get('price_per_token', 0)
             total_value += value
-            assets.append(AssetDTO(
+            rows.append(AssetRow(
                 name=meta.get('name', ''),
                 symbol=meta.get('symbol', ''),
-                amount=amount,
+                amount=from_base_units(token_info.get('balance', 0), decimals),
                 value=value,
-                percentage=0,  # will be filled later
-                tokenId=item.get('id', ''),
-                decimals=token_info.get('decimals', 0),
-                price=price,
+                token_id=mint,
+                decimals=decimals,
+                price=price_info.get('price_per_token', 0),
                 currency=price_info.get('currency', 'USDC'),
-                imageUrl=image_url,
+                image_url=content.get('links', {}).get('image'),
+                chain=ChainEnum.SOLANA,
             ))
     # Add native SOL
     if native_balance and native_balance.get('lamports', 0) > 0:
-        sol_amount = native_balance['lamports'] / 1_000_000_000
         sol_value = native_balance.get('total_price', 0)
-        sol_price = native_balance.get('price_per_sol', 0)
         total_value += sol_value
-        assets.append(AssetDTO(
+        rows.append(AssetRow(
             name="Solana",
             symbol="SOL",
-            amount=sol_amount,
+            amount=from_base_units(native_balance['lamports'], 9),
             value=sol_value,
-            percentage=0,  # will be filled later
-            tokenId="SOL",
+            token_id="SOL",
             decimals=9,
-            price=sol_price,
+            price=native_balance.get('price_per_sol', 0),
             currency="USDC",
-            imageUrl=None,
+            chain=ChainEnum.SOLANA,
         ))
-    # Calculate percentages
-    for asset in assets:
-        if total_value > 0:
-            asset.percentage = round((asset.value / total_value) * 100, 1)
-        else:
-            asset.percentage = 0
-    # Sort assets by value descending
-    assets = sorted(assets, key=lambda x: x.value, reverse=True)
-    return WalletTotalResponseDTO(
-        address=wallet_address,
-        assets=assets,
-        totalValue=round(total_value, 2),
-        chain=ChainEnum.SOLANA,
-    )
\ No newline at end of file
+    wallet = build_wallet_response(wallet_address, ChainEnum.SOLANA, rows, total_value)
+    return wallet, mint_metadata
+
+
+# Keep-alive session for paging through transaction history
+_history_session = requests.Session()
+
+
+@UpstreamPolicy("helius", settings.HELIUS_API_KEY)
+@observe_upstream("helius", "addressTransactions")
+def get_parsed_transaction_history(
+    wallet_address: str,
+    before: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = HELIUS_TRANSACTION_HISTORY_PAGE_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one page of a wallet's parsed (enhanced) transactions from Helius, newest first.
+
+    Args:
+        wallet_address: Solana wallet address
+        before: Only return transactions older than this signature
+        until: Only return transactions newer than this signature
+        limit: Page size (max 100)
+
+    Returns:
+        List of enhanced transactions, in the same format as webhook payloads
+    """
+    params = {"api-key": settings.HELIUS_API_KEY, "limit": limit}
+    if before:
+        params["before"] = before
+    if until:
+        params["until"] = until
+    response = _history_session.get(
+        f"{HELIUS_API_BASE_URL}/v0/addresses/{wallet_address}/transactions",
+        params=params,
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any
+
+import httpx
+from cachetools import TTLCache
+
+from app.utils.constant import JUPITER_LITE_API_BASE_URL, JUPITER_QUOTE_CACHE_SECONDS
+from app.infrastructure.metrics import observe_upstream, record_cache_lookup
+from app.infrastructure.upstream_policy import UpstreamPolicy
+
+
+class JupiterApiError(Exception):
+    """Raised when the Jupiter API returns a non-200 response."""
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+        super().__init__(text)
+
+
+class JupiterClient:
+    """
+    Long-lived Jupiter swap API client.
+
+    Holds one HTTP/2 connection pool for the whole process (create it once in the
+    app lifespan) and caches quotes for a few seconds, keyed by
+    (inputMint, outputMint, amount, slippage).
+    """
+
+    def __init__(self, base_url: str = JUPITER_LITE_API_BASE_URL):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            timeout=httpx.Timeout(15, connect=5),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+            headers={"Accept": "application/json"},
+        )
+        self._quote_cache: TTLCache = TTLCache(maxsize=1024, ttl=JUPITER_QUOTE_CACHE_SECONDS)
+        self._inflight_quotes: dict[tuple, asyncio.Future] = {}
+        # The lite API has no key, its limit is per client IP
+        self._upstream_policy = UpstreamPolicy("jupiter")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        return await self._upstream_policy.acall(self._send, method, path, **kwargs)
+
+    async def _send(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        async with observe_upstream("jupiter", path):
+            response = await self._client.request(method, path, **kwargs)
+            if response.status_code != 200:
+                raise JupiterApiError(response.status_code, response.text)
+            return response.json()
+
+    async def get_quote(
+        self, input_mint: str, output_mint: str, amount: int, slippage_bps: int
+    ) -> dict[str, Any]:
+        """
+        Get a swap quote for exactly `amount` (in base units).
+
+        The quote is also what the swap is built from, so only requests for the
+        same amount share it: identical concurrent requests share one upstream call,
+        and successful quotes are cached for JUPITER_QUOTE_CACHE_SECONDS.
+        """
+        cache_key = (input_mint, output_mint, amount, slippage_bps)
+        cached_quote = self._quote_cache.get(cache_key)
+        inflight = self._inflight_quotes.get(cache_key)
+        # Joining an in-flight request counts as a hit, it costs no upstream call
+        record_cache_lookup("jupiter_quote", hit=cached_quote is not None or inflight is not None)
+        if cached_quote is not None:
+            return cached_quote
+
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_quotes[cache_key] = future
+        try:
+            quote = await self._request(
+                "GET",
+                "/quote",
+                params={
+                    "inputMint": input_mint,
+                    "outputMint": output_mint,
+                    "amount": str(amount),
+                    "slippageBps": slippage_bps,
+                },
+            )
+            self._quote_cache[cache_key] = quote
+            future.set_result(quote)
+            return quote
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._inflight_quotes[cache_key]
+
+    async def get_swap_transaction(
+        self,
+        quote: dict[str, Any],
+        user_public_key: str,
+        prioritization_fee_lamports: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Build the swap transaction for a quote."""
+        return await self._request(
+            "POST",
+            "/swap",
+            headers={"Content-Type": "application/json"},
+            json={
+                "userPublicKey": user_public_key,
+                "quoteResponse": quote,
+                "prioritizationFeeLamports": prioritization_fee_lamports,
+                "dynamicComputeUnitLimit": True,
+            },
+        )
@@ -1,14 +1,196 @@
+import threading
+import time
+from typing import Any
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
 from langchain_openai import ChatOpenAI
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from app.infrastructure.metrics import UPSTREAM_REQUEST_DURATION, UPSTREAM_REQUEST_ERRORS
+from app.infrastructure.tracing import tracer
 from app.infrastructure.settings import settings
+from app.infrastructure.rate_limiter import RateLimitExceededError, RedisRateLimiter
+from app.clients.fake_llm_model_client import FakeStructuredChatModel
 from langchain_core.language_models.chat_models import BaseChatModel
+from app.utils.circuit_breaker_util import CircuitBreaker, CircuitOpenError
+from app.utils.constant import (
+    OPENAI_CIRCUIT_FAILURE_THRESHOLD,
+    OPENAI_CIRCUIT_RECOVERY_SECONDS,
+    OPENAI_CONNECT_TIMEOUT_SECONDS,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_REQUEST_TIMEOUT_SECONDS,
+)
+
+
+class LLMRateLimiter(BaseRateLimiter):
+    """LangChain rate limiter that fails fast while the circuit is open, then waits for a shared Redis slot."""
+
+    def __init__(self, rate_limiter: RedisRateLimiter, circuit_breaker: CircuitBreaker):
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        is_trial = self.circuit_breaker.before_call()
+        try:
+            acquired = self.rate_limiter.acquire(blocking=blocking)
+        except BaseException:
+            self._release_trial(is_trial)
+            raise
+        if not acquired:
+            self._release_trial(is_trial)
+        return acquired
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        is_trial = self.circuit_breaker.before_call()
+        try:
+            acquired = await self.rate_limiter.aacquire(blocking=blocking)
+        except BaseException:
+            self._release_trial(is_trial)
+            raise
+        if not acquired:
+            self._release_trial(is_trial)
+        return acquired
+
+    def _release_trial(self, is_trial: bool) -> None:
+        # The trial call never reached OpenAI (no slot in time, cancelled), its outcome will not be recorded
+        if is_trial:
+            self.circuit_breaker.release_trial()
+
+
+class CircuitBreakerCallbackHandler(BaseCallbackHandler):
+    """Feeds LLM call outcomes into the circuit breaker."""
+
+    def __init__(self, circuit_breaker: CircuitBreaker):
+        self.circuit_breaker = circuit_breaker
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        self.circuit_breaker.record_success()
+
+    def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        # Calls rejected locally never reached OpenAI, they say nothing about its health
+        if isinstance(error, (CircuitOpenError, RateLimitExceededError)):
+            return
+        self.circuit_breaker.record_failure()
+
+
+class LLMTelemetryCallbackHandler(BaseCallbackHandler):
+    """Records OpenAI call latency and errors in the shared upstream metrics, and a span per call."""
+
+    # Run in the caller's context, so the span's parent is the graph node calling the model
+    run_inline = True
+
+    def __init__(self, method: str):
+        self.method = method
+        self._runs: dict[Any, tuple[float, Any]] = {}
+
+    def _start(self, run_id: Any) -> None:
+        span = tracer.start_span(
+            f"openai {self.method}",
+            kind=SpanKind.CLIENT,
+            attributes={"upstream.provider": "openai", "upstream.method": self.method},
+        )
+        self._runs[run_id] = (time.perf_counter(), span)
 
+    def _finish(self, run_id: Any) -> Any:
+        started_at, span = self._runs.pop(run_id, (None, None))
+        if started_at is not None:
+            UPSTREAM_REQUEST_DURATION.labels("openai", self.method).observe(time.perf_counter() - started_at)
+        return span
 
-def get_llm_model() -> BaseChatModel:
-    model = ChatOpenAI(
+    def on_chat_model_start(self, serialized: Any, messages: Any, *, run_id: Any, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_start(self, serialized: Any, prompts: Any, *, run_id: Any, **kwargs: Any) -> None:
+        self._start(run_id)
+
+    def on_llm_end(self, response: Any, *, run_id: Any, **kwargs: Any) -> None:
+        span = self._finish(run_id)
+        if span is not None:
+            token_usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+            for key in ("prompt_tokens", "completion_tokens"):
+                if token_usage.get(key) is not None:
+                    span.set_attribute(f"llm.{key}", token_usage[key])
+            span.end()
+
+    def on_llm_error(self, error: BaseException, *, run_id: Any, **kwargs: Any) -> None:
+        span = self._finish(run_id)
+        UPSTREAM_REQUEST_ERRORS.labels("openai", self.method, type(error).__name__).inc()
+        if span is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+            span.end()
+
+
+# Process-wide registry, one client (and one connection pool) per model
+_llm_models: dict[str | None, BaseChatModel] = {}
+_llm_models_lock = threading.Lock()
+
+openai_circuit_breaker = CircuitBreaker(
+    name="openai",
+    failure_threshold=OPENAI_CIRCUIT_FAILURE_THRESHOLD,
+    recovery_timeout=OPENAI_CIRCUIT_RECOVERY_SECONDS,
+    # Slot wait, then the request and its two retries (max_retries=2)
+    trial_timeout=settings.OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS + 3 * OPENAI_REQUEST_TIMEOUT_SECONDS,
+)
+
+
+def _create_openai_model(model_name: str | None) -> BaseChatModel:
+    timeout = httpx.Timeout(OPENAI_REQUEST_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+    limits = httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    )
+    rate_limiter = LLMRateLimiter(
+        rate_limiter=RedisRateLimiter(
+            name="openai",
+            requests_per_second=settings.OPENAI_REQUESTS_PER_SECOND,
+            burst=settings.OPENAI_RATE_LIMIT_BURST,
+            max_wait_seconds=settings.OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS,
+        ),
+        circuit_breaker=openai_circuit_breaker,
+    )
+    model_kwargs = {"model": model_name} if model_name else {}
+    return ChatOpenAI(
+        **model_kwargs,
         temperature=0,
         max_tokens=None,
-        timeout=None,
+        timeout=timeout,
         max_retries=2,
         api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.Client(timeout=timeout, limits=limits),
+        http_async_client=httpx.AsyncClient(timeout=timeout, limits=limits),
+        rate_limiter=rate_limiter,
+        callbacks=[
+            CircuitBreakerCallbackHandler(openai_circuit_breaker),
+            LLMTelemetryCallbackHandler(model_name or "default"),
+        ],
     )
-    return model
\ No newline at end of file
+
+
+def _create_llm_model(model_name: str | None) -> BaseChatModel:
+    if settings.LLM_PROVIDER == "fake":
+        return FakeStructuredChatModel(
+            latency_seconds=settings.FAKE_LLM_LATENCY_SECONDS,
+            latency_jitter_seconds=settings.FAKE_LLM_LATENCY_JITTER_SECONDS,
+        )
+    return _create_openai_model(model_name)
+
+
+def get_llm_model(model_name: str | None = None) -> BaseChatModel:
+    """
+    Get the shared chat model for `model_name` (the provider default if None).
+
+    The model is created once per process and reused, so every call shares the
+    same pooled HTTP connections, rate limiter and circuit breaker.
+    With LLM_PROVIDER=fake an offline stand-in is returned instead.
+    """
+    model = _llm_models.get(model_name)
+    if model is not None:
+        return model
+
+    with _llm_models_lock:
+        if model_name not in _llm_models:
+            _llm_models[model_name] = _create_llm_model(model_name)
+        return _llm_models[model_name]
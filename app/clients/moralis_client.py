@@ -1,54 +1,140 @@
-from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO, AssetDTO
-from moralis import evm_api
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
+from app.infrastructure.metrics import observe_upstream
 from app.infrastructure.settings import settings
+from app.infrastructure.upstream_policy import UpstreamPolicy
 from app.enums.chain_enum import ChainEnum
+from app.utils.constant import MORALIS_API_BASE_URL, MORALIS_CHAIN_TIMEOUT_SECONDS
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.wallet_asset_util import AssetRow, build_wallet_response
+
+_moralis_http_client: httpx.AsyncClient | None = None
+
+
+def get_moralis_http_client() -> httpx.AsyncClient:
+    """Get the process-wide Moralis HTTP client, created on first use and closed in the app lifespan."""
+    global _moralis_http_client
+    if _moralis_http_client is None:
+        _moralis_http_client = httpx.AsyncClient(
+            base_url=MORALIS_API_BASE_URL,
+            timeout=httpx.Timeout(MORALIS_CHAIN_TIMEOUT_SECONDS, connect=5),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+        )
+    return _moralis_http_client
+
+
+async def close_moralis_http_client() -> None:
+    global _moralis_http_client
+    if _moralis_http_client is not None:
+        await _moralis_http_client.aclose()
+        _moralis_http_client = None
 
-def get_wallet_data_by_moralis(wallet_address: str, chain: ChainEnum = ChainEnum.BASE) -> WalletTotalResponseDTO:
-    params = {
-        "address": wallet_address,
-        "chain": chain.value,
-    }
-    result = evm_api.wallets.get_wallet_token_balances_price(
-        api_key=settings.MORALIS_API_KEY,
-        params=params,
+
+@UpstreamPolicy("moralis", settings.MORALIS_API_KEY)
+@observe_upstream("moralis", "getWalletTokenBalancesPrice")
+async def get_wallet_token_balances_price(wallet_address: str, chain: ChainEnum) -> Dict[str, Any]:
+    """Token balances of a wallet on one EVM chain, with USD prices (first page, as the Moralis SDK returned it)."""
+    response = await get_moralis_http_client().get(
+        f"/wallets/{wallet_address}/tokens",
+        params={"chain": chain.value},
+        headers={"X-API-Key": settings.MORALIS_API_KEY or ""},
     )
-    assets = []
+    response.raise_for_status()
+    return response.json()
+
+
+def _parse_moralis_rows(chain: ChainEnum, result: Dict[str, Any]) -> Tuple[List[AssetRow], float]:
+    rows = []
     total_value = 0.0
     tokens = result.get('result', [])
     for token in tokens:
-        name = token.get("name", "")
-        symbol = token.get("symbol", "")
-        amount = float(token.get("balance", 0)) / (10 ** int(token.get("decimals", 0) or 0))
-        value = float(token.get("usd_value") or 0)
-        price = float(token.get("usd_price") or 0)
-        token_id = token.get("token_address") or token.get("address") or ""
         decimals = int(token.get("decimals", 0) or 0)
-        currency = "USD"
-        image_url = token.get("logo") or token.get("thumbnail") or None
+        value = float(token.get("usd_value") or 0)
         total_value += value
-        assets.append(AssetDTO(
-            name=name,
-            symbol=symbol,
-            amount=amount,
+        rows.append(AssetRow(
+            name=token.get("name", ""),
+            symbol=token.get("symbol", ""),
+            amount=float(token.get("balance", 0)) / (10 ** decimals),
             value=value,
-            percentage=0,  # will be filled later
-            tokenId=token_id,
+            token_id=token.get("token_address") or token.get("address") or "",
             decimals=decimals,
-            price=price,
-            currency=currency,
-            imageUrl=image_url,
+            price=float(token.get("usd_price") or 0),
+            currency="USD",
+            image_url=token.get("logo") or token.get("thumbnail") or None,
+            chain=chain,
         ))
-    # Calculate percentages
-    for asset in assets:
-        if total_value > 0:
-            asset.percentage = round((asset.value / total_value) * 100, 1)
-        else:
-            asset.percentage = 0
-    # Sort by value descending
-    assets = sorted(assets, key=lambda x: x.value, reverse=True)
-    return WalletTotalResponseDTO(
-        address=wallet_address,
-        assets=assets,
-        totalValue=round(total_value, 2),
-        chain=chain,
-    )
\ No newline at end of file
+    return rows, total_value
+
+
+def parse_moralis_balances(wallet_address: str, chain: ChainEnum, result: Dict[str, Any]) -> WalletTotalResponseDTO:
+    """Turn a Moralis wallet token balances (with prices) result into the wallet response."""
+    rows, total_value = _parse_moralis_rows(chain, result)
+    return build_wallet_response(wallet_address, chain, rows, total_value)
+
+
+async def _fetch_chain_balances(wallet_address: str, chain: ChainEnum) -> Dict[str, Any]:
+    # Total time bound for the chain, the client timeout only bounds each network operation
+    return await asyncio.wait_for(
+        get_wallet_token_balances_price(wallet_address, chain),
+        timeout=MORALIS_CHAIN_TIMEOUT_SECONDS,
+    )
+
+
+async def get_evm_portfolio_by_moralis(
+    wallet_address: str, chains: Optional[List[ChainEnum]] = None
+) -> WalletTotalResponseDTO:
+    """
+    Portfolio of an EVM wallet across chains, fetched from all chains concurrently.
+
+    Takes as long as the slowest chain, at most MORALIS_CHAIN_TIMEOUT_SECONDS. A chain
+    that fails or times out is left out of the assets and reported with its error in
+    the per-chain breakdown.
+
+    Args:
+        wallet_address: EVM wallet address
+        chains: Chains to query, MORALIS_EVM_CHAINS by default
+
+    Returns:
+        WalletTotalResponseDTO on ChainEnum.EVM, assets tagged with their chain
+
+    Raises:
+        Exception: the first chain's error if no chain could be fetched
+    """
+    chains = chains or settings.MORALIS_EVM_CHAINS
+    results = await asyncio.gather(
+        *(_fetch_chain_balances(wallet_address, chain) for chain in chains),
+        return_exceptions=True,
+    )
+
+    rows: List[AssetRow] = []
+    chain_totals = []
+    total_value = 0.0
+    for chain, result in zip(chains, results):
+        if isinstance(result, BaseException):
+            error = "timeout" if isinstance(result, asyncio.TimeoutError) else f"{type(result).__name__}: {result}"
+            log_message(LogLevel.WARNING, "Moralis chain fetch failed", chain=chain.value, error=error)
+            chain_totals.append((chain, 0.0, 0, error))
+            continue
+        chain_rows, chain_value = _parse_moralis_rows(chain, result)
+        rows.extend(chain_rows)
+        total_value += chain_value
+        chain_totals.append((chain, chain_value, len(chain_rows), None))
+
+    if all(error is not None for _, _, _, error in chain_totals):
+        raise next(result for result in results if isinstance(result, BaseException))
+
+    breakdown = [
+        {
+            "chain": chain,
+            "totalValue": round(chain_value, 2),
+            "percentage": round((chain_value / total_value) * 100, 1) if total_value > 0 else 0,
+            "assetCount": asset_count,
+            "error": error,
+        }
+        for chain, chain_value, asset_count, error in sorted(chain_totals, key=lambda entry: entry[1], reverse=True)
+    ]
+    return build_wallet_response(wallet_address, ChainEnum.EVM, rows, total_value, chains=breakdown)
@@ -0,0 +1,185 @@
+import itertools
+from typing import Any, Iterable
+
+import httpx
+
+from app.infrastructure.metrics import observe_upstream
+from app.infrastructure.settings import settings
+from app.infrastructure.upstream_policy import UpstreamPolicy
+from app.utils.constant import HELIUS_BASE_URL, SOLANA_RPC_MAX_ACCOUNTS_PER_CALL
+
+
+class SolanaRpcError(Exception):
+    """Raised when the RPC node answers with a JSON-RPC error."""
+
+    def __init__(self, method: str, error: dict[str, Any]):
+        self.method = method
+        self.code = error.get("code")
+        self.error = error
+        super().__init__(f"{method} failed: {error.get('message', error)}")
+
+
+class SolanaRpcClient:
+    """
+    Async Solana JSON-RPC facade over one pooled HTTP connection pool.
+
+    Create it once per process (see `get_solana_rpc_client`). Account lookups
+    go through `getMultipleAccounts`, so checking N accounts costs one round trip
+    per 100 accounts, and independent calls can be sent as one JSON-RPC batch.
+    """
+
+    def __init__(self, rpc_url: str | None = None):
+        self._rpc_url = rpc_url or f"{HELIUS_BASE_URL}/?api-key={settings.HELIUS_API_KEY}"
+        # The default node is Helius, its RPC calls count against the same key as the DAS API
+        self._upstream_policy = (
+            UpstreamPolicy("solana_rpc", rpc_url) if rpc_url else UpstreamPolicy("helius", settings.HELIUS_API_KEY)
+        )
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15, connect=5),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+            headers={"Content-Type": "application/json"},
+        )
+        self._request_ids = itertools.count(1)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _post(self, payload: Any, method: str) -> Any:
+        return await self._upstream_policy.acall(self._send, payload, method)
+
+    async def _send(self, payload: Any, method: str) -> Any:
+        async with observe_upstream("solana_rpc", method):
+            response = await self._client.post(self._rpc_url, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    def _payload(self, method: str, params: list[Any] | None) -> dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": next(self._request_ids), "method": method, "params": params or []}
+
+    async def call(self, method: str, params: list[Any] | None = None) -> Any:
+        """
+        Send a single JSON-RPC request and return its `result`.
+
+        Raises:
+            SolanaRpcError: if the node returns a JSON-RPC error
+        """
+        body = await self._post(self._payload(method, params), method)
+        if "error" in body:
+            raise SolanaRpcError(method, body["error"])
+        return body["result"]
+
+    async def batch(self, calls: list[tuple[str, list[Any] | None]]) -> list[Any]:
+        """
+        Send several (method, params) calls as one JSON-RPC batch request.
+
+        Returns:
+            Results in the order of `calls`
+
+        Raises:
+            SolanaRpcError: if the node rejected the whole batch, or for the first call it answered with an error
+        """
+        if not calls:
+            return []
+        payloads = [self._payload(method, params) for method, params in calls]
+        body = await self._post(payloads, "batch")
+        if isinstance(body, dict):
+            # Errors about the batch as a whole (rate limit, invalid request) come back as one object
+            raise SolanaRpcError("batch", body.get("error") or body)
+        responses = {response.get("id"): response for response in body}
+
+        results = []
+        for payload in payloads:
+            response = responses.get(payload["id"])
+            if response is None:
+                raise SolanaRpcError(payload["method"], {"message": "missing from the batch response"})
+            if "error" in response:
+                raise SolanaRpcError(payload["method"], response["error"])
+            results.append(response["result"])
+        return results
+
+    async def get_multiple_accounts(
+        self,
+        addresses: Iterable[str],
+        encoding: str = "jsonParsed",
+        commitment: str = "confirmed",
+    ) -> dict[str, dict[str, Any] | None]:
+        """
+        Get many accounts in as few round trips as possible.
+
+        Addresses are split into chunks of 100 (the RPC limit) sent as one batch.
+
+        Returns:
+            Account (None if it does not exist) by address
+        """
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return {}
+        chunks = [
+            addresses[start:start + SOLANA_RPC_MAX_ACCOUNTS_PER_CALL]
+            for start in range(0, len(addresses), SOLANA_RPC_MAX_ACCOUNTS_PER_CALL)
+        ]
+        results = await self.batch(
+            [
+                ("getMultipleAccounts", [chunk, {"encoding": encoding, "commitment": commitment}])
+                for chunk in chunks
+            ]
+        )
+
+        accounts: dict[str, dict[str, Any] | None] = {}
+        for chunk, result in zip(chunks, results):
+            accounts.update(zip(chunk, result["value"]))
+        return accounts
+
+    async def get_account_info(
+        self, address: str, encoding: str = "jsonParsed", commitment: str = "confirmed"
+    ) -> dict[str, Any] | None:
+        return (await self.get_multiple_accounts([address], encoding, commitment))[address]
+
+    async def get_latest_blockhash(self, commitment: str = "confirmed") -> dict[str, Any]:
+        """Returns {"blockhash": ..., "lastValidBlockHeight": ...}."""
+        result = await self.call("getLatestBlockhash", [{"commitment": commitment}])
+        return result["value"]
+
+    async def get_signature_statuses(self, signatures: list[str]) -> list[dict[str, Any] | None]:
+        """
+        Get the status of up to 256 signatures (None for signatures the node has not seen).
+        """
+        result = await self.call("getSignatureStatuses", [signatures])
+        return result["value"]
+
+    async def send_transaction(self, encoded_transaction: str, skip_preflight: bool = True) -> str:
+        """
+        Send a base64 encoded, signed transaction.
+
+        Returns:
+            str: Transaction signature
+        """
+        return await self.call(
+            "sendTransaction",
+            [
+                encoded_transaction,
+                {
+                    "skipPreflight": skip_preflight,
+                    "preflightCommitment": "confirmed",
+                    "encoding": "base64",
+                },
+            ],
+        )
+
+
+_solana_rpc_client: SolanaRpcClient | None = None
+
+
+def get_solana_rpc_client() -> SolanaRpcClient:
+    """Get the process-wide RPC client, created on first use and closed in the app lifespan."""
+    global _solana_rpc_client
+    if _solana_rpc_client is None:
+        _solana_rpc_client = SolanaRpcClient()
+    return _solana_rpc_client
+
+
+async def close_solana_rpc_client() -> None:
+    global _solana_rpc_client
+    if _solana_rpc_client is not None:
+        await _solana_rpc_client.aclose()
+        _solana_rpc_client = None
@@ -1,19 +1,65 @@
 import requests
 from typing import List
-from app.dtos.token_dto import TokensResponse
+from app.dtos.token_dto import WalletTokensResponse
+from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
+from app.enums.chain_enum import ChainEnum
+from app.infrastructure.metrics import observe_upstream
+from app.infrastructure.settings import settings
+from app.infrastructure.upstream_policy import UpstreamPolicy
+from app.utils.constant import SOLANA_NATIVE_TOKEN_ADDRESS, WALLET_PROVIDER_TIMEOUT_SECONDS
+from app.utils.wallet_asset_util import AssetRow, build_wallet_response
 
 
-def get_wallet_data_by_solana_tracker(wallet_address: str) -> TokensResponse:
+@UpstreamPolicy("solana_tracker", settings.SOLANA_TRACKER_API_KEY)
+@observe_upstream("solana_tracker", "wallet")
+def get_wallet_data_by_solana_tracker(wallet_address: str) -> WalletTokensResponse:
     """
-    Fetch token data from the given API URL and validate it using the TokensResponse DTO.
-    Returns a TokensResponse object if validation succeeds, otherwise raises ValidationError.
+    Fetch token data from the given API URL and validate it using the WalletTokensResponse DTO.
+    Returns a WalletTokensResponse object if validation succeeds, otherwise raises ValidationError.
     """
     headers = {
         "User-Agent": "ZenPortfolio/1.0",
     }
-    response = requests.get(f"https://data.solanatracker.io/wallet/{wallet_address}", headers=headers)
+    if settings.SOLANA_TRACKER_API_KEY:
+        headers["x-api-key"] = settings.SOLANA_TRACKER_API_KEY
+    response = requests.get(
+        f"https://data.solanatracker.io/wallet/{wallet_address}",
+        headers=headers,
+        timeout=WALLET_PROVIDER_TIMEOUT_SECONDS,
+    )
     response.raise_for_status()  # Raises HTTPError if the request returned an unsuccessful status code
     data = response.json()
     # Validate and parse the data using Pydantic DTO
-    tokens_response = TokensResponse.model_validate(data)
-    return tokens_response
+    wallet_tokens = WalletTokensResponse.model_validate(data)
+    return wallet_tokens
+
+
+def get_wallet_total_by_solana_tracker(wallet_address: str) -> WalletTotalResponseDTO:
+    """Solana Tracker holdings in the wallet response format (same as `get_wallet_data_by_helius`)."""
+    return parse_solana_tracker_tokens(wallet_address, get_wallet_data_by_solana_tracker(wallet_address))
+
+
+def parse_solana_tracker_tokens(wallet_address: str, wallet_tokens: WalletTokensResponse) -> WalletTotalResponseDTO:
+    """Turn a Solana Tracker wallet response into the wallet response."""
+    rows: List[AssetRow] = []
+    total_value = 0.0
+    for entry in wallet_tokens.tokens:
+        if entry.balance:
+            price = entry.value / entry.balance
+        else:
+            price = entry.pools[0].price.usd if entry.pools else 0.0
+        total_value += entry.value
+        rows.append(AssetRow(
+            name=entry.token.name,
+            symbol=entry.token.symbol,
+            amount=entry.balance,
+            value=entry.value,
+            # Native SOL is listed under the wrapped SOL mint, Helius reports it as "SOL"
+            token_id="SOL" if entry.token.mint == SOLANA_NATIVE_TOKEN_ADDRESS else entry.token.mint,
+            decimals=entry.token.decimals,
+            price=price,
+            currency="USD",
+            image_url=entry.token.image,
+            chain=ChainEnum.SOLANA,
+        ))
+    return build_wallet_response(wallet_address, ChainEnum.SOLANA, rows, total_value)
@@ -0,0 +1,28 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class HistoricalTransactionDTO(BaseModel):
+    """
+    One wallet transaction composed from the transaction history.
+
+    Trades/swaps fill the input_*/output_* fields, transfers the transfer_* fields.
+    Amounts are UI amounts (already divided by the mint decimals).
+    """
+    signature: str
+    timestamp: int
+    transaction_type: str
+    user_address: str
+    # Trade / swap
+    input_token: Optional[str] = None
+    input_token_amount: Optional[float] = None
+    input_token_price_usd: Optional[float] = None
+    output_token: Optional[str] = None
+    output_token_amount: Optional[float] = None
+    output_token_price_usd: Optional[float] = None
+    # Transfer
+    transfer_token_address: Optional[str] = None
+    transfer_token_amount: Optional[float] = None
+    transfer_token_price_usd: Optional[float] = None
+    address_from: Optional[str] = None
+    address_to: Optional[str] = None
+    fee: Optional[int] = None
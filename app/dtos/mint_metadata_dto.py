@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+class MintMetadataDTO(BaseModel):
+    """On-chain metadata of a token mint needed to build transactions."""
+    mint: str
+    decimals: int
+    token_program: str
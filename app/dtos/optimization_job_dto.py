@@ -0,0 +1,22 @@
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field
+from app.dtos.optimization_dto import OptimizationResponse
+from app.enums.optimization_job_status_enum import OptimizationJobStatusEnum
+
+class OptimizationJobRequest(BaseModel):
+    """Request model for queued Solana asset optimization."""
+    assets: List[Dict[str, Any]]
+    walletAddress: str  # Still included for compatibility, but not used here
+    priority: int = Field(0, ge=0, le=9, description="Higher priority jobs are picked up first")
+
+class OptimizationJobResponse(BaseModel):
+    """Status (and result, once finished) of a queued optimization job."""
+    jobId: str
+    status: OptimizationJobStatusEnum
+    priority: int
+    attempts: int
+    queuePosition: Optional[int] = Field(None, description="0-based position in the queue while the job is queued")
+    result: Optional[OptimizationResponse] = None
+    error: Optional[str] = None
+    createdAt: float
+    updatedAt: float
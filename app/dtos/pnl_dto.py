@@ -0,0 +1,21 @@
+from typing import List
+from pydantic import BaseModel
+from app.enums.cost_basis_method_enum import CostBasisMethodEnum
+
+class TokenPnlDTO(BaseModel):
+    tokenAddress: str
+    quantity: float
+    costBasisUsd: float
+    averageCostUsd: float
+    currentPriceUsd: float
+    realizedPnlUsd: float
+    unrealizedPnlUsd: float
+    isClosed: bool
+    skippedTransactions: int
+
+class WalletPnlDTO(BaseModel):
+    walletAddress: str
+    method: CostBasisMethodEnum
+    tokens: List[TokenPnlDTO]
+    totalRealizedPnlUsd: float
+    totalUnrealizedPnlUsd: float
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from app.dtos.optimization_dto import OptimizationAction
+
+class SwapTransactionResult(BaseModel):
+    """Swap transaction built for one optimization action, or the reason it could not be built."""
+    index: int = Field(..., description="Position of the action in the request")
+    action: OptimizationAction
+    transaction: Optional[str] = Field(None, description="Base64 encoded swap transaction to sign")
+    error: Optional[str] = None
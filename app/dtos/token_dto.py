@@ -2,29 +2,29 @@ from typing import Optional, List, Dict, Any, Annotated
 from pydantic import BaseModel, HttpUrl, Field, RootModel
 
 class TokenSocials(BaseModel):
-    twitter: Optional[str]
-    telegram: Optional[str]
-    website: Optional[str]
+    twitter: Optional[str] = None
+    telegram: Optional[str] = None
+    website: Optional[str] = None
 
 class TokenMeta(BaseModel):
     name: str
     symbol: str
     mint: str
-    uri: Optional[str]
+    uri: Optional[str] = None
     decimals: int
-    description: Optional[str]
-    image: Optional[str]
-    hasFileMetaData: Optional[bool]
-    showName: Optional[bool]
-    createdOn: Optional[str]
+    description: Optional[str] = None
+    image: Optional[str] = None
+    hasFileMetaData: Optional[bool] = None
+    showName: Optional[bool] = None
+    createdOn: Optional[str] = None
     strictSocials: Optional[Dict[str, str]] = Field(default_factory=dict)
-    twitter: Optional[str]
-    telegram: Optional[str]
-    website: Optional[str]
+    twitter: Optional[str] = None
+    telegram: Optional[str] = None
+    website: Optional[str] = None
 
 class PoolSecurity(BaseModel):
-    freezeAuthority: Optional[Any]
-    mintAuthority: Optional[Any]
+    freezeAuthority: Optional[Any] = None
+    mintAuthority: Optional[Any] = None
 
 class PoolLiquidity(BaseModel):
     quote: float
@@ -50,10 +50,10 @@ class Pool(BaseModel):
     quoteToken: str
     decimals: int
     security: PoolSecurity
-    lastUpdated: Optional[int]
-    deployer: Optional[str]
-    openTime: Optional[int]
-    createdAt: Optional[int]
+    lastUpdated: Optional[int] = None
+    deployer: Optional[str] = None
+    openTime: Optional[int] = None
+    createdAt: Optional[int] = None
 
 class EventTimeframe(BaseModel):
     priceChangePercentage: float
@@ -72,13 +72,19 @@ class TokenEntry(BaseModel):
     pools: List[Pool]
     events: Dict[str, EventTimeframe]
     risk: Risk
-    buys: int
-    sells: int
-    txns: int
-    holders: int
+    buys: Optional[int] = None
+    sells: Optional[int] = None
+    txns: Optional[int] = None
+    holders: Optional[int] = None
     balance: float
     value: float
 
 # The top-level DTO for a list of tokens
 class TokensResponse(RootModel):
     root: List[TokenEntry]
+
+# The /wallet/{owner} response: the tokens held and the wallet totals
+class WalletTokensResponse(BaseModel):
+    tokens: List[TokenEntry]
+    total: float = 0
+    totalSol: Optional[float] = None
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel
 from app.enums.chain_enum import ChainEnum
 
 class AssetDTO(BaseModel):
@@ -12,10 +12,23 @@ class AssetDTO(BaseModel):
     decimals: int
     price: float
     currency: str
-    imageUrl: Optional[HttpUrl] = None
+    # Passed through as the provider sends it, URL validation cost more than the rest of the asset
+    imageUrl: Optional[str] = None
+    chain: Optional[ChainEnum] = None
+
+class ChainBreakdownDTO(BaseModel):
+    """Share of a multi-chain portfolio held on one chain."""
+    chain: ChainEnum
+    totalValue: float
+    percentage: float
+    assetCount: int
+    # Set when the chain could not be fetched (its assets are missing from the portfolio)
+    error: Optional[str] = None
 
 class WalletTotalResponseDTO(BaseModel):
     chain: ChainEnum
     address: str
     assets: List[AssetDTO]
     totalValue: float
+    # Multi-chain portfolios only
+    chains: Optional[List[ChainBreakdownDTO]] = None
@@ -0,0 +1,33 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class YieldPoolResponseDTO(BaseModel):
+    """A DeFi Llama yield pool as stored in the yield_pools table."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    chain: str
+    project: str
+    symbol: str
+    pool: str
+    tvlUsd: float
+    apy: float
+    apyBase: Optional[float] = None
+    apyReward: Optional[float] = None
+    apyPct1D: Optional[float] = None
+    apyPct7D: Optional[float] = None
+    apyPct30D: Optional[float] = None
+    stablecoin: Optional[bool] = None
+    rewardTokens: Optional[List[Any]] = None
+    underlyingTokens: Optional[List[Any]] = None
+    ilRisk: Optional[str] = None
+    exposure: Optional[str] = None
+    predictedClass: Optional[str] = None
+    predictedProb: Optional[float] = None
+    binnedConfidence: Optional[float] = None
+    url: Optional[str] = None
+    volumeUsd1d: Optional[float] = None
+    volumeUsd7d: Optional[float] = None
+
+class YieldPoolListResponseDTO(BaseModel):
+    pools: List[YieldPoolResponseDTO]
@@ -1,6 +1,15 @@
 from enum import Enum
 
 class ChainEnum(str, Enum):
+    # EVM chains, values are Moralis chain names
+    ETHEREUM = "eth"
     BASE = "base"
+    ARBITRUM = "arbitrum"
+    OPTIMISM = "optimism"
+    POLYGON = "polygon"
+    BSC = "bsc"
+    AVALANCHE = "avalanche"
+    LINEA = "linea"
+    # Portfolio merged across the EVM chains above
+    EVM = "evm"
     SOLANA = "solana"
-    
\ No newline at end of file
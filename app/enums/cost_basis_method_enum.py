@@ -0,0 +1,5 @@
+from enum import Enum
+
+class CostBasisMethodEnum(str, Enum):
+    FIFO = "fifo"
+    AVERAGE = "average"
@@ -0,0 +1,15 @@
+from enum import Enum
+
+class TransactionType(str, Enum):
+    """Helius enhanced transaction types (the subset this service handles)."""
+    TRANSFER = "TRANSFER"
+    SWAP = "SWAP"
+    BURN = "BURN"
+    TOKEN_MINT = "TOKEN_MINT"
+    CREATE_ACCOUNT = "CREATE_ACCOUNT"
+    CLOSE_ACCOUNT = "CLOSE_ACCOUNT"
+    STAKE_SOL = "STAKE_SOL"
+    UNSTAKE_SOL = "UNSTAKE_SOL"
+    DEPOSIT = "DEPOSIT"
+    WITHDRAW = "WITHDRAW"
+    UNKNOWN = "UNKNOWN"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class OptimizationJobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class TrueNorthTransactionType(str, Enum):
+    """Transaction types of the composed transaction history (on top of the Helius types)."""
+    TRADE = "TRADE"
+    TRANSFER = "TRANSFER"
+    UNKNOWN = "UNKNOWN"
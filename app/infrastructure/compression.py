@@ -0,0 +1,124 @@
+"""
+Response compression.
+
+CompressionMiddleware compresses complete response bodies of at least
+COMPRESSION_MINIMUM_SIZE_BYTES with brotli or gzip, whichever the client
+prefers (brotli on a tie, it is ~20% smaller on JSON). Streamed responses
+(SSE job progress, ...) and bodies already encoded pass through untouched.
+
+A compressed body is another representation of the resource, so its strong
+ETag gets the coding appended (`"<tag>-br"`, like Apache does); conditional
+requests match on the tag without that suffix (see `strip_etag_coding`).
+"""
+
+import gzip
+from typing import Callable
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils.constant import BROTLI_QUALITY, COMPRESSION_MINIMUM_SIZE_BYTES, GZIP_COMPRESS_LEVEL
+
+# Preferred first
+SUPPORTED_CODINGS = ("br", "gzip")
+
+
+def negotiate_coding(accept_encoding: str) -> str | None:
+    """Content coding to use for an Accept-Encoding header, or None to send the body as is."""
+    weights = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best_coding, best_weight = None, 0.0
+    for coding in SUPPORTED_CODINGS:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best_coding, best_weight = coding, weight
+    return best_coding
+
+
+def strip_etag_coding(etag: str) -> str:
+    """ETag of the identity representation, given the ETag of an encoded one."""
+    for coding in SUPPORTED_CODINGS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def _encode_etag(headers: MutableHeaders, coding: str) -> None:
+    etag = headers.get("etag")
+    if etag and etag.endswith('"'):
+        headers["etag"] = f'{etag[:-1]}-{coding}"'
+
+
+def _compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies with brotli or gzip."""
+
+    def __init__(self, app: Callable, minimum_size: int = COMPRESSION_MINIMUM_SIZE_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_coding(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the body tells whether it gets compressed
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streamed, sent as it comes
+                passthrough = True
+                headers.add_vary_header("Accept-Encoding")
+            elif start_message["status"] == 304:
+                headers.add_vary_header("Accept-Encoding")
+                _encode_etag(headers, coding)
+            elif (
+                len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and not headers.get("content-type", "").startswith("text/event-stream")
+            ):
+                body = _compress(body, coding)
+                headers["content-encoding"] = coding
+                headers["content-length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                _encode_etag(headers, coding)
+                message = {**message, "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
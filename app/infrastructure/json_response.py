@@ -0,0 +1,71 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse is the app's default response class. Plain content (dicts
+FastAPI built from a response model, error bodies, ...) is encoded with
+orjson. A Pydantic model is written straight to JSON bytes by pydantic-core,
+without the intermediate dict and the json.dumps pass: endpoints get that by
+returning `FastJSONResponse(model)` themselves, which FastAPI passes through
+untouched (their `response_model` still documents the schema).
+
+Polled endpoints keep a ResponseSnapshot instead: the body serialized once
+plus its strong ETag, answered by `conditional_json_response` with a 304 and
+no body when the client already has it.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.infrastructure.compression import strip_etag_coding
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            # Same output as FastAPI's response model serialization (by alias, JSON mode)
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass(frozen=True)
+class ResponseSnapshot:
+    """A JSON response body serialized once, with its strong ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: Any) -> "ResponseSnapshot":
+        body = FastJSONResponse(content).body
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, W/ prefixes are ignored
+    return any(
+        strip_etag_coding(tag.strip().removeprefix("W/")) == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def conditional_json_response(
+    request: Request, snapshot: ResponseSnapshot, cache_control: str = "no-cache"
+) -> Response:
+    """
+    The snapshot as a JSON response, or a bodiless 304 if `If-None-Match` holds its ETag.
+
+    `no-cache` lets clients keep the body but makes them revalidate on every poll.
+    """
+    headers = {"ETag": snapshot.etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -1,19 +1,146 @@
+"""
+Logging pipeline.
+
+Callers only pay for a level check and for putting the LogRecord on an
+in-process queue (QueueHandler). A QueueListener thread does the formatting
+and the stdout writes, so slow log I/O never blocks the event loop.
+
+Records are structured: `log_message` keyword arguments travel as
+`record.fields` and are rendered by the listener, as one JSON object per line
+(LOG_FORMAT=json) or as the classic "event | key=value" text (LOG_FORMAT=text).
+Every record carries the id of the request that caused it (see request_context).
+"""
+
+import atexit
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
+
+from app.infrastructure.request_context import get_request_id
+from app.infrastructure.settings import settings
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(threadName)s - %(message)s"
+
+_exception_formatter = logging.Formatter()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id. Runs in the thread that logs, where the request context is set."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, structured fields at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable lines: "<time> - <level> - <thread> - event | key=value ..."."""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message = f"{message} | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            message = f"{message} request_id={request_id}"
+        return message
+
+
+class InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler that snapshots records without formatting them.
+
+    The stock `prepare` formats the whole record in the caller to make it
+    picklable; this queue never leaves the process, so only what the caller
+    could still change is captured here: the message with its args, the
+    fields dict and the traceback. Rendering the line and the I/O are left
+    to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = dict(fields)
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            # Don't keep the frames alive while the record waits in the queue
+            record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(stream: IO[str] | None = None) -> logging.Logger:
+    """
+    Route the root logger through the queue to a stdout writer thread.
+
+    Safe to call again (e.g. after Alembic replaced the handlers): the previous
+    listener is flushed and stopped first.
+
+    Args:
+        stream: Where the listener writes, stdout by default
+    """
+    _stop_listener()
+
+    output_handler = logging.StreamHandler(stream or sys.stdout)
+    if settings.LOG_FORMAT == "text":
+        output_handler.setFormatter(TextFormatter(TEXT_FORMAT))
+    else:
+        output_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = InProcessQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    logging.basicConfig(level=settings.LOG_LEVEL.upper(), handlers=[queue_handler], force=True)
+
+    global _listener
+    _listener = QueueListener(log_queue, output_handler)
+    _listener.start()
 
-def configure_logging():
-    """Configure root logger with standard settings"""
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(threadName)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(stream=sys.stdout),
-        ],
-        force=True
-    )
-
-    # Get and return root logger
     return logging.getLogger()
 
+
+atexit.register(_stop_listener)
+
 # Configure and get the root logger
 logger = configure_logging()
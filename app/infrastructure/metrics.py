@@ -0,0 +1,206 @@
+"""
+Prometheus metrics.
+
+Everything the API waits on is measured here:
+    - HTTP request latency per route template (PrometheusMiddleware)
+    - upstream latency and errors per provider and method (`observe_upstream`), and retries
+    - cache hits and misses per cache (`record_cache_lookup`)
+    - health and fallbacks of providers with failover (wallet provider service)
+    - Postgres connection pool checkout wait (InstrumentedQueuePool)
+    - event loop lag (`monitor_event_loop_lag`)
+`observe_upstream` also opens a client span per call (see tracing).
+Metrics are served in the Prometheus text format on GET /metrics.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from typing import Any, Callable
+
+from opentelemetry.trace import SpanKind
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.tracing import tracer
+
+# Upstream calls range from sub-millisecond Redis/Postgres hits to minute long LLM chains
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status_code"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to external providers and the database",
+    ["provider", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUEST_ERRORS = Counter(
+    "upstream_request_errors_total",
+    "Failed calls to external providers and the database",
+    ["provider", "method", "error"],
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a Postgres connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Retries of failed upstream calls, by outcome (retried, or denied by the retry budget)",
+    ["provider", "outcome"],
+)
+PROVIDER_HEALTH_SCORE = Gauge(
+    "provider_health_score",
+    "Moving average of successful calls (0-1) of providers with failover",
+    ["provider"],
+)
+PROVIDER_FALLBACKS = Counter(
+    "provider_fallbacks_total",
+    "Calls sent to a fallback provider, by reason (failover or hedge)",
+    ["provider", "reason"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop runs a scheduled callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+
+class observe_upstream:
+    """
+    Time a call to an external provider, as a decorator or a (async) context manager.
+
+    Records `upstream_request_duration_seconds` and, on exceptions,
+    `upstream_request_errors_total` labelled with the exception type, inside a
+    "<provider> <method>" client span.
+
+    Example:
+        @observe_upstream("helius", "getAssetsByOwner")
+        def get_wallet_data_by_helius(...): ...
+
+        async with observe_upstream("jupiter", "/quote"):
+            response = await client.get(...)
+    """
+
+    def __init__(self, provider: str, method: str):
+        self.provider = provider
+        self.method = method
+        self._start = 0.0
+        self._span_context: Any = None
+
+    def __enter__(self) -> "observe_upstream":
+        self._span_context = tracer.start_as_current_span(
+            f"{self.provider} {self.method}",
+            kind=SpanKind.CLIENT,
+            attributes={"upstream.provider": self.provider, "upstream.method": self.method},
+        )
+        self._span_context.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        UPSTREAM_REQUEST_DURATION.labels(self.provider, self.method).observe(time.perf_counter() - self._start)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            UPSTREAM_REQUEST_ERRORS.labels(self.provider, self.method, exc_type.__name__).inc()
+        self._span_context.__exit__(exc_type, exc, traceback)
+
+    async def __aenter__(self) -> "observe_upstream":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        self.__exit__(exc_type, exc, traceback)
+
+    def __call__(self, func: Callable) -> Callable:
+        provider, method = self.provider, self.method
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with observe_upstream(provider, method):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with observe_upstream(provider, method):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    if count:
+        CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc(count)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits for a connection."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+async def monitor_event_loop_lag(interval_seconds: float = 0.5) -> None:
+    """Sleep `interval_seconds` in a loop and record how much later than asked the loop woke up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval_seconds)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval_seconds))
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording request latency by route template (so /wallet/{wallet_address} is one series)."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = scope.get("route")
+            # Unmatched paths share one label, raw paths would explode the series count
+            route_path = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
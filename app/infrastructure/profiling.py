@@ -0,0 +1,281 @@
+"""
+Sampling profiler.
+
+A background thread reads every thread's stack with `sys._current_frames()`
+and counts them in the folded format ("outer;inner;innermost count" per line)
+read by flamegraph.pl, speedscope and inferno. Nothing is instrumented: a
+profile costs one stack walk per thread per sample while it runs, and nothing
+at all otherwise.
+
+Two uses:
+    - `profile_for`: on-demand profile of this worker for N seconds (admin endpoint)
+    - SlowRequestProfiler: samples requests running past SLOW_REQUEST_THRESHOLD_SECONDS
+      and keeps their profile once they complete. Only installed when
+      SLOW_REQUEST_PROFILING_ENABLED is set.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Callable
+
+from app.infrastructure.request_context import get_request_id
+from app.infrastructure.settings import settings
+from app.utils.constant import PROFILER_SAMPLE_INTERVAL_SECONDS, SLOW_REQUEST_PROFILE_MAX_CAPTURES
+from app.utils.logging_util import LogLevel, log_message
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ProfilerBusyError(Exception):
+    """Raised when an on-demand profile is requested while another one runs."""
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _sample_threads(exclude_thread_id: int, app_only: bool = False) -> list[str]:
+    """
+    One folded stack per thread, rooted at the thread name.
+
+    Args:
+        exclude_thread_id: Thread to leave out (the sampler itself)
+        app_only: Only keep threads currently running code of the app package (skips idle threads)
+    """
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = []
+    for thread_id, frame in sys._current_frames().items():
+        if thread_id == exclude_thread_id:
+            continue
+        labels = []
+        in_app = False
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            in_app = in_app or frame.f_code.co_filename.startswith(APP_DIR)
+            frame = frame.f_back
+        if app_only and not in_app:
+            continue
+        labels.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+        stacks.append(";".join(reversed(labels)))
+    return stacks
+
+
+def _await_chain(task: asyncio.Task) -> list[str]:
+    """Frames of a suspended task's await chain, outermost first: where the task is waiting."""
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return labels
+
+
+def to_folded(stacks: Counter) -> str:
+    """Folded stack lines, most sampled first."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+_profile_lock = threading.Lock()
+
+
+def profile_for(seconds: float, interval_seconds: float = PROFILER_SAMPLE_INTERVAL_SECONDS) -> tuple[str, int]:
+    """
+    Sample all threads of this process for `seconds`. Blocking, run it off the event loop.
+
+    Returns:
+        (folded stacks, number of samples)
+
+    Raises:
+        ProfilerBusyError: if another on-demand profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        own_thread_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            stacks.update(_sample_threads(own_thread_id))
+            samples += 1
+            time.sleep(interval_seconds)
+        return to_folded(stacks), samples
+    finally:
+        _profile_lock.release()
+
+
+@dataclass
+class SlowRequestProfile:
+    """Profile of one slow request, covering the part past the threshold."""
+
+    id: str
+    method: str
+    path: str
+    request_id: str | None
+    started_at: float
+    duration_seconds: float
+    samples: int
+    stacks: Counter = field(repr=False)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "requestId": self.request_id,
+            "startedAt": self.started_at,
+            "durationSeconds": round(self.duration_seconds, 3),
+            "samples": self.samples,
+        }
+
+
+@dataclass(eq=False)
+class _InFlightRequest:
+    method: str
+    path: str
+    task: asyncio.Task | None
+    request_id: str | None
+    started_at: float = field(default_factory=time.time)
+    started_perf: float = field(default_factory=time.perf_counter)
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+
+class SlowRequestProfiler:
+    """
+    Watchdog sampling requests that run longer than `threshold_seconds`.
+
+    Requests are registered by SlowRequestProfilingMiddleware. While any of them
+    is past the threshold, a sampler thread records the stacks of the threads
+    running app code plus the request task's await chain; when the request
+    completes its profile is kept (last `max_captures`) and a warning is logged.
+    """
+
+    def __init__(
+        self,
+        threshold_seconds: float,
+        interval_seconds: float = PROFILER_SAMPLE_INTERVAL_SECONDS,
+        max_captures: int = SLOW_REQUEST_PROFILE_MAX_CAPTURES,
+    ):
+        self.threshold_seconds = threshold_seconds
+        self.interval_seconds = interval_seconds
+        self.captures: deque[SlowRequestProfile] = deque(maxlen=max_captures)
+        self._in_flight: set[_InFlightRequest] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        own_thread_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval_seconds):
+            now = time.perf_counter()
+            with self._lock:
+                slow = [
+                    request for request in self._in_flight
+                    if now - request.started_perf >= self.threshold_seconds
+                ]
+            if not slow:
+                continue
+
+            thread_stacks = _sample_threads(own_thread_id, app_only=True)
+            with self._lock:
+                for request in slow:
+                    if request not in self._in_flight:
+                        continue
+                    request.stacks.update(thread_stacks)
+                    if request.task is not None:
+                        chain = _await_chain(request.task)
+                        if chain:
+                            request.stacks[";".join([f"request {request.method} {request.path}", *chain])] += 1
+                    request.samples += 1
+
+    def begin(self, method: str, path: str) -> _InFlightRequest:
+        request = _InFlightRequest(
+            method=method,
+            path=path,
+            task=asyncio.current_task(),
+            request_id=get_request_id(),
+        )
+        with self._lock:
+            self._in_flight.add(request)
+        return request
+
+    def end(self, request: _InFlightRequest, path: str | None = None) -> None:
+        with self._lock:
+            self._in_flight.discard(request)
+        duration = time.perf_counter() - request.started_perf
+        if duration < self.threshold_seconds or not request.samples:
+            return
+
+        profile = SlowRequestProfile(
+            id=uuid.uuid4().hex,
+            method=request.method,
+            path=path or request.path,
+            request_id=request.request_id,
+            started_at=request.started_at,
+            duration_seconds=duration,
+            samples=request.samples,
+            stacks=request.stacks,
+        )
+        self.captures.append(profile)
+        log_message(
+            LogLevel.WARNING,
+            "Slow request profiled",
+            method=profile.method,
+            path=profile.path,
+            duration_ms=round(duration * 1000, 1),
+            samples=profile.samples,
+            profile_id=profile.id,
+        )
+
+    def get_capture(self, profile_id: str) -> SlowRequestProfile | None:
+        return next((profile for profile in self.captures if profile.id == profile_id), None)
+
+
+class SlowRequestProfilingMiddleware:
+    """ASGI middleware registering every request with the slow request profiler."""
+
+    def __init__(self, app: Callable, profiler: SlowRequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        # Admin calls (an on-demand profile runs for seconds) are slow on purpose
+        if scope["type"] != "http" or scope["path"].startswith("/admin/"):
+            await self.app(scope, receive, send)
+            return
+
+        request = self.profiler.begin(scope["method"], scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            self.profiler.end(request, path=getattr(route, "path", None))
+
+
+slow_request_profiler = SlowRequestProfiler(threshold_seconds=settings.SLOW_REQUEST_THRESHOLD_SECONDS)
@@ -0,0 +1,180 @@
+"""
+Rate limiter shared by every worker process through Redis.
+
+Uses GCRA (generic cell rate algorithm) with reservations: every caller atomically
+reserves the next free slot and sleeps until it, so callers are served in arrival
+order instead of all retrying at once. If Redis is unavailable the limiter falls
+back to the same algorithm in process memory.
+
+With a `lease_size`, a worker reserves that many slots in one round trip when they
+are all free right now, and hands them out locally (the fast path, no Redis call)
+until they run out or the time they stand for has passed. Under load the leases
+are refused and callers reserve single slots again, in arrival order.
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+from app.infrastructure.redis import redis_client
+from app.utils.logging_util import LogLevel, log_message
+
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+
+# Reserve the next slot(s) for KEYS[1].
+# ARGV: interval between requests (ms), burst size, max wait (ms), slots to lease.
+# The lease is granted only if all its slots are free now, otherwise a single slot is reserved.
+# Returns {slots reserved, wait in ms before the first one}, or {0, -1} if it would exceed the max wait.
+_RESERVE_SCRIPT = redis_client.register_script(
+    """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
+    local interval = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local max_wait = tonumber(ARGV[3])
+    local count = tonumber(ARGV[4])
+
+    local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval * count
+    if count > 1 and new_tat - now - burst * interval > 0 then
+        count = 1
+        new_tat = tat + interval
+    end
+    local wait = new_tat - now - burst * interval
+    if wait < 0 then
+        wait = 0
+    end
+    if wait > max_wait then
+        return {0, -1}
+    end
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now) + 1000)
+    return {count, math.ceil(wait)}
+    """
+)
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a request would have to wait longer than the limiter's max wait."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Rate limit exceeded for {name}")
+
+
+class RedisRateLimiter:
+    """
+    Token bucket style limiter (GCRA) shared across workers through Redis.
+
+    Args:
+        name: Limiter name, used as the Redis key
+        requests_per_second: Sustained request rate
+        burst: Number of requests allowed back to back
+        max_wait_seconds: Longest a caller may queue for a slot before RateLimitExceededError
+        lease_size: Slots a worker takes from Redis at once when they are free (at most `burst`)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_second: float,
+        burst: int = 1,
+        max_wait_seconds: float = 30,
+        lease_size: int = 1,
+    ):
+        self.name = name
+        self.key = f"{RATE_LIMIT_KEY_PREFIX}{name}"
+        self.interval_ms = 1000 / requests_per_second
+        self.burst = burst
+        self.max_wait_ms = max_wait_seconds * 1000
+        self.lease_size = max(1, min(lease_size, burst))
+        self._local_tat = 0.0
+        self._local_lock = threading.Lock()
+        self._leased_slots = 0
+        self._lease_expires_at = 0.0
+
+    def _take_leased_slot(self) -> bool:
+        with self._local_lock:
+            if self._leased_slots and time.monotonic() < self._lease_expires_at:
+                self._leased_slots -= 1
+                return True
+            return False
+
+    def _store_lease(self, slots: int) -> None:
+        with self._local_lock:
+            self._leased_slots = slots
+            # Slots not used within the time they stand for are dropped, never saved up
+            self._lease_expires_at = time.monotonic() + (slots + 1) * self.interval_ms / 1000
+
+    def _reserve_local(self, max_wait_ms: float) -> int:
+        with self._local_lock:
+            now = time.time() * 1000
+            tat = max(self._local_tat, now)
+            new_tat = tat + self.interval_ms
+            wait = max(new_tat - now - self.burst * self.interval_ms, 0)
+            if wait > max_wait_ms:
+                return -1
+            self._local_tat = new_tat
+            return math.ceil(wait)
+
+    def reserve(self, blocking: bool = True) -> float | None:
+        """
+        Reserve the next request slot.
+
+        Args:
+            blocking: If False, only succeed when a slot is free right now
+
+        Returns:
+            Seconds to wait before sending the request, or None if no slot was reserved
+        """
+        if self.lease_size > 1 and self._take_leased_slot():
+            return 0.0
+        max_wait_ms = self.max_wait_ms if blocking else 0
+        try:
+            slots, wait_ms = _RESERVE_SCRIPT(
+                keys=[self.key], args=[self.interval_ms, self.burst, max_wait_ms, self.lease_size]
+            )
+            if slots > 1:
+                self._store_lease(slots - 1)
+        except Exception as e:
+            log_message(LogLevel.WARNING, "Rate limiter falling back to local bucket", limiter=self.name, error=str(e))
+            wait_ms = self._reserve_local(max_wait_ms)
+
+        if wait_ms < 0:
+            return None
+        return wait_ms / 1000
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Wait for a request slot.
+
+        Returns:
+            True once the request may be sent, False if non-blocking and no slot is free
+
+        Raises:
+            RateLimitExceededError: if blocking and the wait would exceed max_wait_seconds
+        """
+        wait = self.reserve(blocking=blocking)
+        if wait is None:
+            if blocking:
+                raise RateLimitExceededError(self.name)
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, blocking: bool = True) -> bool:
+        """Async version of acquire, the Redis round trip (if any) runs in a thread."""
+        if self.lease_size > 1 and self._take_leased_slot():
+            return True
+        wait = await asyncio.to_thread(self.reserve, blocking)
+        if wait is None:
+            if blocking:
+                raise RateLimitExceededError(self.name)
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
@@ -0,0 +1,51 @@
+"""
+Per-request context shared with the logging pipeline.
+
+RequestIdMiddleware takes the caller's X-Request-ID (or makes one up), keeps it
+in a context variable for the duration of the request and echoes it back in the
+response. Context variables follow the request into `asyncio.create_task` and
+`asyncio.to_thread`, so every log line it causes carries the same id.
+"""
+
+import uuid
+from contextvars import ContextVar
+from typing import Callable
+
+REQUEST_ID_HEADER = "x-request-id"
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> str | None:
+    return request_id_var.get()
+
+
+class RequestIdMiddleware:
+    """ASGI middleware binding a request id to everything the request logs."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                # Bounded, a client controlled value ends up in every log line
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), request_id.encode())]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -2,6 +2,8 @@ import os
 
 from pydantic_settings import BaseSettings
 
+from app.enums.chain_enum import ChainEnum
+
 
 def get_secret_manager_or_none(env_var: str) -> str | None:
     return None
@@ -17,6 +19,23 @@ class Settings(BaseSettings):
         codex_api_key: Codex GraphQL API key for token price data
     """
     
+    # Logging: root level, and "json" (one object per line) or "text" output
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+
+    # Tracing: exporter is "file" (JSON lines), "otlp" or "console"; a ratio of the traces is kept
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str | None = None
+    TRACING_SAMPLE_RATIO: float = 0.1
+
+    # Admin endpoints (profiling) require this token in X-Admin-Token; unset hides them
+    ADMIN_API_TOKEN: str | None = None
+    # Keep a stack profile of every request slower than the threshold
+    SLOW_REQUEST_PROFILING_ENABLED: bool = False
+    SLOW_REQUEST_THRESHOLD_SECONDS: float = 5.0
+
     # DB
     POSTGRES_USER: str = get_secret_manager_or_none("user_service_database_execution_agents_username")
     POSTGRES_PASSWORD: str = get_secret_manager_or_none("user_service_database_execution_agents_password")
@@ -30,17 +49,66 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str | None = None
 
+    # LLM provider: "openai", or "fake" for the offline stand-in used in benchmarks
+    LLM_PROVIDER: str = "openai"
+    FAKE_LLM_LATENCY_SECONDS: float = 1.0
+    FAKE_LLM_LATENCY_JITTER_SECONDS: float = 0.5
+
     # OpenAI
     OPENAI_API_KEY: str = get_secret_manager_or_none("openai_api_key")
+    OPENAI_REQUESTS_PER_SECOND: float = 5
+    OPENAI_RATE_LIMIT_BURST: int = 10
+    OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 30
+
+    # Client-side rate limits per provider and API key, shared by all workers: (requests per second, burst)
+    UPSTREAM_RATE_LIMITS: dict[str, tuple[float, int]] = {
+        "helius": (10, 10),
+        "moralis": (25, 25),
+        "solana_tracker": (1, 1),
+        "jupiter": (1, 10),
+        "codex": (5, 5),
+        "defillama": (1, 1),
+    }
+
+    # Solana holdings: also ask the fallback provider when the primary is slower than its p95
+    WALLET_PROVIDER_HEDGING_ENABLED: bool = True
 
     # Solana Tracker
     SOLANA_TRACKER_API_KEY: str = get_secret_manager_or_none("solana_tracker_api_key")
 
     # Moralis
     MORALIS_API_KEY: str = get_secret_manager_or_none("moralis_api_key")
+    # Chains an EVM wallet's portfolio is fetched from, concurrently
+    MORALIS_EVM_CHAINS: list[ChainEnum] = [
+        ChainEnum.ETHEREUM,
+        ChainEnum.BASE,
+        ChainEnum.ARBITRUM,
+        ChainEnum.OPTIMISM,
+        ChainEnum.POLYGON,
+        ChainEnum.BSC,
+        ChainEnum.AVALANCHE,
+    ]
+
+    # Codex
+    CODEX_API_KEY: str = get_secret_manager_or_none("codex_api_key")
 
     # Helius
     HELIUS_API_KEY: str = get_secret_manager_or_none("helius_api_key")
+    # Keep the recent blockhash and priority fees refreshed in the background
+    NETWORK_STATE_REFRESH_ENABLED: bool = True
+    # Value of the Authorization header configured on the Helius webhook (unset disables the endpoint)
+    HELIUS_WEBHOOK_AUTH_HEADER: str | None = None
+    HELIUS_WEBHOOK_WORKERS_ENABLED: bool = True
+    HELIUS_WEBHOOK_WORKER_CONCURRENCY: int = 2
+    HELIUS_WEBHOOK_QUEUE_MAX_SIZE: int = 50_000
+    # Periodically sync the transaction history of tracked wallets
+    WALLET_HISTORY_SYNC_ENABLED: bool = True
+
+    # Optimization jobs
+    OPTIMIZATION_JOB_WORKERS_ENABLED: bool = True
+    OPTIMIZATION_JOB_WORKER_CONCURRENCY: int = 2
+    OPTIMIZATION_JOB_QUEUE_MAX_SIZE: int = 100
+    OPTIMIZATION_JOB_MAX_ATTEMPTS: int = 3
     
     model_config = {
         "env_file": ".env" + "." + os.environ.get("ACTIVE_PROFILE", "local"),
@@ -0,0 +1,172 @@
+"""
+OpenTelemetry tracing.
+
+Spans are opened around every HTTP request (TracingMiddleware), every upstream
+call (`observe_upstream` in metrics), every SQL statement (`instrument_engine`),
+every optimization graph node and every LLM call, so a slow request can be
+broken down into the stages it waited on.
+
+Tracing is off unless TRACING_ENABLED is set; the tracer then is the API's
+no-op tracer. When on, a ParentBased(TraceIdRatioBased) sampler keeps
+TRACING_SAMPLE_RATIO of the traces, and a BatchSpanProcessor exports them from
+a background thread to:
+    file     JSON lines in TRACING_FILE_PATH, for offline analysis
+    otlp     an OTLP/HTTP collector (TRACING_OTLP_ENDPOINT, or the OTEL_* env defaults)
+    console  stdout
+"""
+
+import threading
+from typing import Callable, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.request_context import get_request_id
+from app.infrastructure.settings import settings
+
+SERVICE_NAME = "zen-portfolio-backend"
+
+# Statements can embed large literal lists, keep spans small
+MAX_DB_STATEMENT_LENGTH = 1000
+
+tracer = trace.get_tracer("app")
+
+
+class JsonLinesFileSpanExporter(SpanExporter):
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _create_exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "otlp":
+        # Imported on demand, only deployments shipping to a collector need it loaded
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    return JsonLinesFileSpanExporter(settings.TRACING_FILE_PATH)
+
+
+def configure_tracing() -> None:
+    """Install the sampling tracer provider and its exporter (no-op unless TRACING_ENABLED)."""
+    if not settings.TRACING_ENABLED:
+        return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+    trace.set_tracer_provider(provider)
+
+
+def shutdown_tracing() -> None:
+    """Export the spans still buffered."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Open a span around every statement executed on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "QUERY"
+        span = tracer.start_span(
+            f"postgres {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation": operation,
+                "db.statement": statement[:MAX_DB_STATEMENT_LENGTH],
+                "db.executemany": executemany,
+            },
+        )
+        context._otel_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+            context._otel_span = None
+
+    @event.listens_for(engine, "handle_error")
+    def _fail_query_span(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_otel_span", None) if context is not None else None
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR, type(exception_context.original_exception).__name__))
+            span.end()
+            context._otel_span = None
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the server span of each request, continuing an incoming `traceparent`."""
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        status_code = 500
+
+        async def send_wrapper(message: dict) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+            request_id = get_request_id()
+            if request_id:
+                span.set_attribute("request.id", request_id)
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    # Name by route template, like the metrics
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,177 @@
+"""
+Rate limits and retries for calls to external providers.
+
+UpstreamPolicy wraps the calls of one provider and API key:
+    - rate limit: a RedisRateLimiter per provider and API key (the key is only
+      stored hashed), configured in UPSTREAM_RATE_LIMITS and shared by all
+      workers, with leased slots as the local fast path. Providers missing from
+      the setting are not limited.
+    - retries: transient errors (429, 408, 5xx, connection errors, timeouts) are
+      retried with full-jitter exponential backoff, or after the provider's
+      Retry-After, up to UPSTREAM_RETRY_MAX_ATTEMPTS attempts. Every retry is
+      taken from one retry budget per worker, so retries cannot amplify an outage.
+
+Each attempt waits for its own rate limit slot. Put it outside `observe_upstream`,
+so that upstream latency is measured per attempt and without the queueing:
+
+    @UpstreamPolicy("helius", settings.HELIUS_API_KEY)
+    @observe_upstream("helius", "getAssetsByOwner")
+    def get_wallet_data_by_helius(...): ...
+"""
+
+import functools
+import hashlib
+import inspect
+import threading
+from typing import Any, Awaitable, Callable
+
+import httpx
+import requests
+from tenacity import AsyncRetrying, RetryCallState, Retrying, wait_random_exponential
+
+from app.infrastructure.metrics import UPSTREAM_RETRIES
+from app.infrastructure.rate_limiter import RedisRateLimiter
+from app.infrastructure.settings import settings
+from app.utils.constant import (
+    UPSTREAM_RATE_LIMIT_LEASE_SIZE,
+    UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS,
+    UPSTREAM_RETRY_BASE_DELAY_SECONDS,
+    UPSTREAM_RETRY_BUDGET_MAX_BALANCE,
+    UPSTREAM_RETRY_BUDGET_MIN_PER_SECOND,
+    UPSTREAM_RETRY_BUDGET_RATIO,
+    UPSTREAM_RETRY_MAX_ATTEMPTS,
+    UPSTREAM_RETRY_MAX_DELAY_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.retry_budget_util import RetryBudget
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+upstream_retry_budget = RetryBudget(
+    ratio=UPSTREAM_RETRY_BUDGET_RATIO,
+    min_retries_per_second=UPSTREAM_RETRY_BUDGET_MIN_PER_SECOND,
+    max_balance=UPSTREAM_RETRY_BUDGET_MAX_BALANCE,
+)
+
+# One limiter per provider and API key, so leases are shared by all callers of the worker
+_rate_limiters: dict[tuple[str, str], RedisRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _status_code(error: BaseException) -> int | None:
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+        return True
+    return _status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Delay asked for by the provider's Retry-After header (seconds form only)."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(float(headers.get("Retry-After")), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_upstream_rate_limiter(provider: str, api_key: str | None = None) -> RedisRateLimiter | None:
+    """Rate limiter of a provider and API key, None if the provider has no limit configured."""
+    limit = settings.UPSTREAM_RATE_LIMITS.get(provider)
+    if limit is None:
+        return None
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else "anonymous"
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get((provider, key_hash))
+        if limiter is None:
+            requests_per_second, burst = limit
+            limiter = RedisRateLimiter(
+                name=f"upstream:{provider}:{key_hash}",
+                requests_per_second=requests_per_second,
+                burst=burst,
+                max_wait_seconds=UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS,
+                lease_size=UPSTREAM_RATE_LIMIT_LEASE_SIZE,
+            )
+            _rate_limiters[(provider, key_hash)] = limiter
+        return limiter
+
+
+class UpstreamPolicy:
+    """
+    Rate limit and retry calls to a provider, as a decorator or with `call`/`acall`.
+
+    Args:
+        provider: Provider name, key of UPSTREAM_RATE_LIMITS
+        api_key: Credential the provider's quota belongs to (an RPC URL embedding it also works)
+        max_attempts: Attempts per call, including the first
+    """
+
+    def __init__(self, provider: str, api_key: str | None = None, max_attempts: int = UPSTREAM_RETRY_MAX_ATTEMPTS):
+        self.provider = provider
+        self.max_attempts = max_attempts
+        self.rate_limiter = get_upstream_rate_limiter(provider, api_key)
+
+    def _should_retry(self, retry_state: RetryCallState) -> bool:
+        error = retry_state.outcome.exception()
+        if error is None or not is_retryable_error(error):
+            return False
+        if retry_state.attempt_number >= self.max_attempts:
+            return False
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None and retry_after > UPSTREAM_RETRY_MAX_DELAY_SECONDS:
+            return False
+        if not upstream_retry_budget.try_spend():
+            UPSTREAM_RETRIES.labels(self.provider, "budget_exhausted").inc()
+            log_message(LogLevel.WARNING, "Upstream retry budget exhausted", provider=self.provider, error=str(error))
+            return False
+        UPSTREAM_RETRIES.labels(self.provider, "retried").inc()
+        return True
+
+    def _retry_kwargs(self) -> dict[str, Any]:
+        backoff = wait_random_exponential(multiplier=UPSTREAM_RETRY_BASE_DELAY_SECONDS, max=UPSTREAM_RETRY_MAX_DELAY_SECONDS)
+
+        def wait(retry_state: RetryCallState) -> float:
+            retry_after = retry_after_seconds(retry_state.outcome.exception())
+            return retry_after if retry_after is not None else backoff(retry_state)
+
+        return {"retry": self._should_retry, "wait": wait, "reraise": True}
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        upstream_retry_budget.record_request()
+        for attempt in Retrying(**self._retry_kwargs()):
+            with attempt:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                result = func(*args, **kwargs)
+        return result
+
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        upstream_retry_budget.record_request()
+        async for attempt in AsyncRetrying(**self._retry_kwargs()):
+            with attempt:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.aacquire()
+                result = await func(*args, **kwargs)
+        return result
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await self.acall(func, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
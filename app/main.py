@@ -1,26 +1,74 @@
 # app/main.py
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.clients.jupiter_client import JupiterClient
+from app.clients.moralis_client import close_moralis_http_client
+from app.clients.solana_rpc_client import close_solana_rpc_client
+from app.infrastructure.compression import CompressionMiddleware
+from app.infrastructure.json_response import FastJSONResponse
+from app.infrastructure.settings import settings
 from app.utils.database_util import run_migrations
-from app.routers import optimization_router, health_router, solana_swap_router, wallet_router
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+from app.routers import optimization_router, health_router, solana_swap_router, wallet_router, helius_webhook_router, metrics_router, admin_router, yield_pool_router
+from app.infrastructure.metrics import PrometheusMiddleware, monitor_event_loop_lag
+from app.infrastructure.request_context import RequestIdMiddleware
+from app.infrastructure.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from app.infrastructure.profiling import SlowRequestProfilingMiddleware, slow_request_profiler
+from app.services.optimization_job_service import OptimizationJobWorkerPool
+from app.services.helius_webhook_service import HeliusWebhookWorkerPool
+from app.services.signature_confirmation_service import signature_confirmation_service
+from app.services.network_state_service import network_state_cache
+from app.schedulers.wallet_history_sync_scheduler import (
+    shutdown_wallet_history_sync_scheduler,
+    start_wallet_history_sync_scheduler,
 )
 
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     # run_migrations()
+    configure_tracing()
+    event_loop_lag_monitor = asyncio.create_task(monitor_event_loop_lag(), name="event-loop-lag-monitor")
+    app.state.jupiter_client = JupiterClient()
+    optimization_job_workers = None
+    if settings.OPTIMIZATION_JOB_WORKERS_ENABLED:
+        optimization_job_workers = OptimizationJobWorkerPool(
+            concurrency=settings.OPTIMIZATION_JOB_WORKER_CONCURRENCY,
+            max_attempts=settings.OPTIMIZATION_JOB_MAX_ATTEMPTS,
+        )
+        optimization_job_workers.start()
+    helius_webhook_workers = None
+    if settings.HELIUS_WEBHOOK_WORKERS_ENABLED:
+        helius_webhook_workers = HeliusWebhookWorkerPool(
+            concurrency=settings.HELIUS_WEBHOOK_WORKER_CONCURRENCY,
+        )
+        helius_webhook_workers.start()
+    if settings.NETWORK_STATE_REFRESH_ENABLED:
+        network_state_cache.start()
+    if settings.WALLET_HISTORY_SYNC_ENABLED:
+        start_wallet_history_sync_scheduler()
+    if settings.SLOW_REQUEST_PROFILING_ENABLED:
+        slow_request_profiler.start()
     logging.info("Background schedulers started")
 
     yield
 
+    if optimization_job_workers is not None:
+        await optimization_job_workers.stop()
+    if helius_webhook_workers is not None:
+        await helius_webhook_workers.stop()
+    shutdown_wallet_history_sync_scheduler()
+    await app.state.jupiter_client.aclose()
+    await network_state_cache.stop()
+    await signature_confirmation_service.stop()
+    await close_solana_rpc_client()
+    await close_moralis_http_client()
+    event_loop_lag_monitor.cancel()
+    slow_request_profiler.stop()
+    shutdown_tracing()
     logging.info("Background schedulers shutdown")
 
 
@@ -29,6 +77,7 @@ app = FastAPI(
     description="API for executing transactions and tracking user token balances and calculating portfolio value",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -40,11 +89,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(PrometheusMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+if settings.SLOW_REQUEST_PROFILING_ENABLED:
+    app.add_middleware(SlowRequestProfilingMiddleware, profiler=slow_request_profiler)
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(optimization_router.router)
 app.include_router(health_router.router)
 app.include_router(solana_swap_router.router)
 app.include_router(wallet_router.router)
+app.include_router(yield_pool_router.router)
+app.include_router(helius_webhook_router.router)
+app.include_router(metrics_router.router)
+app.include_router(admin_router.router)
 
 @app.get("/")
 async def root():
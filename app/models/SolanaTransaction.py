@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Float, Integer, BigInteger, DateTime, Enum, UniqueConstraint
+import datetime
+
+from app.enums.helius_enum import TransactionType
+from app.utils.database_util import DBBase
+
+class TokenTransfer(DBBase):
+    """
+    Model for token transfers received from Helius webhooks
+    """
+    __tablename__ = "token_transfers"
+    __table_args__ = (
+        # A webhook can be delivered more than once, the same transfer is stored only once
+        UniqueConstraint("signature", "mint", "from_user", "to_user", name="uq_token_transfers_signature_mint_from_to"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    signature = Column(String, nullable=False)
+    timestamp = Column(BigInteger, nullable=True)
+    slot = Column(BigInteger, nullable=True)
+    fee = Column(BigInteger, nullable=True)
+    fee_payer = Column(String, nullable=True)
+    # Empty string (not NULL) for mints and burns, so the unique constraint still applies
+    from_user = Column(String, nullable=False, default="")
+    to_user = Column(String, nullable=False, default="")
+    mint = Column(String, nullable=False)
+    token_amount = Column(Float, nullable=True)
+    decimals = Column(Integer, nullable=True)
+    source = Column(String, nullable=True)
+    transaction_type = Column(Enum(TransactionType, native_enum=False, length=50), nullable=False)
+    # Audit fields
+    gmt_creator = Column(String, nullable=True)
+    gmt_created = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TokenTransfer(id={self.id}, signature='{self.signature}', mint='{self.mint}')>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Float, BigInteger, DateTime, UniqueConstraint
+import datetime
+
+from app.utils.database_util import DBBase
+
+class TokenPrice(DBBase):
+    """
+    Model for historical token prices, one row per mint and time bucket
+    """
+    __tablename__ = "token_prices"
+    __table_args__ = (
+        UniqueConstraint("mint", "bucket_timestamp", name="uq_token_prices_mint_bucket_timestamp"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    mint = Column(String, nullable=False)
+    # Start of the TOKEN_PRICE_BUCKET_SECONDS bucket (unix seconds)
+    bucket_timestamp = Column(BigInteger, nullable=False)
+    price_usd = Column(Float, nullable=False)
+    source = Column(String, nullable=False, default="codex")
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TokenPrice(mint='{self.mint}', bucket_timestamp={self.bucket_timestamp}, price_usd={self.price_usd})>"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Boolean, DateTime
+import datetime
+
+from app.utils.database_util import DBBase
+
+class WalletSyncCursor(DBBase):
+    """
+    Model for the per-wallet transaction history sync position
+
+    Signatures are returned newest first, so a wallet's synced history is the
+    contiguous range between `first_verified_signature` (oldest synced) and
+    `last_fetch_signature` (newest synced).
+    """
+    __tablename__ = "wallet_sync_cursors"
+
+    wallet_address = Column(String, primary_key=True)
+    # Newest synced signature, incremental syncs fetch only what came after it
+    last_fetch_signature = Column(String, nullable=True)
+    # Oldest synced signature, the backfill continues before it
+    first_verified_signature = Column(String, nullable=True)
+    backfill_completed = Column(Boolean, nullable=False, default=False)
+    last_synced_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<WalletSyncCursor(wallet_address='{self.wallet_address}', backfill_completed={self.backfill_completed})>"
@@ -0,0 +1,67 @@
+from typing import Dict, List, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.infrastructure.metrics import observe_upstream
+from app.models.TokenPrice import TokenPrice
+
+class TokenPriceRepository:
+    """
+    Repository for handling TokenPrice data operations
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize repository with database session
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    @observe_upstream("postgres", "token_prices.get_many")
+    def get_many(self, keys: List[Tuple[str, int]]) -> Dict[Tuple[str, int], float]:
+        """
+        Get stored prices for many (mint, bucket_timestamp) pairs in one query
+
+        Args:
+            keys: (mint, bucket_timestamp) pairs
+
+        Returns:
+            Price in USD by (mint, bucket_timestamp), missing pairs are left out
+        """
+        if not keys:
+            return {}
+        rows = (
+            self.db.query(TokenPrice.mint, TokenPrice.bucket_timestamp, TokenPrice.price_usd)
+            .filter(tuple_(TokenPrice.mint, TokenPrice.bucket_timestamp).in_(keys))
+            .all()
+        )
+        return {(row.mint, row.bucket_timestamp): row.price_usd for row in rows}
+
+    @observe_upstream("postgres", "token_prices.bulk_insert")
+    def bulk_insert_ignore_duplicates(self, prices: Dict[Tuple[str, int], float], source: str = "codex") -> int:
+        """
+        Store prices, keeping the existing row when a (mint, bucket_timestamp) is already stored
+
+        Args:
+            prices: Price in USD by (mint, bucket_timestamp)
+            source: Where the prices come from
+
+        Returns:
+            Number of prices inserted
+        """
+        if not prices:
+            return 0
+        statement = (
+            insert(TokenPrice)
+            .values(
+                [
+                    {"mint": mint, "bucket_timestamp": bucket_timestamp, "price_usd": price_usd, "source": source}
+                    for (mint, bucket_timestamp), price_usd in prices.items()
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_token_prices_mint_bucket_timestamp")
+        )
+        return self.db.execute(statement).rowcount
@@ -0,0 +1,78 @@
+from typing import List, Dict, Any
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.infrastructure.metrics import observe_upstream
+from app.models.SolanaTransaction import TokenTransfer
+from app.utils.constant import TOKEN_TRANSFER_INSERT_CHUNK_SIZE
+
+class TokenTransferRepository:
+    """
+    Repository for handling TokenTransfer data operations
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize repository with database session
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    @staticmethod
+    def _to_row(transfer: TokenTransfer) -> Dict[str, Any]:
+        return {
+            "signature": transfer.signature,
+            "timestamp": transfer.timestamp,
+            "slot": transfer.slot,
+            "fee": transfer.fee,
+            "fee_payer": transfer.fee_payer,
+            "from_user": transfer.from_user or "",
+            "to_user": transfer.to_user or "",
+            "mint": transfer.mint,
+            "token_amount": transfer.token_amount,
+            "decimals": transfer.decimals,
+            "source": transfer.source,
+            "transaction_type": transfer.transaction_type,
+            "gmt_creator": transfer.gmt_creator,
+            "gmt_created": transfer.gmt_created,
+        }
+
+    @observe_upstream("postgres", "token_transfers.bulk_insert")
+    def bulk_insert_ignore_duplicates(self, transfers: List[TokenTransfer]) -> int:
+        """
+        Insert transfers with multi-row INSERTs, skipping ones already stored
+
+        Duplicates are detected on (signature, mint, from_user, to_user), so
+        redelivered webhooks are harmless. The caller commits.
+
+        Args:
+            transfers: Parsed TokenTransfer objects
+
+        Returns:
+            Number of transfers actually inserted
+        """
+        rows = [self._to_row(transfer) for transfer in transfers]
+        inserted = 0
+        for start in range(0, len(rows), TOKEN_TRANSFER_INSERT_CHUNK_SIZE):
+            statement = (
+                insert(TokenTransfer)
+                .values(rows[start:start + TOKEN_TRANSFER_INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(constraint="uq_token_transfers_signature_mint_from_to")
+            )
+            inserted += self.db.execute(statement).rowcount
+        return inserted
+
+    @observe_upstream("postgres", "token_transfers.get_by_signature")
+    def get_by_signature(self, signature: str) -> List[TokenTransfer]:
+        """
+        Get all transfers of a transaction
+
+        Args:
+            signature: Transaction signature
+
+        Returns:
+            List of TokenTransfer instances
+        """
+        return self.db.query(TokenTransfer).filter(TokenTransfer.signature == signature).all()
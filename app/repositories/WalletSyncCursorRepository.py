@@ -0,0 +1,86 @@
+from typing import List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.WalletSyncCursor import WalletSyncCursor
+
+class WalletSyncCursorRepository:
+    """
+    Repository for handling WalletSyncCursor data operations
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize repository with database session
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+
+    def track_wallet(self, wallet_address: str) -> None:
+        """
+        Start syncing a wallet's history, a no-op if it is already tracked
+
+        Args:
+            wallet_address: Solana wallet address
+        """
+        statement = (
+            insert(WalletSyncCursor)
+            .values(wallet_address=wallet_address, backfill_completed=False)
+            .on_conflict_do_nothing(index_elements=["wallet_address"])
+        )
+        self.db.execute(statement)
+
+    def get_by_wallet(self, wallet_address: str) -> Optional[WalletSyncCursor]:
+        """
+        Get the sync cursor of a wallet
+
+        Args:
+            wallet_address: Solana wallet address
+
+        Returns:
+            WalletSyncCursor instance if the wallet is tracked, None otherwise
+        """
+        return self.db.query(WalletSyncCursor).filter(WalletSyncCursor.wallet_address == wallet_address).first()
+
+    def get_all_wallet_addresses(self) -> List[str]:
+        """
+        Get every tracked wallet
+
+        Returns:
+            List of wallet addresses
+        """
+        return [row.wallet_address for row in self.db.query(WalletSyncCursor.wallet_address).all()]
+
+    def get_wallet_addresses_to_backfill(self, limit: int) -> List[str]:
+        """
+        Get tracked wallets whose older history is not fully synced yet, least recently synced first
+
+        Args:
+            limit: Maximum number of wallets
+
+        Returns:
+            List of wallet addresses
+        """
+        rows = (
+            self.db.query(WalletSyncCursor.wallet_address)
+            .filter(WalletSyncCursor.backfill_completed.is_(False))
+            .order_by(WalletSyncCursor.last_synced_at.asc().nullsfirst())
+            .limit(limit)
+            .all()
+        )
+        return [row.wallet_address for row in rows]
+
+    def update_cursor(self, wallet_address: str, **fields) -> None:
+        """
+        Update only the given cursor columns, so incremental syncs and backfills
+        of the same wallet never overwrite each other's position
+
+        Args:
+            wallet_address: Solana wallet address
+            **fields: Column values to set
+        """
+        self.db.query(WalletSyncCursor).filter(WalletSyncCursor.wallet_address == wallet_address).update(
+            fields, synchronize_session=False
+        )
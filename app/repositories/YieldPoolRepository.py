@@ -2,6 +2,8 @@ from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 import logging
 
+from app.infrastructure.metrics import observe_upstream
+
 from app.models.YieldPool import YieldPool
 
 class YieldPoolRepository:
@@ -52,6 +54,7 @@ class YieldPoolRepository:
         
         return yield_pool
     
+    @observe_upstream("postgres", "yield_pools.create_many")
     def create_many(self, pools: List[Dict[str, Any]]) -> int:
         """
         Create multiple yield pool records in the database
@@ -74,6 +77,7 @@ class YieldPoolRepository:
         self.db.commit()
         return len(created_pools)
     
+    @observe_upstream("postgres", "yield_pools.get_all")
     def get_all(self, 
                 chain: Optional[str] = None,
                 project: Optional[str] = None,
@@ -0,0 +1,67 @@
+import asyncio
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.infrastructure.profiling import ProfilerBusyError, profile_for, slow_request_profiler, to_folded
+from app.infrastructure.settings import settings
+from app.services.helius_webhook_service import replay_failed_webhook_payloads
+from app.utils.constant import HELIUS_WEBHOOK_BATCH_SIZE, PROFILER_MAX_SECONDS
+
+
+def verify_admin_token(x_admin_token: str = Header(default="")) -> None:
+    # Without a configured token the admin surface does not exist
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token, settings.ADMIN_API_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(verify_admin_token)],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+):
+    """
+    Sample the stacks of every thread of this worker for `seconds`.
+
+    Returns folded stacks, e.g. `curl ... | flamegraph.pl > profile.svg` or open in speedscope.
+    """
+    try:
+        folded, samples = await asyncio.to_thread(profile_for, seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(folded, headers={"X-Profile-Samples": str(samples)})
+
+
+@router.get("/slow-requests")
+def list_slow_request_profiles():
+    """Profiles captured for requests slower than SLOW_REQUEST_THRESHOLD_SECONDS, newest first."""
+    return {
+        "enabled": settings.SLOW_REQUEST_PROFILING_ENABLED,
+        "thresholdSeconds": slow_request_profiler.threshold_seconds,
+        "profiles": [profile.summary() for profile in reversed(slow_request_profiler.captures)],
+    }
+
+
+@router.get("/slow-requests/{profile_id}", response_class=PlainTextResponse)
+def get_slow_request_profile(profile_id: str):
+    """Folded stacks of one slow request."""
+    profile = slow_request_profiler.get_capture(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(to_folded(profile.stacks), headers={"X-Profile-Samples": str(profile.samples)})
+
+
+@router.post("/webhooks/helius/replay")
+async def replay_failed_helius_webhooks(limit: int = Query(HELIUS_WEBHOOK_BATCH_SIZE, gt=0, le=10_000)):
+    """Queue up to `limit` failed Helius webhook payloads again, oldest first."""
+    replayed = await asyncio.to_thread(replay_failed_webhook_payloads, limit)
+    return {"replayed": replayed}
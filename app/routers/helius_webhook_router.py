@@ -0,0 +1,45 @@
+import asyncio
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from app.infrastructure.settings import settings
+from app.services.helius_webhook_service import WebhookQueueFullError, enqueue_webhook_payload
+from app.utils.constant import HELIUS_WEBHOOK_QUEUE_FULL_RETRY_AFTER_SECONDS
+
+
+def verify_helius_webhook_auth(authorization: str = Header(default="")) -> None:
+    # Without a configured secret anyone could write transfers, so the endpoint does not exist
+    if not settings.HELIUS_WEBHOOK_AUTH_HEADER:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(authorization, settings.HELIUS_WEBHOOK_AUTH_HEADER):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook authorization")
+
+
+router = APIRouter(
+    prefix="/webhooks",
+    tags=["webhooks"],
+    dependencies=[Depends(verify_helius_webhook_auth)],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.post("/helius", status_code=status.HTTP_202_ACCEPTED)
+async def receive_helius_webhook(request: Request):
+    """
+    Receive a Helius enhanced transaction webhook.
+
+    The body is queued as is and parsed by the ingestion workers, so the call returns right away.
+    """
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty webhook payload")
+
+    try:
+        queue_size = await asyncio.to_thread(enqueue_webhook_payload, body)
+    except WebhookQueueFullError as e:
+        # Helius retries failed deliveries, so push back instead of dropping the payload
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(HELIUS_WEBHOOK_QUEUE_FULL_RETRY_AFTER_SECONDS)},
+        )
+    return {"status": "queued", "queueSize": queue_size}
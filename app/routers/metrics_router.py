@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.infrastructure.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,13 +1,25 @@
-# This router only contains the optimization suggestion endpoint.
+# This router only contains the optimization suggestion endpoints.
 # For swap/quote logic, see solana_swap_router.py
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any
 from pydantic import BaseModel
+from app.infrastructure.json_response import FastJSONResponse
 from app.dtos.optimization_dto import OptimizationResponse, OptimizationAction
+from app.dtos.optimization_job_dto import OptimizationJobRequest, OptimizationJobResponse
 from app.services.asset_opportunity_graph_script import (
     generate_solana_optimization_suggestions,
+    normalize_optimization_action_mints,
 )
+from app.services.optimization_job_service import (
+    OptimizationQueueFullError,
+    get_optimization_job,
+    stream_optimization_job_events,
+    submit_optimization_job,
+)
+from app.utils.constant import OPTIMIZATION_JOB_QUEUE_FULL_RETRY_AFTER_SECONDS
 
 router = APIRouter(
     prefix="/optimization",
@@ -30,26 +42,60 @@ async def optimize_solana_assets(request: SolanaAssetsRequest):
     Returns wallet score, total suggestion, recommendations, and optimization actions only.
     """
     try:
-        optimization_response = generate_solana_optimization_suggestions(
-            assets=request.assets
+        # The LLM chain is blocking, keep it off the event loop
+        optimization_response = await asyncio.to_thread(
+            generate_solana_optimization_suggestions, assets=request.assets
         )
-
-        symbol_to_mint = {
-            "SOL": "So11111111111111111111111111111111111111112",
-            "JITOSOL": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
-            "Highest APY Yield Pool": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
-        }
-
-        # replace symbol with mint address
-        for action in optimization_response.optimization_actions:
-            if action.input_mint in symbol_to_mint:
-                action.input_mint = symbol_to_mint[action.input_mint]
-            if action.output_mint in symbol_to_mint:
-                action.output_mint = symbol_to_mint[action.output_mint]
-
-        return optimization_response
+        return FastJSONResponse(normalize_optimization_action_mints(optimization_response))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate optimization suggestions: {str(e)}",
         )
+
+
+@router.post(
+    "/solana/jobs",
+    response_model=OptimizationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={429: {"description": "Optimization queue is full"}},
+)
+async def submit_solana_optimization_job(request: OptimizationJobRequest):
+    """
+    Queue optimization suggestions for Solana assets and return a job id right away.
+    Poll GET /optimization/solana/jobs/{job_id} or subscribe to its /events stream for the result.
+    """
+    try:
+        job = await asyncio.to_thread(
+            submit_optimization_job, assets=request.assets, priority=request.priority
+        )
+    except OptimizationQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(OPTIMIZATION_JOB_QUEUE_FULL_RETRY_AFTER_SECONDS)},
+        )
+    return FastJSONResponse(job, status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/solana/jobs/{job_id}", response_model=OptimizationJobResponse)
+async def get_solana_optimization_job(job_id: str):
+    """
+    Get the status, queue position and (once finished) the result of an optimization job.
+    """
+    job = await asyncio.to_thread(get_optimization_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return FastJSONResponse(job)
+
+
+@router.get("/solana/jobs/{job_id}/events")
+async def stream_solana_optimization_job(job_id: str):
+    """
+    Server-Sent Events stream of job updates, closed once the job succeeds or fails.
+    """
+    return StreamingResponse(
+        stream_optimization_job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
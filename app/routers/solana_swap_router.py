@@ -1,7 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import List
 from pydantic import BaseModel
-import httpx
+from app.clients.jupiter_client import JupiterClient
 from app.dtos.optimization_dto import OptimizationAction
+from app.dtos.swap_transaction_dto import SwapTransactionResult
+from app.infrastructure.json_response import FastJSONResponse
+from app.services.solana_swap_service import build_swap_transaction, build_swap_transactions
+from app.utils.constant import JUPITER_DEFAULT_SLIPPAGE_BPS
 
 router = APIRouter(
     prefix="/transactions",
@@ -13,6 +18,7 @@ router = APIRouter(
 class SolanaQuoteSwapRequest(BaseModel):
     action: OptimizationAction
     userPublicKey: str
+    slippageBps: int = JUPITER_DEFAULT_SLIPPAGE_BPS
 
 
 class SolanaQuoteSwapResponse(BaseModel):
@@ -20,62 +26,48 @@ class SolanaQuoteSwapResponse(BaseModel):
     transaction: str
 
 
+class SolanaBatchQuoteSwapRequest(BaseModel):
+    actions: List[OptimizationAction]
+    userPublicKey: str
+    slippageBps: int = JUPITER_DEFAULT_SLIPPAGE_BPS
+
+
+class SolanaBatchQuoteSwapResponse(BaseModel):
+    results: List[SwapTransactionResult]
+
+
+def get_jupiter_client(request: Request) -> JupiterClient:
+    """Get the process-wide Jupiter client created in the app lifespan."""
+    return request.app.state.jupiter_client
+
+
 @router.post("/solana", response_model=SolanaQuoteSwapResponse)
-async def get_solana_quote_and_swap(request: SolanaQuoteSwapRequest):
+async def get_solana_quote_and_swap(
+    request: SolanaQuoteSwapRequest,
+    jupiter_client: JupiterClient = Depends(get_jupiter_client),
+):
     """
     Given an optimization action and user public key, return the quote and swap transaction data.
     """
-    action = request.action
-    async with httpx.AsyncClient(timeout=15) as client:
-        params = {
-            "inputMint": action.input_mint,
-            "outputMint": action.output_mint,
-            "amount": str(int(action.amount * 1e9)),
-        }
-        # 1. Get quote
-        try:
-            resp = await client.get(
-                "https://lite-api.jup.ag/swap/v1/quote",
-                params=params,
-                headers={"Accept": "application/json"},
-            )
-            quote_json = (
-                resp.json() if resp.status_code == 200 else {"error": resp.text}
-            )
-        except Exception as ex:
-            quote_json = {"error": str(ex)}
-
-        # 2. Get swap transaction using the quote (if valid)
-        swap_tx_json = None
-        if quote_json and not quote_json.get("error"):
-            swap_payload = {
-                "userPublicKey": request.userPublicKey,
-                "quoteResponse": quote_json,
-                "prioritizationFeeLamports": {
-                    "priorityLevelWithMaxLamports": {
-                        "maxLamports": 10000000,
-                        "priorityLevel": "veryHigh",
-                    }
-                },
-                "dynamicComputeUnitLimit": True,
-            }
-            try:
-                swap_resp = await client.post(
-                    "https://lite-api.jup.ag/swap/v1/swap",
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                    },
-                    json=swap_payload,
-                )
-                swap_tx_json = (
-                    swap_resp.json()
-                    if swap_resp.status_code == 200
-                    else {"error": swap_resp.text}
-                )
-            except Exception as swap_ex:
-                swap_tx_json = {"error": str(swap_ex)}
-        else:
-            swap_tx_json = {"error": "No valid quote for swap"}
-
-    return SolanaQuoteSwapResponse(transaction=swap_tx_json.get("swapTransaction"))
+    result = await build_swap_transaction(
+        jupiter_client, request.action, request.userPublicKey, request.slippageBps
+    )
+    if result.error:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=result.error)
+
+    return FastJSONResponse(SolanaQuoteSwapResponse(transaction=result.transaction))
+
+
+@router.post("/solana/batch", response_model=SolanaBatchQuoteSwapResponse)
+async def get_solana_quote_and_swap_batch(
+    request: SolanaBatchQuoteSwapRequest,
+    jupiter_client: JupiterClient = Depends(get_jupiter_client),
+):
+    """
+    Given all optimization actions and the user public key, return every swap transaction in one round trip.
+    Actions are quoted concurrently; an action that fails carries its error instead of a transaction.
+    """
+    results = await build_swap_transactions(
+        jupiter_client, request.actions, request.userPublicKey, request.slippageBps
+    )
+    return FastJSONResponse(SolanaBatchQuoteSwapResponse(results=results))
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from app.utils.address_util import is_evm_address, is_solana_address
 from fastapi import status
-from app.clients.moralis_client import get_wallet_data_by_moralis
-from app.clients.helius_client import get_wallet_data_by_helius
 from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
-from app.enums.chain_enum import ChainEnum
+from app.infrastructure.json_response import conditional_json_response
+from app.services.wallet_history_sync_service import is_wallet_recently_tracked, track_wallet_for_history_sync
+from app.services.wallet_snapshot_service import get_wallet_snapshot
 
 router = APIRouter(
     prefix="/wallet",
@@ -13,28 +13,36 @@ router = APIRouter(
 )
 
 
-@router.get("/{wallet_address}/token-balances", response_model=WalletTotalResponseDTO)
-async def get_wallet_token_balances(wallet_address: str) -> WalletTotalResponseDTO:
+@router.get(
+    "/{wallet_address}/token-balances",
+    response_model=WalletTotalResponseDTO,
+    responses={304: {"description": "Not modified since the ETag sent in If-None-Match"}},
+)
+async def get_wallet_token_balances(
+    wallet_address: str, request: Request, background_tasks: BackgroundTasks
+) -> WalletTotalResponseDTO:
     """
-    Get token balances with prices for a specific wallet address (Base or Solana).
-    The address type is auto-detected.
+    Get token balances with prices for a specific wallet address (EVM or Solana).
+    The address type is auto-detected; EVM wallets are merged across all configured
+    chains, with a per-chain breakdown.
+
+    Responses carry an ETag; polls sending it back in `If-None-Match` get a 304
+    without body while the balances are unchanged.
     """
+    is_solana = is_solana_address(wallet_address)
+    if not is_solana and not is_evm_address(wallet_address):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid wallet address format.",
+        )
     try:
-        if is_evm_address(wallet_address):
-            result = get_wallet_data_by_moralis(wallet_address=wallet_address, chain=ChainEnum.BASE)
-            return result
-
-        elif is_solana_address(wallet_address):
-            # Use the new Helius-based function and return the new API format directly
-            solana_assets = get_wallet_data_by_helius(wallet_address)
-            return solana_assets
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid wallet address format.",
-            )
+        snapshot = await get_wallet_snapshot(wallet_address)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch wallet token balances: {str(e)}",
         )
+    if is_solana and not is_wallet_recently_tracked(wallet_address):
+        # Keep this wallet's transaction history synced from now on (polls skip the DB write)
+        background_tasks.add_task(track_wallet_for_history_sync, wallet_address)
+    return conditional_json_response(request, snapshot)
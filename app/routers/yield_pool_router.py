@@ -0,0 +1,41 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from app.dtos.yield_pool_dto import YieldPoolListResponseDTO
+from app.infrastructure.json_response import conditional_json_response
+from app.services.yield_pool_service import get_yield_pool_listing
+from app.utils.logging_util import LogLevel, log_message
+
+router = APIRouter(
+    prefix="/yield-pools",
+    tags=["yield-pools"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get(
+    "",
+    response_model=YieldPoolListResponseDTO,
+    responses={304: {"description": "Not modified since the ETag sent in If-None-Match"}},
+)
+def list_yield_pools(
+    request: Request,
+    chain: Optional[str] = Query(None, description="Chain name, e.g. Solana"),
+    project: Optional[str] = Query(None, description="Project name (partial match)"),
+    min_tvl: Optional[float] = Query(None, ge=0, description="Minimum TVL in USD"),
+    min_apy: Optional[float] = Query(None, description="Minimum APY percentage"),
+) -> YieldPoolListResponseDTO:
+    """
+    List yield pools, highest TVL first.
+
+    Responses carry an ETag; polls sending it back in `If-None-Match` get a 304
+    without body while the pools are unchanged.
+    """
+    try:
+        snapshot = get_yield_pool_listing(chain=chain, project=project, min_tvl=min_tvl, min_apy=min_apy)
+    except Exception as e:
+        log_message(LogLevel.ERROR, "Failed to list yield pools", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list yield pools",
+        )
+    return conditional_json_response(request, snapshot)
@@ -0,0 +1,84 @@
+"""
+Periodic wallet history sync.
+
+Two jobs run on an APScheduler background scheduler, each guarded by a Redis
+lock so only one API instance runs it at a time:
+    - every WALLET_SYNC_INTERVAL_SECONDS, fetch new transactions of every tracked wallet
+    - every WALLET_BACKFILL_INTERVAL_SECONDS, walk older history of a few wallets
+Wallets are processed on small thread pools, which bounds the load on Helius.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.infrastructure.database import get_db_context
+from app.repositories.WalletSyncCursorRepository import WalletSyncCursorRepository
+from app.services.wallet_history_sync_service import backfill_wallet_history, sync_wallet_new_transactions
+from app.utils.constant import (
+    WALLET_BACKFILL_CONCURRENCY,
+    WALLET_BACKFILL_INTERVAL_SECONDS,
+    WALLET_BACKFILL_WALLETS_PER_RUN,
+    WALLET_SYNC_CONCURRENCY,
+    WALLET_SYNC_INTERVAL_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.scheduled_job_util import distributed_job
+
+scheduler = BackgroundScheduler()
+
+
+def _run_for_wallets(wallet_addresses: List[str], sync: Callable[[str], int], concurrency: int) -> int:
+    def run(wallet_address: str) -> int:
+        try:
+            return sync(wallet_address)
+        except Exception as e:
+            # One failing wallet must not stop the others, it is retried on the next run
+            log_message(LogLevel.ERROR, "Wallet history sync failed", wallet_address=wallet_address, error=str(e))
+            return 0
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="wallet-sync") as executor:
+        return sum(executor.map(run, wallet_addresses))
+
+
+def sync_tracked_wallets() -> None:
+    with get_db_context() as db:
+        wallet_addresses = WalletSyncCursorRepository(db).get_all_wallet_addresses()
+    inserted = _run_for_wallets(wallet_addresses, sync_wallet_new_transactions, WALLET_SYNC_CONCURRENCY)
+    log_message(LogLevel.INFO, "Wallet history sync finished", wallets=len(wallet_addresses), inserted=inserted)
+
+
+def backfill_tracked_wallets() -> None:
+    with get_db_context() as db:
+        wallet_addresses = WalletSyncCursorRepository(db).get_wallet_addresses_to_backfill(WALLET_BACKFILL_WALLETS_PER_RUN)
+    inserted = _run_for_wallets(wallet_addresses, backfill_wallet_history, WALLET_BACKFILL_CONCURRENCY)
+    log_message(LogLevel.INFO, "Wallet history backfill finished", wallets=len(wallet_addresses), inserted=inserted)
+
+
+def start_wallet_history_sync_scheduler() -> None:
+    scheduler.add_job(
+        distributed_job,
+        "interval",
+        seconds=WALLET_SYNC_INTERVAL_SECONDS,
+        args=[sync_tracked_wallets, "wallet_history_sync"],
+        id="wallet_history_sync",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        distributed_job,
+        "interval",
+        seconds=WALLET_BACKFILL_INTERVAL_SECONDS,
+        args=[backfill_tracked_wallets, "wallet_history_backfill"],
+        id="wallet_history_backfill",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.start()
+    log_message(LogLevel.INFO, "Wallet history sync scheduler started")
+
+
+def shutdown_wallet_history_sync_scheduler() -> None:
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
@@ -1,24 +1,38 @@
-from typing import TypedDict, List, Dict, Any, Literal
+from typing import TypedDict, List, Dict, Any, Literal, Annotated, Callable
 from cachetools import TTLCache, cached
 import hashlib
 from data.input.mock_asset_data import mock_asset_data
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
 from pydantic import BaseModel, Field
 import enum
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 from app.infrastructure.settings import settings
 from langchain_core.language_models.chat_models import BaseChatModel
 from app.infrastructure.database import get_db_context
+from app.infrastructure.metrics import record_cache_lookup
+from app.infrastructure.tracing import tracer
 from app.tools.get_solana_native_token_yield_options import (
     get_solana_native_token_yield_options,
 )
-from langchain.tools import Tool
-from langchain.agents import AgentType, initialize_agent
+from app.tools.get_stablecoin_yield_options import get_stablecoin_yield_options
+from app.tools.get_liquidity_staking_token_yield_options import (
+    get_liquidity_staking_token_yield_options,
+)
 from app.clients.llm_model_client import get_llm_model
 from app.dtos.optimization_dto import OptimizationAction, OptimizationResponse
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.portfolio_encoder_util import (
+    count_tokens,
+    encode_assets_for_classification,
+    encode_classified_assets,
+    encode_yield_options,
+    split_dust,
+)
 
 
 class AssetTypeEnum(str, enum.Enum):
@@ -43,76 +57,234 @@ class AssetTypeEnum(str, enum.Enum):
     # NFT = "nft"
 
 
+def _merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    # Parallel branches report their timings in the same step
+    return {**(left or {}), **(right or {})}
+
+
 class AssetState(TypedDict, total=False):
     assets: List[Dict[str, Any]]
+    classified_assets: List[Dict[str, Any]]
+    dust_assets: List[Dict[str, Any]]
     solana_assets: List[Dict[str, Any]]
     stablecoin_assets: List[Dict[str, Any]]
+    liquidity_staking_assets: List[Dict[str, Any]]
     solana_opportunities: List[Dict[str, Any]]
     stablecoin_opportunities: List[Dict[str, Any]]
+    liquidity_staking_opportunities: List[Dict[str, Any]]
+    optimization_response: OptimizationResponse
+    node_timings: Annotated[Dict[str, float], _merge_dicts]
+    prompt_tokens: Annotated[Dict[str, int], _merge_dicts]
 
 
-class Asset(BaseModel):
-    """Asset model."""
+class AssetClassification(BaseModel):
+    """Type of the asset in row `index` of the assets table."""
 
+    index: int = Field(..., description="Value of the # column of the asset")
     type: AssetTypeEnum
-    symbol: str
-    amount: float
-    value: float
-    percentage: float
-    tokenId: str = Field(..., alias="tokenId")
-    decimals: int
-    price: float
-    currency: str
-    imageUrl: str | None = None
-
 
-class AssetList(BaseModel):
-    assets: List[Asset]
 
+class AssetClassificationList(BaseModel):
+    classifications: List[AssetClassification]
 
 
 
 # Create LRU cache for 10 minutes (600 seconds), maxsize 128 (adjust as needed)
 llm_cache = TTLCache(maxsize=128, ttl=600)
+# Suggestions are generated from worker threads, TTLCache itself is not thread-safe
+llm_cache_lock = threading.RLock()
+
+SYMBOL_TO_MINT = {
+    "SOL": "So11111111111111111111111111111111111111112",
+    "JITOSOL": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
+    "Highest APY Yield Pool": "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn",
+}
 
 def _assets_hash(assets: list[dict]) -> str:
     # Create a hash of the assets input for cache key
     assets_str = json.dumps(assets, sort_keys=True)
     return hashlib.sha256(assets_str.encode('utf-8')).hexdigest()
 
-@cached(llm_cache, key=lambda assets: _assets_hash(assets))
-def generate_solana_optimization_suggestions(
-    assets: list[dict],
-) -> OptimizationResponse:
+# Node outputs are checkpointed per node and reused while the node's inputs are unchanged
+node_checkpoint_cache = TTLCache(maxsize=512, ttl=600)
+node_checkpoint_lock = threading.RLock()
+node_checkpoint_stats = {"hits": 0, "misses": 0}
+
+
+def _checkpointed_node(node_name: str, input_keys: List[str]) -> Callable[[Callable], Callable]:
     """
-    Generate optimization suggestions for Solana assets using LangChain's tool calling to produce an OptimizationResponse.
+    Wrap a graph node so its output is checkpointed and its duration recorded (and traced).
 
     Args:
-        assets: List of user assets
+        node_name: Name of the node in the graph
+        input_keys: State keys the node reads, used as the checkpoint key
 
     Returns:
-        OptimizationResponse with recommendations
+        Decorator producing the graph node function
     """
-    # Use LangChain model with structured output for OptimizationResponse
+
+    def decorator(func: Callable[[AssetState], Dict[str, Any]]) -> Callable[[AssetState], Dict[str, Any]]:
+        def node(state: AssetState) -> Dict[str, Any]:
+            start_time = time.perf_counter()
+            checkpoint_key = (node_name, _assets_hash([state.get(key) for key in input_keys]))
+            with node_checkpoint_lock:
+                output = node_checkpoint_cache.get(checkpoint_key)
+                cache_hit = output is not None
+                node_checkpoint_stats["hits" if cache_hit else "misses"] += 1
+            record_cache_lookup(f"graph_node:{node_name}", hit=cache_hit)
+            with tracer.start_as_current_span(f"graph.{node_name}", attributes={"cache_hit": cache_hit}):
+                if not cache_hit:
+                    output = func(state)
+                    with node_checkpoint_lock:
+                        node_checkpoint_cache[checkpoint_key] = output
+                else:
+                    # No prompt was sent for a reused output
+                    output = {key: value for key, value in output.items() if key != "prompt_tokens"}
+
+            elapsed = time.perf_counter() - start_time
+            log_message(
+                LogLevel.DEBUG,
+                "Optimization graph node finished",
+                node=node_name,
+                elapsed_ms=round(elapsed * 1000, 1),
+                cache_hit=cache_hit,
+            )
+            return {**output, "node_timings": {node_name: elapsed}}
+
+        node.__name__ = node_name
+        return node
+
+    return decorator
+
+
+def _prompt_size(stage: str, prompt: str) -> Dict[str, int]:
+    tokens = count_tokens(prompt)
+    log_message(LogLevel.DEBUG, "Optimization prompt size", stage=stage, tokens=tokens)
+    return {stage: tokens}
+
+
+@_checkpointed_node("classify_assets", input_keys=["assets"])
+def classify_assets(state: AssetState) -> Dict[str, Any]:
+    """Classify the user's assets by type and split them into the branch inputs."""
     llm = get_llm_model()
-    # Prepare the prompt with detailed rules for the LLM
-    get_asset_list_prompt = f"""
-    As a financial advisor specializing in Solana assets, and give me user assets list.
+    kept_assets, dust_assets = split_dust(state["assets"])
+    classified_assets = []
+    prompt_tokens = {}
+
+    if kept_assets:
+        # Prepare the prompt with detailed rules for the LLM
+        get_asset_list_prompt = f"""
+    As a financial advisor specializing in Solana assets, classify the type of every asset in the user's assets table.
+    Return one classification per row, using the row's # value as index.
     
     User's assets:
-    {json.dumps(assets, indent=2)}
+    {encode_assets_for_classification(state["assets"])}
     """
-
-    # Generate the optimization response
-    asset_list_dto = llm.with_structured_output(AssetList).invoke(input=get_asset_list_prompt)
+        prompt_tokens = _prompt_size("classify_assets", get_asset_list_prompt)
+
+        classification_list_dto = llm.with_structured_output(AssetClassificationList).invoke(
+            input=get_asset_list_prompt
+        )
+        asset_types = {
+            classification.index: classification.type.value
+            for classification in classification_list_dto.classifications
+        }
+        classified_assets = [
+            {
+                "type": asset_types.get(index, AssetTypeEnum.OTHER.value),
+                "symbol": asset.get("symbol", ""),
+                "amount": asset.get("amount"),
+                "value": asset.get("value"),
+                "percentage": asset.get("percentage"),
+                "tokenId": asset.get("tokenId", ""),
+            }
+            for index, asset in kept_assets
+        ]
+
+    return {
+        "classified_assets": classified_assets,
+        "dust_assets": dust_assets,
+        "prompt_tokens": prompt_tokens,
+        "solana_assets": [
+            asset for asset in classified_assets if asset["type"] == AssetTypeEnum.SOLANA.value
+        ],
+        "stablecoin_assets": [
+            asset for asset in classified_assets if asset["type"] == AssetTypeEnum.STABLECOIN.value
+        ],
+        "liquidity_staking_assets": [
+            asset
+            for asset in classified_assets
+            if asset["type"] == AssetTypeEnum.LIQUIDITY_STAKING_TOKEN.value
+        ],
+    }
+
+
+@_checkpointed_node("find_solana_opportunities", input_keys=["solana_assets"])
+def find_solana_opportunities(state: AssetState) -> Dict[str, Any]:
+    """Find yield pools for native SOL holdings."""
+    if not state.get("solana_assets"):
+        return {"solana_opportunities": []}
+
+    yield_options = get_solana_native_token_yield_options.invoke({})
+    return {"solana_opportunities": [option.model_dump() for option in yield_options]}
+
+
+@_checkpointed_node("find_stablecoin_opportunities", input_keys=["stablecoin_assets"])
+def find_stablecoin_opportunities(state: AssetState) -> Dict[str, Any]:
+    """Find yield pools for stablecoin holdings."""
+    if not state.get("stablecoin_assets"):
+        return {"stablecoin_opportunities": []}
+
+    yield_options = get_stablecoin_yield_options.invoke({})
+    return {"stablecoin_opportunities": [option.model_dump() for option in yield_options]}
+
+
+@_checkpointed_node("find_liquidity_staking_opportunities", input_keys=["liquidity_staking_assets"])
+def find_liquidity_staking_opportunities(state: AssetState) -> Dict[str, Any]:
+    """Find yield pools for the liquidity staking tokens the user holds."""
+    symbols = sorted({asset["symbol"] for asset in state.get("liquidity_staking_assets", [])})
+    if not symbols:
+        return {"liquidity_staking_opportunities": []}
+
+    yield_options = get_liquidity_staking_token_yield_options.invoke({"symbols": symbols})
+    return {"liquidity_staking_opportunities": [option.model_dump() for option in yield_options]}
+
+
+@_checkpointed_node(
+    "generate_optimization_response",
+    input_keys=[
+        "classified_assets",
+        "dust_assets",
+        "solana_opportunities",
+        "stablecoin_opportunities",
+        "liquidity_staking_opportunities",
+    ],
+)
+def generate_optimization_response(state: AssetState) -> Dict[str, Any]:
+    """Turn the classified assets and the yield opportunities of every branch into an OptimizationResponse."""
+    llm = get_llm_model()
+    opportunities = "\n\n".join(
+        f"{title}:\n{encode_yield_options(state.get(key, []))}"
+        for title, key in [
+            ("Solana native token yield options", "solana_opportunities"),
+            ("Stablecoin yield options", "stablecoin_opportunities"),
+            ("Liquidity staking token yield options", "liquidity_staking_opportunities"),
+        ]
+        if state.get(key)
+    ) or "None"
 
     # Improved, explicit prompt for the LLM
     get_optimization_advice_prompt = (
         """
-    As a financial advisor specializing in Solana assets, and give me user assets list.
-    
-    User's assets:"""
-        + json.dumps(asset_list_dto.model_dump(), indent=2)
+    As a financial advisor specializing in Solana assets.
+
+    These are the user's assets (dust row = small balances grouped together):
+    """
+        + encode_classified_assets(state["classified_assets"], state.get("dust_assets"))
+        + """
+    And these are the yield options found for the user's assets:
+    """
+        + opportunities
         + """
     
     # if the amount of SOL is more than 0.005 SOL, suggest staking to the highest APY yield pool
@@ -124,36 +296,7 @@ def generate_solana_optimization_suggestions(
 
     # SOL mint address: So11111111111111111111111111111111111111112
     # Jitosol mint address: J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn
-    
-    """
-    )
-
-    tools = [
-        Tool(
-            name="get_solana_native_token_yield_options",
-            func=get_solana_native_token_yield_options,
-            description="""
-        Get yield options for Solana native token (SOL) from the database.
-        Will return yield pools of Solana native token with TVL of 10 million USD or more.
-        """,
-        ),
-    ]
-
-    # Create an agent
-    financial_suggestion_string = initialize_agent(
-        tools, llm, agent=AgentType.OPENAI_FUNCTIONS, verbose=True
-    ).run(get_optimization_advice_prompt)
 
-    get_optimization_advice_prompt = (
-        """
-    These are the user's assets:
-    """
-        + json.dumps(assets, indent=2)
-        + """
-    And these are the advice from the previous step:
-    """
-        + financial_suggestion_string
-        + """
     please help to suggest some optimization suggestions, within the format of OptimizationResponse.
 
         ---
@@ -180,11 +323,94 @@ def generate_solana_optimization_suggestions(
     """
     )
 
+    prompt_tokens = _prompt_size("generate_optimization_response", get_optimization_advice_prompt)
+
     financial_suggestion_dto = llm.with_structured_output(OptimizationResponse).invoke(
         input=get_optimization_advice_prompt
     )
+    return {"optimization_response": financial_suggestion_dto, "prompt_tokens": prompt_tokens}
+
+
+OPPORTUNITY_BRANCH_NODES = [
+    "find_solana_opportunities",
+    "find_stablecoin_opportunities",
+    "find_liquidity_staking_opportunities",
+]
+
+
+def build_optimization_graph():
+    """
+    Build the optimization pipeline:
+
+    classify_assets -> (SOL | stablecoin | LST opportunities, in parallel) -> generate_optimization_response
+    """
+    graph_builder = StateGraph(AssetState)
+    graph_builder.add_node("classify_assets", classify_assets)
+    graph_builder.add_node("find_solana_opportunities", find_solana_opportunities)
+    graph_builder.add_node("find_stablecoin_opportunities", find_stablecoin_opportunities)
+    graph_builder.add_node("find_liquidity_staking_opportunities", find_liquidity_staking_opportunities)
+    graph_builder.add_node("generate_optimization_response", generate_optimization_response)
+
+    graph_builder.add_edge(START, "classify_assets")
+    for branch_node in OPPORTUNITY_BRANCH_NODES:
+        graph_builder.add_edge("classify_assets", branch_node)
+    # Wait for every branch before generating the final response
+    graph_builder.add_edge(OPPORTUNITY_BRANCH_NODES, "generate_optimization_response")
+    graph_builder.add_edge("generate_optimization_response", END)
+
+    return graph_builder.compile()
+
+
+optimization_graph = build_optimization_graph()
+
+
+@cached(llm_cache, key=lambda assets: _assets_hash(assets), lock=llm_cache_lock, info=True)
+def generate_solana_optimization_suggestions(
+    assets: list[dict],
+) -> OptimizationResponse:
+    """
+    Generate optimization suggestions for Solana assets by running the optimization graph.
+
+    Args:
+        assets: List of user assets
+
+    Returns:
+        OptimizationResponse with recommendations
+    """
+    with tracer.start_as_current_span("optimization.generate_suggestions", attributes={"assets": len(assets)}):
+        final_state = optimization_graph.invoke({"assets": assets})
+
+    log_message(
+        LogLevel.INFO,
+        "Optimization graph finished",
+        node_timings_ms={
+            node_name: round(elapsed * 1000, 1)
+            for node_name, elapsed in final_state.get("node_timings", {}).items()
+        },
+        prompt_tokens=final_state.get("prompt_tokens", {}),
+    )
+    return final_state["optimization_response"]
 
-    return financial_suggestion_dto
+
+def normalize_optimization_action_mints(
+    optimization_response: OptimizationResponse,
+) -> OptimizationResponse:
+    """
+    Replace symbols the LLM sometimes returns in optimization actions with mint addresses.
+
+    Args:
+        optimization_response: Response returned by generate_solana_optimization_suggestions
+
+    Returns:
+        The same OptimizationResponse with mint addresses in every action
+    """
+    for action in optimization_response.optimization_actions:
+        if action.input_mint in SYMBOL_TO_MINT:
+            action.input_mint = SYMBOL_TO_MINT[action.input_mint]
+        if action.output_mint in SYMBOL_TO_MINT:
+            action.output_mint = SYMBOL_TO_MINT[action.output_mint]
+
+    return optimization_response
 
 
 def get_optimization_suggestion_from_profile(state):
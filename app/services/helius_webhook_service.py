@@ -0,0 +1,266 @@
+"""
+Helius webhook ingestion.
+
+The webhook endpoint only authenticates the call and pushes the raw body onto a
+Redis list, so Helius gets its 200 within a millisecond or two even during a
+burst. Workers pop payloads in batches, parse them with `parse_transfers` and
+store all transfers of a batch with one multi-row INSERT per 1000 rows.
+
+Popping moves the payloads into the worker's own processing list, which is only
+deleted once the batch is committed. Each pool renews a lease on its workers'
+lists; the lists of a process that died mid-batch are put back at the head of
+the queue once its lease expires. Transfers are inserted ignoring duplicates,
+so a batch stored twice is harmless.
+
+Redis layout:
+    helius:webhooks:queue                   LIST of raw webhook bodies (JSON arrays of transactions)
+    helius:webhooks:processing:{consumer}   LIST of the bodies a worker is ingesting
+    helius:webhooks:consumers               ZSET of consumers scored by lease expiry
+    helius:webhooks:failed                  LIST of bodies that could not be parsed or stored,
+                                            see `replay_failed_webhook_payloads`
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+
+from app.infrastructure.database import get_db_context
+from app.infrastructure.redis import redis_client
+from app.infrastructure.settings import settings
+from app.repositories.TokenTransferRepository import TokenTransferRepository
+from app.utils.constant import (
+    HELIUS_WEBHOOK_BATCH_SIZE,
+    HELIUS_WEBHOOK_CONSUMERS_KEY,
+    HELIUS_WEBHOOK_FAILED_KEY,
+    HELIUS_WEBHOOK_LEASE_SECONDS,
+    HELIUS_WEBHOOK_PROCESSING_KEY_PREFIX,
+    HELIUS_WEBHOOK_QUEUE_KEY,
+)
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.transfer_parser import parse_transfers
+
+WEBHOOK_CREATOR_ID = "helius-webhook"
+
+
+class WebhookQueueFullError(Exception):
+    """Raised when the webhook queue is saturated."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        super().__init__(f"Webhook queue is full ({queue_size} payloads waiting)")
+
+
+def enqueue_webhook_payload(body: bytes) -> int:
+    """
+    Queue a raw webhook body for the ingestion workers.
+
+    Returns:
+        Number of payloads waiting, including this one
+
+    Raises:
+        WebhookQueueFullError: if the queue already holds HELIUS_WEBHOOK_QUEUE_MAX_SIZE payloads
+    """
+    queue_size = redis_client.llen(HELIUS_WEBHOOK_QUEUE_KEY)
+    if queue_size >= settings.HELIUS_WEBHOOK_QUEUE_MAX_SIZE:
+        raise WebhookQueueFullError(queue_size)
+    return redis_client.rpush(HELIUS_WEBHOOK_QUEUE_KEY, body)
+
+
+def _processing_key(consumer: str) -> str:
+    return f"{HELIUS_WEBHOOK_PROCESSING_KEY_PREFIX}{consumer}"
+
+
+def _pop_batch(processing_key: str, batch_size: int, timeout: int = 1) -> list[bytes]:
+    """
+    Wait up to `timeout` seconds for a payload, then take whatever else is queued up to `batch_size`.
+
+    The payloads are moved to `processing_key`, not removed, until the batch is done.
+    """
+    first = redis_client.blmove(HELIUS_WEBHOOK_QUEUE_KEY, processing_key, timeout, "LEFT", "RIGHT")
+    if first is None:
+        return []
+    payloads = [first]
+    if batch_size > 1:
+        pipeline = redis_client.pipeline(transaction=False)
+        for _ in range(batch_size - 1):
+            pipeline.lmove(HELIUS_WEBHOOK_QUEUE_KEY, processing_key, "LEFT", "RIGHT")
+        payloads.extend(payload for payload in pipeline.execute() if payload is not None)
+    return payloads
+
+
+def _requeue_processing(processing_key: str) -> int:
+    """Put a processing list back at the head of the queue, in its original order."""
+    requeued = 0
+    while redis_client.lmove(processing_key, HELIUS_WEBHOOK_QUEUE_KEY, "RIGHT", "LEFT") is not None:
+        requeued += 1
+    return requeued
+
+
+def _fail_processing(processing_key: str) -> int:
+    """Move a processing list to the failed list, for inspection and replay."""
+    failed = 0
+    while redis_client.lmove(processing_key, HELIUS_WEBHOOK_FAILED_KEY, "LEFT", "RIGHT") is not None:
+        failed += 1
+    return failed
+
+
+def _renew_leases(consumers: list[str]) -> None:
+    expires_at = time.time() + HELIUS_WEBHOOK_LEASE_SECONDS
+    redis_client.zadd(HELIUS_WEBHOOK_CONSUMERS_KEY, {consumer: expires_at for consumer in consumers})
+
+
+def _release_consumers(consumers: list[str]) -> int:
+    """Requeue the in-flight payloads of stopping consumers and drop their leases."""
+    requeued = sum(_requeue_processing(_processing_key(consumer)) for consumer in consumers)
+    redis_client.zrem(HELIUS_WEBHOOK_CONSUMERS_KEY, *consumers)
+    return requeued
+
+
+def requeue_expired_webhook_payloads() -> int:
+    """
+    Requeue the in-flight payloads of consumers whose lease expired (their process died mid-batch).
+
+    Returns:
+        Number of payloads put back in the queue
+    """
+    requeued = 0
+    for raw_consumer in redis_client.zrangebyscore(HELIUS_WEBHOOK_CONSUMERS_KEY, 0, time.time()):
+        # Only the pool that removes the lease requeues the payloads
+        if not redis_client.zrem(HELIUS_WEBHOOK_CONSUMERS_KEY, raw_consumer):
+            continue
+        requeued += _requeue_processing(_processing_key(raw_consumer.decode("utf-8")))
+    if requeued:
+        log_message(LogLevel.WARNING, "Requeued Helius webhook payloads of expired workers", payloads=requeued)
+    return requeued
+
+
+def replay_failed_webhook_payloads(limit: int) -> int:
+    """
+    Move up to `limit` payloads from the failed list back to the end of the queue.
+
+    Returns:
+        Number of payloads replayed
+    """
+    pipeline = redis_client.pipeline(transaction=False)
+    for _ in range(limit):
+        pipeline.lmove(HELIUS_WEBHOOK_FAILED_KEY, HELIUS_WEBHOOK_QUEUE_KEY, "LEFT", "RIGHT")
+    replayed = sum(payload is not None for payload in pipeline.execute())
+    log_message(LogLevel.INFO, "Replayed failed Helius webhook payloads", payloads=replayed)
+    return replayed
+
+
+def ingest_webhook_payloads(payloads: list[bytes]) -> int:
+    """
+    Parse webhook bodies and store their token transfers in one transaction.
+
+    Bodies that are not valid JSON arrays are moved to the failed list.
+
+    Returns:
+        Number of transfers inserted (duplicates are not counted)
+    """
+    transactions = []
+    for payload in payloads:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            data = None
+        if not isinstance(data, list):
+            log_message(LogLevel.WARNING, "Discarding malformed Helius webhook payload", size=len(payload))
+            redis_client.rpush(HELIUS_WEBHOOK_FAILED_KEY, payload)
+            continue
+        transactions.extend(data)
+
+    transfers = parse_transfers(transactions, creator_id=WEBHOOK_CREATOR_ID)
+    if not transfers:
+        return 0
+    with get_db_context() as db:
+        return TokenTransferRepository(db).bulk_insert_ignore_duplicates(transfers)
+
+
+class HeliusWebhookWorkerPool:
+    """Drains the webhook queue into Postgres with a few concurrent batch workers."""
+
+    def __init__(self, concurrency: int, batch_size: int = HELIUS_WEBHOOK_BATCH_SIZE):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        # Unique across processes and hosts, so each worker owns its processing list
+        self.consumers = [f"{socket.gethostname()}:{os.getpid()}:{worker_id}" for worker_id in range(concurrency)]
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._maintain_leases(), name="helius-webhook-leases")] + [
+            asyncio.create_task(self._run_worker(worker_id), name=f"helius-webhook-worker-{worker_id}")
+            for worker_id in range(self.concurrency)
+        ]
+        log_message(LogLevel.INFO, "Helius webhook workers started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            requeued = await asyncio.to_thread(_release_consumers, self.consumers)
+        except Exception as e:
+            # The leases expire and another pool requeues the payloads
+            log_message(LogLevel.ERROR, "Failed to release Helius webhook workers", error=str(e))
+            requeued = None
+        log_message(LogLevel.INFO, "Helius webhook workers stopped", requeued=requeued)
+
+    async def _maintain_leases(self) -> None:
+        # Also runs on startup, picking up the batches of a process that was killed
+        while not self._stopping:
+            try:
+                await asyncio.to_thread(_renew_leases, self.consumers)
+                await asyncio.to_thread(requeue_expired_webhook_payloads)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_message(LogLevel.ERROR, "Failed to renew Helius webhook leases", error=str(e))
+            await asyncio.sleep(HELIUS_WEBHOOK_LEASE_SECONDS / 3)
+
+    async def _run_worker(self, worker_id: int) -> None:
+        processing_key = _processing_key(self.consumers[worker_id])
+        # Payloads left in the processing list would be deleted with the next batch, requeue them first
+        has_leftovers = True
+        while not self._stopping:
+            payloads = []
+            try:
+                if has_leftovers:
+                    await asyncio.to_thread(_requeue_processing, processing_key)
+                    has_leftovers = False
+                payloads = await asyncio.to_thread(_pop_batch, processing_key, self.batch_size)
+                if not payloads:
+                    continue
+                inserted = await asyncio.to_thread(ingest_webhook_payloads, payloads)
+                await asyncio.to_thread(redis_client.delete, processing_key)
+                log_message(
+                    LogLevel.INFO,
+                    "Ingested Helius webhook batch",
+                    worker_id=worker_id,
+                    payloads=len(payloads),
+                    inserted=inserted,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_message(LogLevel.ERROR, "Helius webhook batch failed", worker_id=worker_id, error=str(e))
+                has_leftovers = True
+                if payloads:
+                    # Keep the batch for inspection and replay instead of dropping it
+                    try:
+                        await asyncio.to_thread(_fail_processing, processing_key)
+                    except Exception as move_error:
+                        # Still in the processing list, requeued on the next iteration
+                        log_message(
+                            LogLevel.WARNING,
+                            "Failed to move Helius webhook batch to the failed list",
+                            worker_id=worker_id,
+                            error=str(move_error),
+                        )
+                await asyncio.sleep(1)
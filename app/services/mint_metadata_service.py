@@ -0,0 +1,151 @@
+"""
+Mint metadata registry.
+
+Keeps decimals and token program per mint in process memory, backed by a Redis
+hash shared by all workers. Mint decimals and owners never change, so entries do
+not expire. Unknown mints are loaded in bulk through `getMultipleAccounts`, and
+wallet balance parsing feeds the registry for free.
+"""
+
+import asyncio
+import threading
+from typing import Any, Iterable
+
+from app.clients.solana_rpc_client import get_solana_rpc_client
+from app.dtos.mint_metadata_dto import MintMetadataDTO
+from app.infrastructure.metrics import record_cache_lookup
+from app.infrastructure.redis import redis_client
+from app.utils.constant import (
+    JITOSOL_TOKEN_ADDRESS,
+    SOLANA_NATIVE_TOKEN_ADDRESS,
+    SPL_TOKEN_PROGRAM_ADDRESS,
+    USDC_TOKEN_ADDRESS,
+    USDT_TOKEN_ADDRESS,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+MINT_METADATA_REDIS_KEY = "mint_metadata"
+
+WELL_KNOWN_MINTS = [
+    MintMetadataDTO(mint=SOLANA_NATIVE_TOKEN_ADDRESS, decimals=9, token_program=SPL_TOKEN_PROGRAM_ADDRESS),
+    MintMetadataDTO(mint=USDC_TOKEN_ADDRESS, decimals=6, token_program=SPL_TOKEN_PROGRAM_ADDRESS),
+    MintMetadataDTO(mint=USDT_TOKEN_ADDRESS, decimals=6, token_program=SPL_TOKEN_PROGRAM_ADDRESS),
+    MintMetadataDTO(mint=JITOSOL_TOKEN_ADDRESS, decimals=9, token_program=SPL_TOKEN_PROGRAM_ADDRESS),
+]
+
+
+class UnknownMintError(Exception):
+    """Raised when a mint account does not exist or is not a token mint."""
+
+    def __init__(self, mints: Iterable[str]):
+        self.mints = list(mints)
+        super().__init__(f"Unknown token mint(s): {', '.join(self.mints)}")
+
+
+def _parse_mint_accounts(accounts: dict[str, dict[str, Any] | None]) -> list[MintMetadataDTO]:
+    metadata = []
+    for mint, account in accounts.items():
+        if not account:
+            continue
+        parsed = account.get("data", {})
+        if not isinstance(parsed, dict) or parsed.get("parsed", {}).get("type") != "mint":
+            continue
+        metadata.append(
+            MintMetadataDTO(
+                mint=mint,
+                decimals=parsed["parsed"]["info"]["decimals"],
+                token_program=account["owner"],
+            )
+        )
+    return metadata
+
+
+class MintMetadataRegistry:
+    """Cached decimals and token program per mint (memory, then Redis, then RPC)."""
+
+    def __init__(self, seed: Iterable[MintMetadataDTO] = ()):
+        self._memory: dict[str, MintMetadataDTO] = {metadata.mint: metadata for metadata in seed}
+        self._lock = threading.Lock()
+
+    def remember_many(self, metadata_list: Iterable[MintMetadataDTO]) -> None:
+        """Store metadata learned elsewhere (e.g. from wallet balances). Already known mints are skipped."""
+        new_metadata = {
+            metadata.mint: metadata
+            for metadata in metadata_list
+            if metadata.mint not in self._memory
+        }
+        if not new_metadata:
+            return
+
+        with self._lock:
+            self._memory.update(new_metadata)
+        try:
+            redis_client.hset(
+                MINT_METADATA_REDIS_KEY,
+                mapping={mint: metadata.model_dump_json() for mint, metadata in new_metadata.items()},
+            )
+        except Exception as e:
+            log_message(LogLevel.WARNING, "Failed to store mint metadata in Redis", error=str(e))
+
+    def get_cached_many(self, mints: Iterable[str]) -> dict[str, MintMetadataDTO]:
+        """Look mints up in memory, then Redis. Mints found in neither are left out."""
+        mints = list(dict.fromkeys(mints))
+        found = {mint: self._memory[mint] for mint in mints if mint in self._memory}
+        missing = [mint for mint in mints if mint not in found]
+        if not missing:
+            record_cache_lookup("mint_metadata", hit=True, count=len(found))
+            return found
+
+        try:
+            raw_values = redis_client.hmget(MINT_METADATA_REDIS_KEY, missing)
+        except Exception as e:
+            log_message(LogLevel.WARNING, "Failed to read mint metadata from Redis", error=str(e))
+            return found
+
+        from_redis = {
+            mint: MintMetadataDTO.model_validate_json(raw_value)
+            for mint, raw_value in zip(missing, raw_values)
+            if raw_value is not None
+        }
+        with self._lock:
+            self._memory.update(from_redis)
+        found.update(from_redis)
+        record_cache_lookup("mint_metadata", hit=True, count=len(found))
+        record_cache_lookup("mint_metadata", hit=False, count=len(mints) - len(found))
+        return found
+
+    async def get_many(self, mints: Iterable[str]) -> dict[str, MintMetadataDTO]:
+        """
+        Get metadata for every mint, loading unknown mints from RPC in bulk.
+
+        Raises:
+            UnknownMintError: if some mints are not token mints
+        """
+        mints = list(dict.fromkeys(mints))
+        found = {mint: self._memory[mint] for mint in mints if mint in self._memory}
+        if len(found) == len(mints):
+            record_cache_lookup("mint_metadata", hit=True, count=len(found))
+            return found
+
+        found = await asyncio.to_thread(self.get_cached_many, mints)
+        missing = [mint for mint in mints if mint not in found]
+        if missing:
+            accounts = await get_solana_rpc_client().get_multiple_accounts(missing)
+            fetched = _parse_mint_accounts(accounts)
+            await asyncio.to_thread(self.remember_many, fetched)
+            found.update({metadata.mint: metadata for metadata in fetched})
+
+        return self._require_all(mints, found)
+
+    async def get(self, mint: str) -> MintMetadataDTO:
+        return (await self.get_many([mint]))[mint]
+
+    @staticmethod
+    def _require_all(mints: list[str], found: dict[str, MintMetadataDTO]) -> dict[str, MintMetadataDTO]:
+        unknown = [mint for mint in mints if mint not in found]
+        if unknown:
+            raise UnknownMintError(unknown)
+        return found
+
+
+mint_metadata_registry = MintMetadataRegistry(seed=WELL_KNOWN_MINTS)
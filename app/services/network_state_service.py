@@ -0,0 +1,115 @@
+"""
+Recent blockhash and priority fee cache.
+
+A background task refreshes the latest blockhash and recent prioritization fees
+with one batched RPC call every NETWORK_STATE_REFRESH_SECONDS, so transaction
+builders read both from memory instead of adding an RPC round trip per request.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+
+from app.clients.solana_rpc_client import get_solana_rpc_client
+from app.utils.constant import (
+    BLOCKHASH_MAX_AGE_SECONDS,
+    MAX_PRIORITY_FEE_LAMPORTS,
+    MIN_PRIORITY_FEE_LAMPORTS,
+    NETWORK_STATE_REFRESH_SECONDS,
+    PRIORITY_FEE_PERCENTILE,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+
+@dataclass(frozen=True)
+class RecentBlockhash:
+    blockhash: str
+    last_valid_block_height: int
+    fetched_at: float
+
+
+def _percentile(sorted_values: list[int], pct: float) -> int:
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class NetworkStateCache:
+    """Background-refreshed latest blockhash and prioritization fees."""
+
+    def __init__(self, refresh_seconds: float = NETWORK_STATE_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._blockhash: RecentBlockhash | None = None
+        # Recent prioritization fees in micro-lamports per compute unit, sorted
+        self._prioritization_fees: list[int] = []
+        self._refresher: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._refresher = asyncio.create_task(self._refresh_loop(), name="network-state-refresher")
+        log_message(LogLevel.INFO, "Network state refresher started", refresh_seconds=self.refresh_seconds)
+
+    async def stop(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_message(LogLevel.WARNING, "Network state refresh failed", error=str(e))
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def refresh(self) -> None:
+        """Fetch the latest blockhash and recent prioritization fees in one batched call."""
+        blockhash_result, fees_result = await get_solana_rpc_client().batch(
+            [
+                ("getLatestBlockhash", [{"commitment": "confirmed"}]),
+                ("getRecentPrioritizationFees", [[]]),
+            ]
+        )
+        self._blockhash = RecentBlockhash(
+            blockhash=blockhash_result["value"]["blockhash"],
+            last_valid_block_height=blockhash_result["value"]["lastValidBlockHeight"],
+            fetched_at=time.monotonic(),
+        )
+        self._prioritization_fees = sorted(fee["prioritizationFee"] for fee in fees_result)
+
+    async def get_latest_blockhash(self) -> RecentBlockhash:
+        """
+        Get the cached blockhash, refreshing it inline only if the refresher
+        is not running or has fallen behind.
+        """
+        blockhash = self._blockhash
+        if blockhash is None or time.monotonic() - blockhash.fetched_at > BLOCKHASH_MAX_AGE_SECONDS:
+            await self.refresh()
+            blockhash = self._blockhash
+        return blockhash
+
+    def priority_fee_micro_lamports(self, percentile: float = PRIORITY_FEE_PERCENTILE) -> int:
+        """Recent prioritization fee per compute unit at `percentile`, 0 until the first refresh."""
+        return _percentile(self._prioritization_fees, percentile)
+
+    def estimate_priority_fee_lamports(
+        self, compute_units: int, percentile: float = PRIORITY_FEE_PERCENTILE
+    ) -> int:
+        """
+        Total priority fee for a transaction using `compute_units`, from recent fees.
+
+        Clamped to [MIN_PRIORITY_FEE_LAMPORTS, MAX_PRIORITY_FEE_LAMPORTS] so a quiet
+        network still lands and a fee spike cannot drain the wallet.
+        """
+        fee_lamports = self.priority_fee_micro_lamports(percentile) * compute_units // 1_000_000
+        return min(MAX_PRIORITY_FEE_LAMPORTS, max(MIN_PRIORITY_FEE_LAMPORTS, fee_lamports))
+
+
+network_state_cache = NetworkStateCache()
@@ -0,0 +1,394 @@
+"""
+Redis backed job queue for Solana optimization requests.
+
+Optimization runs several LLM calls and can take tens of seconds, so instead of
+holding an HTTP worker for the whole chain the request is stored in Redis and
+picked up by a small worker pool running inside the API process.
+
+Workers claim a job by moving it from the queue to the running set in one
+script, and their pool renews its jobs' leases while they run. Jobs whose lease
+expired (the process died) are queued again, or failed once they used up their
+attempts, so a job is never lost between the queue and its result.
+
+Redis layout:
+    optimization:jobs:queue    ZSET of job ids scored by priority, then submit time
+    optimization:jobs:delayed  ZSET of job ids waiting for a retry, scored by ready time
+    optimization:jobs:running  ZSET of claimed job ids scored by lease expiry
+    optimization:jobs:{id}     JSON job record (expires after the result TTL)
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator
+
+from app.dtos.optimization_job_dto import OptimizationJobResponse
+from app.enums.optimization_job_status_enum import OptimizationJobStatusEnum
+from app.infrastructure.redis import redis_client
+from app.infrastructure.settings import settings
+from app.services.asset_opportunity_graph_script import (
+    generate_solana_optimization_suggestions,
+    normalize_optimization_action_mints,
+)
+from app.utils.constant import (
+    OPTIMIZATION_JOB_LEASE_SECONDS,
+    OPTIMIZATION_JOB_POLL_SECONDS,
+    OPTIMIZATION_JOB_RESULT_TTL_SECONDS,
+    OPTIMIZATION_JOB_RETRY_BASE_DELAY_SECONDS,
+    OPTIMIZATION_JOB_SSE_POLL_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+QUEUE_KEY = "optimization:jobs:queue"
+DELAYED_KEY = "optimization:jobs:delayed"
+RUNNING_KEY = "optimization:jobs:running"
+JOB_KEY_PREFIX = "optimization:jobs:"
+
+# Priority dominates the score, submit time (ms) keeps FIFO order within a priority.
+PRIORITY_SCORE_WEIGHT = 10_000_000_000_000
+
+FINISHED_STATUSES = (OptimizationJobStatusEnum.SUCCEEDED, OptimizationJobStatusEnum.FAILED)
+
+# Check the queue size, store the job and queue it atomically.
+# Returns the 0-based queue position, or -1 when the queue is full.
+_ENQUEUE_SCRIPT = redis_client.register_script(
+    """
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+        return -1
+    end
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[5])
+    return redis.call('ZRANK', KEYS[1], ARGV[5])
+    """
+)
+
+# Take the first queued job and lease it, atomically, so a job is always either queued or leased.
+# Returns the job id, or nil when the queue is empty.
+_CLAIM_SCRIPT = redis_client.register_script(
+    """
+    local popped = redis.call('ZPOPMIN', KEYS[1])
+    if #popped == 0 then
+        return false
+    end
+    redis.call('ZADD', KEYS[2], ARGV[1], popped[1])
+    return popped[1]
+    """
+)
+
+
+class OptimizationQueueFullError(Exception):
+    """Raised when the optimization queue is saturated."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        super().__init__(f"Optimization queue is full ({queue_size} jobs waiting)")
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def _queue_score(priority: int, created_at: float) -> float:
+    return -priority * PRIORITY_SCORE_WEIGHT + int(created_at * 1000)
+
+
+def _load_job(job_id: str) -> dict[str, Any] | None:
+    raw = redis_client.get(_job_key(job_id))
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+def _save_job(job: dict[str, Any]) -> None:
+    job["updatedAt"] = time.time()
+    redis_client.set(
+        _job_key(job["jobId"]), json.dumps(job), ex=OPTIMIZATION_JOB_RESULT_TTL_SECONDS
+    )
+
+
+def _to_response(job: dict[str, Any], queue_position: int | None = None) -> OptimizationJobResponse:
+    return OptimizationJobResponse(
+        jobId=job["jobId"],
+        status=job["status"],
+        priority=job["priority"],
+        attempts=job["attempts"],
+        queuePosition=queue_position,
+        result=job.get("result"),
+        error=job.get("error"),
+        createdAt=job["createdAt"],
+        updatedAt=job["updatedAt"],
+    )
+
+
+def submit_optimization_job(assets: list[dict], priority: int = 0) -> OptimizationJobResponse:
+    """
+    Queue an optimization request.
+
+    Args:
+        assets: List of user assets
+        priority: 0-9, higher priority jobs are picked up first
+
+    Returns:
+        OptimizationJobResponse with the job id and its queue position
+
+    Raises:
+        OptimizationQueueFullError: if the queue already holds the maximum number of jobs
+    """
+    now = time.time()
+    job = {
+        "jobId": uuid.uuid4().hex,
+        "status": OptimizationJobStatusEnum.QUEUED.value,
+        "priority": priority,
+        "attempts": 0,
+        "assets": assets,
+        "result": None,
+        "error": None,
+        "createdAt": now,
+        "updatedAt": now,
+    }
+    queue_position = _ENQUEUE_SCRIPT(
+        keys=[QUEUE_KEY, _job_key(job["jobId"])],
+        args=[
+            settings.OPTIMIZATION_JOB_QUEUE_MAX_SIZE,
+            json.dumps(job),
+            OPTIMIZATION_JOB_RESULT_TTL_SECONDS,
+            _queue_score(priority, now),
+            job["jobId"],
+        ],
+    )
+    if queue_position < 0:
+        raise OptimizationQueueFullError(settings.OPTIMIZATION_JOB_QUEUE_MAX_SIZE)
+
+    log_message(
+        LogLevel.INFO,
+        "Optimization job queued",
+        job_id=job["jobId"],
+        priority=priority,
+        queue_position=queue_position,
+    )
+    return _to_response(job, queue_position=queue_position)
+
+
+def get_optimization_job(job_id: str) -> OptimizationJobResponse | None:
+    """Return the current state of a job, or None if it is unknown or expired."""
+    job = _load_job(job_id)
+    if job is None:
+        return None
+
+    queue_position = None
+    if job["status"] == OptimizationJobStatusEnum.QUEUED.value:
+        queue_position = redis_client.zrank(QUEUE_KEY, job_id)
+    return _to_response(job, queue_position=queue_position)
+
+
+async def stream_optimization_job_events(job_id: str) -> AsyncIterator[str]:
+    """
+    Yield Server-Sent Events for a job until it finishes.
+
+    An event is emitted whenever the job changes (status, attempts or queue position).
+    """
+    last_payload = None
+    while True:
+        job = await asyncio.to_thread(get_optimization_job, job_id)
+        if job is None:
+            yield f"event: error\ndata: {json.dumps({'detail': 'Job not found'})}\n\n"
+            return
+
+        payload = job.model_dump_json()
+        if payload != last_payload:
+            yield f"event: {job.status.value}\ndata: {payload}\n\n"
+            last_payload = payload
+
+        if job.status in FINISHED_STATUSES:
+            return
+        await asyncio.sleep(OPTIMIZATION_JOB_SSE_POLL_SECONDS)
+
+
+def _promote_due_retries() -> None:
+    """Move jobs whose retry delay has passed back into the queue."""
+    for raw_job_id in redis_client.zrangebyscore(DELAYED_KEY, 0, time.time()):
+        # Only the worker that removes the entry re-queues it
+        if not redis_client.zrem(DELAYED_KEY, raw_job_id):
+            continue
+        job_id = raw_job_id.decode("utf-8")
+        job = _load_job(job_id)
+        if job is not None:
+            redis_client.zadd(QUEUE_KEY, {job_id: _queue_score(job["priority"], job["createdAt"])})
+
+
+def _next_job_id() -> str | None:
+    _promote_due_retries()
+    raw_job_id = _CLAIM_SCRIPT(keys=[QUEUE_KEY, RUNNING_KEY], args=[time.time() + OPTIMIZATION_JOB_LEASE_SECONDS])
+    if raw_job_id is None:
+        return None
+    return raw_job_id.decode("utf-8")
+
+
+def _renew_leases(job_ids: list[str]) -> None:
+    expires_at = time.time() + OPTIMIZATION_JOB_LEASE_SECONDS
+    # XX: a lease already taken over by another pool is not recreated
+    redis_client.zadd(RUNNING_KEY, {job_id: expires_at for job_id in job_ids}, xx=True)
+
+
+def _requeue_job(job_id: str, max_attempts: int | None = None) -> None:
+    """Queue a job that was claimed but did not finish, or fail it once it used up `max_attempts`."""
+    job = _load_job(job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        return
+    if max_attempts is not None and job["attempts"] >= max_attempts:
+        job["status"] = OptimizationJobStatusEnum.FAILED.value
+        job["error"] = "Worker lost while running the job"
+        _save_job(job)
+        log_message(LogLevel.ERROR, "Optimization job failed", job_id=job_id, attempts=job["attempts"], error=job["error"])
+        return
+    job["status"] = OptimizationJobStatusEnum.QUEUED.value
+    _save_job(job)
+    redis_client.zadd(QUEUE_KEY, {job_id: _queue_score(job["priority"], job["createdAt"])})
+
+
+def _requeue_expired_jobs(max_attempts: int) -> int:
+    """Requeue the jobs whose lease expired, their worker's process died while running them."""
+    requeued = 0
+    for raw_job_id in redis_client.zrangebyscore(RUNNING_KEY, 0, time.time()):
+        # Only the pool that removes the lease requeues the job
+        if not redis_client.zrem(RUNNING_KEY, raw_job_id):
+            continue
+        _requeue_job(raw_job_id.decode("utf-8"), max_attempts)
+        requeued += 1
+    if requeued:
+        log_message(LogLevel.WARNING, "Requeued optimization jobs of lost workers", jobs=requeued)
+    return requeued
+
+
+def _release_jobs(job_ids: list[str]) -> None:
+    """Give back the jobs of a stopping pool, their attempt does not count as a failure."""
+    for job_id in job_ids:
+        if redis_client.zrem(RUNNING_KEY, job_id):
+            _requeue_job(job_id)
+
+
+def _finish_job(job_id: str, retry_delay: float | None) -> None:
+    pipeline = redis_client.pipeline(transaction=True)
+    if retry_delay is not None:
+        pipeline.zadd(DELAYED_KEY, {job_id: time.time() + retry_delay})
+    pipeline.zrem(RUNNING_KEY, job_id)
+    pipeline.execute()
+
+
+class OptimizationJobWorkerPool:
+    """
+    Runs queued optimization jobs with bounded concurrency.
+
+    Each worker handles one job at a time, so at most `concurrency` LLM chains
+    run per process. Failed jobs are retried with exponential backoff up to
+    OPTIMIZATION_JOB_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, concurrency: int, max_attempts: int):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self._tasks: list[asyncio.Task] = []
+        self._running: set[str] = set()
+        self._stopping = False
+
+    def start(self) -> None:
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._maintain_leases(), name="optimization-job-leases")] + [
+            asyncio.create_task(self._run_worker(worker_id), name=f"optimization-worker-{worker_id}")
+            for worker_id in range(self.concurrency)
+        ]
+        log_message(LogLevel.INFO, "Optimization job workers started", concurrency=self.concurrency)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = list(self._running)
+        self._running.clear()
+        try:
+            await asyncio.to_thread(_release_jobs, released)
+        except Exception as e:
+            # The leases expire and another pool requeues the jobs
+            log_message(LogLevel.ERROR, "Failed to release optimization jobs", error=str(e))
+        log_message(LogLevel.INFO, "Optimization job workers stopped", released=len(released))
+
+    async def _maintain_leases(self) -> None:
+        # Also runs on startup, picking up the jobs of a process that was killed
+        while not self._stopping:
+            try:
+                if self._running:
+                    await asyncio.to_thread(_renew_leases, list(self._running))
+                await asyncio.to_thread(_requeue_expired_jobs, self.max_attempts)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_message(LogLevel.ERROR, "Failed to renew optimization job leases", error=str(e))
+            await asyncio.sleep(OPTIMIZATION_JOB_LEASE_SECONDS / 3)
+
+    async def _run_worker(self, worker_id: int) -> None:
+        while not self._stopping:
+            try:
+                job_id = await asyncio.to_thread(_next_job_id)
+            except Exception as e:
+                log_message(LogLevel.ERROR, "Failed to poll optimization queue", worker_id=worker_id, error=str(e))
+                await asyncio.sleep(1)
+                continue
+
+            if job_id is None:
+                await asyncio.sleep(OPTIMIZATION_JOB_POLL_SECONDS)
+                continue
+            self._running.add(job_id)
+            try:
+                await self._process_job(job_id)
+            except asyncio.CancelledError:
+                # Still in _running, released by stop
+                raise
+            except Exception as e:
+                # Its lease is no longer renewed, the job is requeued once it expires
+                log_message(LogLevel.ERROR, "Optimization job processing failed", job_id=job_id, error=str(e))
+            self._running.discard(job_id)
+
+    async def _process_job(self, job_id: str) -> None:
+        job = await asyncio.to_thread(_load_job, job_id)
+        if job is None:
+            log_message(LogLevel.WARNING, "Optimization job expired before it ran", job_id=job_id)
+            await asyncio.to_thread(_finish_job, job_id, None)
+            return
+
+        job["status"] = OptimizationJobStatusEnum.RUNNING.value
+        job["attempts"] += 1
+        await asyncio.to_thread(_save_job, job)
+
+        retry_delay = None
+        try:
+            optimization_response = await asyncio.to_thread(
+                generate_solana_optimization_suggestions, assets=job["assets"]
+            )
+            optimization_response = normalize_optimization_action_mints(optimization_response)
+            job["status"] = OptimizationJobStatusEnum.SUCCEEDED.value
+            job["result"] = optimization_response.model_dump()
+            job["error"] = None
+            log_message(LogLevel.INFO, "Optimization job succeeded", job_id=job_id, attempts=job["attempts"])
+        except Exception as e:
+            job["error"] = str(e)
+            if job["attempts"] < self.max_attempts:
+                job["status"] = OptimizationJobStatusEnum.QUEUED.value
+                retry_delay = OPTIMIZATION_JOB_RETRY_BASE_DELAY_SECONDS * 2 ** (job["attempts"] - 1)
+                log_message(
+                    LogLevel.WARNING,
+                    "Optimization job failed, retrying",
+                    job_id=job_id,
+                    attempts=job["attempts"],
+                    retry_delay=retry_delay,
+                    error=str(e),
+                )
+            else:
+                job["status"] = OptimizationJobStatusEnum.FAILED.value
+                log_message(LogLevel.ERROR, "Optimization job failed", job_id=job_id, attempts=job["attempts"], error=str(e))
+
+        await asyncio.to_thread(_save_job, job)
+        # Schedule the retry only after the record is saved so a promoted job never sees stale state
+        await asyncio.to_thread(_finish_job, job_id, retry_delay)
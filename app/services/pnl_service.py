@@ -0,0 +1,228 @@
+"""
+PnL and cost basis engine.
+
+Transactions are sorted once and grouped by token in a single pass
+(`group_txs_by_token`), then every token's position is folded over its own
+transactions only, so a wallet with T tokens and N transactions costs O(N)
+instead of O(T*N) rescans. Positions keep their state, so new transactions are
+applied incrementally; an out-of-order transaction only replays its own token.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Tuple
+
+from app.dtos.historical_transaction_dto import HistoricalTransactionDTO
+from app.dtos.pnl_dto import TokenPnlDTO, WalletPnlDTO
+from app.enums.cost_basis_method_enum import CostBasisMethodEnum
+from app.enums.helius_enum import TransactionType
+from app.enums.true_north_transaction_type import TrueNorthTransactionType
+from app.services.token_price_service import fill_missing_transaction_prices
+from app.utils.constant import NOT_SHOW_PNL_TOKEN_LIST, PNL_CALCULTATION_CLOSE_POSITION_THRESHOLD_USD_VALUE
+from app.utils.token_tx_utils import group_txs_by_token
+from app.utils.transaction_skip_utils import check_if_transaction_needs_skip
+
+TRADE_TRANSACTION_TYPES = (TrueNorthTransactionType.TRADE.value, TransactionType.SWAP.value)
+CLOSE_POSITION_THRESHOLD_USD = float(PNL_CALCULTATION_CLOSE_POSITION_THRESHOLD_USD_VALUE)
+
+
+@dataclass
+class TokenPosition:
+    """Running position of one token, updated one transaction at a time."""
+
+    token_address: str
+    method: CostBasisMethodEnum
+    quantity: float = 0.0
+    cost_basis_usd: float = 0.0
+    realized_pnl_usd: float = 0.0
+    skipped_transactions: int = 0
+    last_timestamp: int = 0
+    # FIFO lots as [quantity, unit cost]; unused with the average cost method
+    lots: Deque[List[float]] = field(default_factory=deque)
+    # Applied transactions, kept to replay the token when an older one arrives late
+    transactions: List[HistoricalTransactionDTO] = field(default_factory=list)
+
+    def _acquire(self, amount: float, unit_cost: float) -> None:
+        self.quantity += amount
+        self.cost_basis_usd += amount * unit_cost
+        if self.method == CostBasisMethodEnum.FIFO:
+            self.lots.append([amount, unit_cost])
+
+    def _dispose(self, amount: float) -> float:
+        """Remove up to `amount` from the position and return the cost basis removed."""
+        amount = min(amount, self.quantity)
+        if amount <= 0:
+            return 0.0
+
+        if self.method == CostBasisMethodEnum.AVERAGE:
+            removed_cost = self.cost_basis_usd * amount / self.quantity
+        else:
+            removed_cost = 0.0
+            remaining = amount
+            while remaining > 0 and self.lots:
+                lot = self.lots[0]
+                used = min(remaining, lot[0])
+                removed_cost += used * lot[1]
+                lot[0] -= used
+                remaining -= used
+                if lot[0] <= 0:
+                    self.lots.popleft()
+
+        self.quantity -= amount
+        self.cost_basis_usd = max(0.0, self.cost_basis_usd - removed_cost)
+        return removed_cost
+
+    def _sell(self, amount: float, price_usd: float) -> None:
+        # Selling more than the known history holds: only the held part has a cost basis
+        sold = min(amount, self.quantity)
+        removed_cost = self._dispose(sold)
+        self.realized_pnl_usd += sold * price_usd - removed_cost
+
+    def apply(self, tx: HistoricalTransactionDTO) -> None:
+        """Apply one transaction touching this token."""
+        self.transactions.append(tx)
+        self.last_timestamp = max(self.last_timestamp, tx.timestamp)
+        if check_if_transaction_needs_skip(tx, self.token_address):
+            self.skipped_transactions += 1
+            return
+
+        if tx.transaction_type in TRADE_TRANSACTION_TYPES:
+            if tx.output_token == self.token_address:
+                self._acquire(tx.output_token_amount or 0.0, tx.output_token_price_usd or 0.0)
+            if tx.input_token == self.token_address:
+                self._sell(tx.input_token_amount or 0.0, tx.input_token_price_usd or 0.0)
+        elif tx.transfer_token_address == self.token_address:
+            amount = tx.transfer_token_amount or 0.0
+            if tx.address_to == tx.user_address:
+                # Deposits enter at their market value
+                self._acquire(amount, tx.transfer_token_price_usd or 0.0)
+            elif tx.address_from == tx.user_address:
+                # Withdrawals leave at cost, no PnL is realized
+                self._dispose(amount)
+
+    def replay(self) -> None:
+        """Rebuild the position from its transactions in timestamp order."""
+        transactions = sorted(self.transactions, key=lambda tx: tx.timestamp)
+        self.quantity = 0.0
+        self.cost_basis_usd = 0.0
+        self.realized_pnl_usd = 0.0
+        self.skipped_transactions = 0
+        self.last_timestamp = 0
+        self.lots.clear()
+        self.transactions = []
+        for tx in transactions:
+            self.apply(tx)
+
+    def to_dto(self, current_price_usd: float) -> TokenPnlDTO:
+        market_value = self.quantity * current_price_usd
+        return TokenPnlDTO(
+            tokenAddress=self.token_address,
+            quantity=self.quantity,
+            costBasisUsd=self.cost_basis_usd,
+            averageCostUsd=self.cost_basis_usd / self.quantity if self.quantity > 0 else 0.0,
+            currentPriceUsd=current_price_usd,
+            realizedPnlUsd=self.realized_pnl_usd,
+            unrealizedPnlUsd=market_value - self.cost_basis_usd,
+            isClosed=market_value < CLOSE_POSITION_THRESHOLD_USD,
+            skippedTransactions=self.skipped_transactions,
+        )
+
+
+class PnlEngine:
+    """Cost basis and PnL of every token of a wallet, updated incrementally."""
+
+    def __init__(self, wallet_address: str, method: CostBasisMethodEnum = CostBasisMethodEnum.FIFO):
+        self.wallet_address = wallet_address
+        self.method = method
+        self.positions: Dict[str, TokenPosition] = {}
+        self._seen: set[Tuple[str, str]] = set()
+
+    def _position(self, token_address: str) -> TokenPosition:
+        position = self.positions.get(token_address)
+        if position is None:
+            position = TokenPosition(token_address=token_address, method=self.method)
+            self.positions[token_address] = position
+        return position
+
+    def add_transactions(self, transactions: Iterable[HistoricalTransactionDTO]) -> None:
+        """
+        Apply new transactions. Already applied ones (same signature and token) are ignored.
+
+        Transactions older than a token's latest applied one trigger a replay of
+        that token only.
+        """
+        new_transactions = sorted(transactions, key=lambda tx: tx.timestamp)
+        for token_address, token_transactions in group_txs_by_token(new_transactions).items():
+            if token_address in NOT_SHOW_PNL_TOKEN_LIST:
+                continue
+            position = self._position(token_address)
+            needs_replay = False
+            for tx in token_transactions:
+                key = (tx.signature, token_address)
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                if tx.timestamp < position.last_timestamp:
+                    position.transactions.append(tx)
+                    needs_replay = True
+                else:
+                    position.apply(tx)
+            if needs_replay:
+                position.replay()
+
+    def get_wallet_pnl(self, current_prices_usd: Dict[str, float]) -> WalletPnlDTO:
+        """
+        Realized and unrealized PnL of every token.
+
+        Args:
+            current_prices_usd: Current price by token address (missing prices count as 0)
+        """
+        tokens = [
+            position.to_dto(current_prices_usd.get(token_address, 0.0))
+            for token_address, position in self.positions.items()
+        ]
+        tokens.sort(key=lambda token: abs(token.realizedPnlUsd + token.unrealizedPnlUsd), reverse=True)
+        return WalletPnlDTO(
+            walletAddress=self.wallet_address,
+            method=self.method,
+            tokens=tokens,
+            totalRealizedPnlUsd=sum(token.realizedPnlUsd for token in tokens),
+            totalUnrealizedPnlUsd=sum(token.unrealizedPnlUsd for token in tokens),
+        )
+
+
+def calculate_wallet_pnl(
+    wallet_address: str,
+    transactions: List[HistoricalTransactionDTO],
+    current_prices_usd: Dict[str, float],
+    method: CostBasisMethodEnum = CostBasisMethodEnum.FIFO,
+) -> WalletPnlDTO:
+    """
+    Calculate PnL for all tokens of a wallet at once.
+
+    Args:
+        wallet_address: Wallet the transactions belong to
+        transactions: Composed transaction history, in any order
+        current_prices_usd: Current price by token address
+        method: FIFO or average cost basis
+
+    Returns:
+        WalletPnlDTO with one entry per token
+    """
+    engine = PnlEngine(wallet_address, method)
+    engine.add_transactions(transactions)
+    return engine.get_wallet_pnl(current_prices_usd)
+
+
+async def calculate_wallet_pnl_with_historical_prices(
+    wallet_address: str,
+    transactions: List[HistoricalTransactionDTO],
+    current_prices_usd: Dict[str, float],
+    method: CostBasisMethodEnum = CostBasisMethodEnum.FIFO,
+) -> WalletPnlDTO:
+    """
+    Same as `calculate_wallet_pnl`, but fills missing transaction prices from
+    the historical price service first, so those transactions are not skipped.
+    """
+    await fill_missing_transaction_prices(transactions)
+    return calculate_wallet_pnl(wallet_address, transactions, current_prices_usd, method)
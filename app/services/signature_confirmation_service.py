@@ -0,0 +1,179 @@
+"""
+Transaction confirmation tracking.
+
+Callers register a signature and await a future. A single background poller
+checks every pending signature with batched `getSignatureStatuses` calls (256
+signatures per call), so a hundred transactions in flight cost the same RPC
+traffic as one, and no request thread sleeps while waiting.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.clients.solana_rpc_client import get_solana_rpc_client
+from app.utils.constant import (
+    SIGNATURE_CONFIRMATION_POLL_SECONDS,
+    SIGNATURE_CONFIRMATION_TIMEOUT_SECONDS,
+    SOLANA_RPC_MAX_SIGNATURES_PER_CALL,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+COMMITMENT_LEVELS = {"processed": 0, "confirmed": 1, "finalized": 2}
+
+
+class TransactionFailedError(Exception):
+    """Raised when a transaction landed on chain but failed."""
+
+    def __init__(self, signature: str, error: Any):
+        self.signature = signature
+        self.error = error
+        super().__init__(f"Transaction {signature} failed: {error}")
+
+
+class ConfirmationTimeoutError(Exception):
+    """Raised when a transaction did not reach the wanted commitment in time."""
+
+    def __init__(self, signature: str, timeout_seconds: float):
+        self.signature = signature
+        super().__init__(f"Transaction {signature} not confirmed after {timeout_seconds}s")
+
+
+@dataclass
+class _PendingSignature:
+    commitment: str
+    deadline: float
+    timeout_seconds: float
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class SignatureConfirmationService:
+    """Tracks pending signatures and resolves their futures from one shared poller."""
+
+    def __init__(self, poll_seconds: float = SIGNATURE_CONFIRMATION_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._pending: dict[str, _PendingSignature] = {}
+        self._wakeup = asyncio.Event()
+        self._poller: asyncio.Task | None = None
+
+    def track(
+        self,
+        signature: str,
+        commitment: str = "confirmed",
+        timeout_seconds: float = SIGNATURE_CONFIRMATION_TIMEOUT_SECONDS,
+    ) -> asyncio.Future:
+        """
+        Start tracking a signature.
+
+        Returns:
+            Future resolved with the signature status once it reaches `commitment`.
+            It fails with TransactionFailedError or ConfirmationTimeoutError.
+        """
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.get(signature)
+        if pending is None:
+            pending = _PendingSignature(
+                commitment=commitment,
+                deadline=time.monotonic() + timeout_seconds,
+                timeout_seconds=timeout_seconds,
+            )
+            self._pending[signature] = pending
+        elif COMMITMENT_LEVELS[commitment] > COMMITMENT_LEVELS[pending.commitment]:
+            pending.commitment = commitment
+        pending.deadline = max(pending.deadline, time.monotonic() + timeout_seconds)
+        pending.futures.append(future)
+
+        self._ensure_poller()
+        self._wakeup.set()
+        return future
+
+    async def wait_for_confirmation(
+        self,
+        signature: str,
+        commitment: str = "confirmed",
+        timeout_seconds: float = SIGNATURE_CONFIRMATION_TIMEOUT_SECONDS,
+    ) -> dict[str, Any]:
+        """Await a signature reaching `commitment`, see `track`."""
+        return await self.track(signature, commitment, timeout_seconds)
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop(), name="signature-confirmation-poller")
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        for pending in self._pending.values():
+            for future in pending.futures:
+                future.cancel()
+        self._pending.clear()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            if not self._pending:
+                # Idle until a signature is tracked
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await self._poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_message(LogLevel.WARNING, "Signature status poll failed", error=str(e))
+            # Also when the poll failed, so callers are not left waiting past their timeout during an RPC outage
+            self._expire_overdue(time.monotonic())
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _poll_once(self) -> None:
+        signatures = list(self._pending)
+        chunks = [
+            signatures[start:start + SOLANA_RPC_MAX_SIGNATURES_PER_CALL]
+            for start in range(0, len(signatures), SOLANA_RPC_MAX_SIGNATURES_PER_CALL)
+        ]
+        client = get_solana_rpc_client()
+        results = await asyncio.gather(*(client.get_signature_statuses(chunk) for chunk in chunks))
+
+        now = time.monotonic()
+        for chunk, statuses in zip(chunks, results):
+            for signature, signature_status in zip(chunk, statuses):
+                self._update(signature, signature_status, now)
+
+    def _update(self, signature: str, signature_status: dict[str, Any] | None, now: float) -> None:
+        pending = self._pending.get(signature)
+        if pending is None:
+            return
+
+        if signature_status is not None and signature_status.get("err") is not None:
+            self._resolve(signature, error=TransactionFailedError(signature, signature_status["err"]))
+        elif signature_status is not None and COMMITMENT_LEVELS.get(
+            signature_status.get("confirmationStatus"), -1
+        ) >= COMMITMENT_LEVELS[pending.commitment]:
+            self._resolve(signature, result=signature_status)
+        elif now >= pending.deadline:
+            self._resolve(signature, error=ConfirmationTimeoutError(signature, pending.timeout_seconds))
+
+    def _expire_overdue(self, now: float) -> None:
+        for signature, pending in list(self._pending.items()):
+            if now >= pending.deadline:
+                self._resolve(signature, error=ConfirmationTimeoutError(signature, pending.timeout_seconds))
+
+    def _resolve(self, signature: str, result: Any = None, error: Exception | None = None) -> None:
+        pending = self._pending.pop(signature)
+        for future in pending.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+signature_confirmation_service = SignatureConfirmationService()
@@ -0,0 +1,108 @@
+import asyncio
+from typing import List
+
+from app.clients.jupiter_client import JupiterClient
+from app.dtos.optimization_dto import OptimizationAction
+from app.dtos.swap_transaction_dto import SwapTransactionResult
+from app.services.mint_metadata_service import mint_metadata_registry
+from app.services.network_state_service import network_state_cache
+from app.utils.constant import JUPITER_BATCH_CONCURRENCY, SWAP_COMPUTE_UNIT_ESTIMATE
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.token_amount_util import to_base_units
+
+
+async def build_swap_transaction(
+    jupiter_client: JupiterClient,
+    action: OptimizationAction,
+    user_public_key: str,
+    slippage_bps: int,
+    index: int = 0,
+) -> SwapTransactionResult:
+    """
+    Quote an optimization action on Jupiter and build its swap transaction.
+
+    Args:
+        jupiter_client: Shared Jupiter client
+        action: Optimization action to swap
+        user_public_key: Wallet that signs and pays for the swap
+        slippage_bps: Allowed slippage in basis points
+        index: Position of the action in a batch
+
+    Returns:
+        SwapTransactionResult with the transaction, or the error that prevented building it
+    """
+    # 1. Get quote, with the amount in the input mint's own base units
+    try:
+        input_mint_metadata = await mint_metadata_registry.get(action.input_mint)
+    except Exception as ex:
+        return SwapTransactionResult(index=index, action=action, error=f"Mint lookup failed: {ex}")
+
+    try:
+        quote_json = await jupiter_client.get_quote(
+            input_mint=action.input_mint,
+            output_mint=action.output_mint,
+            amount=to_base_units(action.amount, input_mint_metadata.decimals),
+            slippage_bps=slippage_bps,
+        )
+    except Exception as ex:
+        return SwapTransactionResult(index=index, action=action, error=f"Quote failed: {ex}")
+
+    # 2. Get swap transaction using the quote, capping the priority fee at what recent blocks paid
+    try:
+        swap_tx_json = await jupiter_client.get_swap_transaction(
+            quote=quote_json,
+            user_public_key=user_public_key,
+            prioritization_fee_lamports={
+                "priorityLevelWithMaxLamports": {
+                    "maxLamports": network_state_cache.estimate_priority_fee_lamports(SWAP_COMPUTE_UNIT_ESTIMATE),
+                    "priorityLevel": "veryHigh",
+                }
+            },
+        )
+    except Exception as swap_ex:
+        return SwapTransactionResult(index=index, action=action, error=f"Swap failed: {swap_ex}")
+
+    transaction = swap_tx_json.get("swapTransaction")
+    if not transaction:
+        return SwapTransactionResult(index=index, action=action, error="No swap transaction returned")
+    return SwapTransactionResult(index=index, action=action, transaction=transaction)
+
+
+async def build_swap_transactions(
+    jupiter_client: JupiterClient,
+    actions: List[OptimizationAction],
+    user_public_key: str,
+    slippage_bps: int,
+) -> List[SwapTransactionResult]:
+    """
+    Build swap transactions for every action concurrently.
+
+    At most JUPITER_BATCH_CONCURRENCY actions are quoted at once. A failing action
+    does not fail the batch, its error is reported in its own result.
+
+    Returns:
+        One SwapTransactionResult per action, in request order
+    """
+    # Resolve every input mint in one bulk lookup instead of one RPC call per action
+    try:
+        await mint_metadata_registry.get_many(action.input_mint for action in actions)
+    except Exception as e:
+        # Unknown mints are reported per action below
+        log_message(LogLevel.WARNING, "Failed to prefetch mint metadata", error=str(e))
+
+    semaphore = asyncio.Semaphore(JUPITER_BATCH_CONCURRENCY)
+
+    async def build(index: int, action: OptimizationAction) -> SwapTransactionResult:
+        async with semaphore:
+            return await build_swap_transaction(
+                jupiter_client, action, user_public_key, slippage_bps, index=index
+            )
+
+    results = await asyncio.gather(*(build(index, action) for index, action in enumerate(actions)))
+    log_message(
+        LogLevel.INFO,
+        "Built batch swap transactions",
+        actions=len(actions),
+        failed=sum(1 for result in results if result.error),
+    )
+    return list(results)
@@ -0,0 +1,194 @@
+"""
+Historical token price lookups.
+
+Prices are keyed by (mint, timestamp bucket). A lookup deduplicates its keys,
+then tries Redis, then the token_prices table, and only asks Codex for what is
+still missing, in batches of CODEX_GET_PRICE_API_BATCH_SIZE sent concurrently.
+Fetched prices are written back to Postgres and Redis, so a historical price is
+fetched from Codex once.
+"""
+
+import asyncio
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from app.clients.codex_client import get_token_prices
+from app.dtos.historical_transaction_dto import HistoricalTransactionDTO
+from app.infrastructure.database import get_db_context
+from app.infrastructure.metrics import record_cache_lookup
+from app.infrastructure.redis import redis_client
+from app.repositories.TokenPriceRepository import TokenPriceRepository
+from app.utils.constant import (
+    CODEX_GET_PRICE_API_BATCH_SIZE,
+    CODEX_GET_PRICE_API_CONCURRENCY,
+    HISTORICAL_TOKEN_PRICE_CACHE_SECONDS,
+    MISSING_TOKEN_PRICE_CACHE_SECONDS,
+    SOLANA_NETWORK_ID,
+    TOKEN_PRICE_BUCKET_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+PriceKey = Tuple[str, int]
+
+TOKEN_PRICE_KEY_PREFIX = "token_price:"
+
+
+def to_price_bucket(timestamp: int) -> int:
+    """Start of the TOKEN_PRICE_BUCKET_SECONDS bucket containing `timestamp`."""
+    return int(timestamp) - int(timestamp) % TOKEN_PRICE_BUCKET_SECONDS
+
+
+def _redis_key(key: PriceKey) -> str:
+    return f"{TOKEN_PRICE_KEY_PREFIX}{key[0]}:{key[1]}"
+
+
+def _get_cached_prices(keys: List[PriceKey]) -> Tuple[Dict[PriceKey, Optional[float]], List[PriceKey]]:
+    """Look keys up in Redis. Returns (prices, keys not in Redis); unknown prices are cached as None."""
+    try:
+        raw_values = redis_client.mget([_redis_key(key) for key in keys])
+    except Exception as e:
+        log_message(LogLevel.WARNING, "Failed to read token prices from Redis", error=str(e))
+        return {}, keys
+
+    found: Dict[PriceKey, Optional[float]] = {}
+    missing = []
+    for key, raw_value in zip(keys, raw_values):
+        if raw_value is None:
+            missing.append(key)
+        else:
+            found[key] = json.loads(raw_value)
+    return found, missing
+
+
+def _cache_prices(prices: Dict[PriceKey, Optional[float]]) -> None:
+    if not prices:
+        return
+    try:
+        pipeline = redis_client.pipeline(transaction=False)
+        for key, price in prices.items():
+            ttl = HISTORICAL_TOKEN_PRICE_CACHE_SECONDS if price is not None else MISSING_TOKEN_PRICE_CACHE_SECONDS
+            pipeline.set(_redis_key(key), json.dumps(price), ex=ttl)
+        pipeline.execute()
+    except Exception as e:
+        log_message(LogLevel.WARNING, "Failed to store token prices in Redis", error=str(e))
+
+
+def _get_stored_prices(keys: List[PriceKey]) -> Dict[PriceKey, float]:
+    with get_db_context() as db:
+        return TokenPriceRepository(db).get_many(keys)
+
+
+def _store_prices(prices: Dict[PriceKey, float]) -> None:
+    with get_db_context() as db:
+        TokenPriceRepository(db).bulk_insert_ignore_duplicates(prices)
+
+
+async def _fetch_codex_prices(keys: List[PriceKey]) -> Dict[PriceKey, Optional[float]]:
+    batches = [
+        keys[start:start + CODEX_GET_PRICE_API_BATCH_SIZE]
+        for start in range(0, len(keys), CODEX_GET_PRICE_API_BATCH_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(CODEX_GET_PRICE_API_CONCURRENCY)
+
+    async def fetch(client: httpx.AsyncClient, batch: List[PriceKey]) -> Dict[PriceKey, Optional[float]]:
+        inputs = [
+            {"address": mint, "networkId": SOLANA_NETWORK_ID, "timestamp": bucket_timestamp}
+            for mint, bucket_timestamp in batch
+        ]
+        async with semaphore:
+            try:
+                results = await get_token_prices(client, inputs)
+            except Exception as e:
+                # Leave the batch unresolved (not cached as unknown), it is retried on the next lookup
+                log_message(LogLevel.WARNING, "Codex price batch failed", size=len(batch), error=str(e))
+                return {}
+        return {
+            key: (float(result["priceUsd"]) if result and result.get("priceUsd") is not None else None)
+            for key, result in zip(batch, results)
+        }
+
+    async with httpx.AsyncClient() as client:
+        batch_results = await asyncio.gather(*(fetch(client, batch) for batch in batches))
+
+    prices: Dict[PriceKey, Optional[float]] = {}
+    for batch_result in batch_results:
+        prices.update(batch_result)
+    return prices
+
+
+async def get_historical_prices(requests: Iterable[Tuple[str, int]]) -> Dict[PriceKey, Optional[float]]:
+    """
+    Get USD prices for many (mint, timestamp) pairs.
+
+    Args:
+        requests: (mint, unix timestamp) pairs, duplicates welcome
+
+    Returns:
+        Price (None if unknown) by (mint, bucket timestamp), see `to_price_bucket`
+    """
+    keys = list(dict.fromkeys((mint, to_price_bucket(timestamp)) for mint, timestamp in requests))
+    if not keys:
+        return {}
+
+    prices, missing = await asyncio.to_thread(_get_cached_prices, keys)
+    record_cache_lookup("token_price", hit=True, count=len(prices))
+    record_cache_lookup("token_price", hit=False, count=len(missing))
+    if missing:
+        stored = await asyncio.to_thread(_get_stored_prices, missing)
+        prices.update(stored)
+        await asyncio.to_thread(_cache_prices, stored)
+        missing = [key for key in missing if key not in stored]
+
+    if missing:
+        fetched = await _fetch_codex_prices(missing)
+        prices.update(fetched)
+        await asyncio.to_thread(
+            _store_prices, {key: price for key, price in fetched.items() if price is not None}
+        )
+        await asyncio.to_thread(_cache_prices, fetched)
+        log_message(
+            LogLevel.INFO,
+            "Fetched historical token prices",
+            requested=len(missing),
+            found=sum(1 for price in fetched.values() if price is not None),
+        )
+
+    return prices
+
+
+# (token field, price field) pairs of HistoricalTransactionDTO
+TRANSACTION_PRICE_FIELDS = (
+    ("input_token", "input_token_price_usd"),
+    ("output_token", "output_token_price_usd"),
+    ("transfer_token_address", "transfer_token_price_usd"),
+)
+
+
+async def fill_missing_transaction_prices(transactions: List[HistoricalTransactionDTO]) -> int:
+    """
+    Fill missing *_token_price_usd fields in place, so PnL runs do not skip those transactions.
+
+    All missing prices of all transactions are resolved with one `get_historical_prices` call.
+
+    Returns:
+        Number of price fields filled
+    """
+    missing_fields = [
+        (tx, price_field, getattr(tx, token_field))
+        for tx in transactions
+        for token_field, price_field in TRANSACTION_PRICE_FIELDS
+        if getattr(tx, token_field) and (getattr(tx, price_field) is None or getattr(tx, price_field) <= 0)
+    ]
+    if not missing_fields:
+        return 0
+
+    prices = await get_historical_prices((mint, tx.timestamp) for tx, _, mint in missing_fields)
+    filled = 0
+    for tx, price_field, mint in missing_fields:
+        price = prices.get((mint, to_price_bucket(tx.timestamp)))
+        if price is not None:
+            setattr(tx, price_field, price)
+            filled += 1
+    return filled
@@ -0,0 +1,153 @@
+"""
+Incremental per-wallet transaction history sync.
+
+Each tracked wallet has a WalletSyncCursor. Regular syncs fetch only the
+transactions newer than `last_fetch_signature`, so their cost follows the
+wallet's new activity instead of its history length. Older history is walked
+backwards from `first_verified_signature` by a separate backfill, a bounded
+number of pages per run.
+
+Transfers and the cursor move are committed together, so an interrupted sync
+is simply repeated (transfer inserts are idempotent).
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+from app.clients.helius_client import get_parsed_transaction_history
+from app.infrastructure.database import get_db_context
+from app.models.WalletSyncCursor import WalletSyncCursor
+from app.repositories.TokenTransferRepository import TokenTransferRepository
+from app.repositories.WalletSyncCursorRepository import WalletSyncCursorRepository
+from app.utils.constant import (
+    HELIUS_TRANSACTION_HISTORY_PAGE_SIZE,
+    WALLET_BACKFILL_PAGES_PER_RUN,
+    WALLET_TRACKED_CACHE_MAX_WALLETS,
+    WALLET_TRACKED_CACHE_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+from app.utils.time_util import get_current_utc, get_transaction_signature_range
+from app.utils.transfer_parser import parse_transfers
+
+HISTORY_SYNC_CREATOR_ID = "wallet-history-sync"
+
+# Wallets this process registered recently
+_tracked_wallets: TTLCache = TTLCache(maxsize=WALLET_TRACKED_CACHE_MAX_WALLETS, ttl=WALLET_TRACKED_CACHE_SECONDS)
+_tracked_wallets_lock = threading.Lock()
+
+
+def is_wallet_recently_tracked(wallet_address: str) -> bool:
+    """Whether this process registered the wallet within WALLET_TRACKED_CACHE_SECONDS (no DB access)."""
+    with _tracked_wallets_lock:
+        return wallet_address in _tracked_wallets
+
+
+def track_wallet_for_history_sync(wallet_address: str) -> None:
+    """Register a wallet for history sync (no-op if already tracked)."""
+    with get_db_context() as db:
+        WalletSyncCursorRepository(db).track_wallet(wallet_address)
+    # Only once it is stored, so a failed write is retried on the next request
+    with _tracked_wallets_lock:
+        _tracked_wallets[wallet_address] = True
+
+
+def _get_cursor(wallet_address: str) -> Optional[WalletSyncCursor]:
+    with get_db_context() as db:
+        cursor = WalletSyncCursorRepository(db).get_by_wallet(wallet_address)
+        if cursor is not None:
+            db.expunge(cursor)
+        return cursor
+
+
+def _save_page_results(wallet_address: str, transactions: List[Dict[str, Any]], **cursor_fields) -> int:
+    """Store the transfers of `transactions` and move the cursor in one DB transaction."""
+    transfers = parse_transfers(transactions, creator_id=HISTORY_SYNC_CREATOR_ID)
+    with get_db_context() as db:
+        cursor_repository = WalletSyncCursorRepository(db)
+        cursor_repository.track_wallet(wallet_address)
+        inserted = TokenTransferRepository(db).bulk_insert_ignore_duplicates(transfers) if transfers else 0
+        cursor_repository.update_cursor(wallet_address, last_synced_at=get_current_utc(), **cursor_fields)
+    return inserted
+
+
+def sync_wallet_new_transactions(wallet_address: str) -> int:
+    """
+    Fetch and store the transactions of a wallet since its last sync.
+
+    A wallet without a cursor gets its newest page only, the older history is
+    left to `backfill_wallet_history`.
+
+    Returns:
+        Number of transfers inserted
+    """
+    cursor = _get_cursor(wallet_address)
+    before, until = get_transaction_signature_range(
+        last_fetch_signature=cursor.last_fetch_signature if cursor else None,
+    )
+
+    transactions: List[Dict[str, Any]] = []
+    while True:
+        page = get_parsed_transaction_history(wallet_address, before=before, until=until)
+        transactions.extend(page)
+        # First sync: newest page only. Otherwise page back until the last synced signature
+        if until is None or len(page) < HELIUS_TRANSACTION_HISTORY_PAGE_SIZE:
+            break
+        before = page[-1]["signature"]
+
+    if not transactions:
+        return 0
+
+    cursor_fields = {"last_fetch_signature": transactions[0]["signature"]}
+    if until is None:
+        cursor_fields["first_verified_signature"] = transactions[-1]["signature"]
+    inserted = _save_page_results(wallet_address, transactions, **cursor_fields)
+    log_message(
+        LogLevel.INFO,
+        "Synced new wallet transactions",
+        wallet_address=wallet_address,
+        transactions=len(transactions),
+        inserted=inserted,
+    )
+    return inserted
+
+
+def backfill_wallet_history(wallet_address: str, max_pages: int = WALLET_BACKFILL_PAGES_PER_RUN) -> int:
+    """
+    Store up to `max_pages` pages of history older than the oldest synced signature.
+
+    Returns:
+        Number of transfers inserted
+    """
+    cursor = _get_cursor(wallet_address)
+    if cursor is None or cursor.backfill_completed or cursor.first_verified_signature is None:
+        # Not synced yet (the regular sync sets the starting point) or nothing left
+        return 0
+
+    before, _ = get_transaction_signature_range(first_verified_signature=cursor.first_verified_signature)
+    transactions: List[Dict[str, Any]] = []
+    completed = False
+    for _ in range(max_pages):
+        page = get_parsed_transaction_history(wallet_address, before=before)
+        if not page:
+            completed = True
+            break
+        transactions.extend(page)
+        before = page[-1]["signature"]
+
+    inserted = _save_page_results(
+        wallet_address,
+        transactions,
+        first_verified_signature=before,
+        backfill_completed=completed,
+    )
+    log_message(
+        LogLevel.INFO,
+        "Backfilled wallet history",
+        wallet_address=wallet_address,
+        transactions=len(transactions),
+        inserted=inserted,
+        completed=completed,
+    )
+    return inserted
@@ -0,0 +1,209 @@
+"""
+Solana holdings providers with failover and hedged requests.
+
+Helius is the primary source of Solana wallet holdings and Solana Tracker the
+fallback; both return the same WalletTotalResponseDTO. Each provider keeps a
+health record:
+    - a CircuitBreaker: after WALLET_PROVIDER_FAILURE_THRESHOLD consecutive
+      failures it is skipped for WALLET_PROVIDER_RECOVERY_SECONDS
+    - a score, the moving average of its successes; a provider below
+      WALLET_PROVIDER_DEGRADED_SCORE is tried after the healthy ones
+    - its last WALLET_PROVIDER_LATENCY_WINDOW latencies, for the p95
+
+A fetch tries the providers in that order, failing over to the next one when a
+provider errors or times out. With WALLET_PROVIDER_HEDGING_ENABLED, the next
+provider is also asked when the first has not answered within its p95, and the
+first answer wins: a degrading provider costs at most its p95 plus the
+fallback's latency. Hedges fire for ~5% of fetches, bounding the extra load.
+
+Outcomes are recorded when a call actually completes, also for the call that
+lost a hedge, so its latency still counts towards the p95.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from app.clients.helius_client import get_wallet_data_by_helius
+from app.clients.solana_tracker_client import get_wallet_total_by_solana_tracker
+from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
+from app.infrastructure.metrics import PROVIDER_FALLBACKS, PROVIDER_HEALTH_SCORE
+from app.infrastructure.settings import settings
+from app.utils.circuit_breaker_util import CircuitBreaker, CircuitStateEnum
+from app.utils.constant import (
+    WALLET_PROVIDER_DEFAULT_HEDGE_DELAY_SECONDS,
+    WALLET_PROVIDER_DEGRADED_SCORE,
+    WALLET_PROVIDER_FAILURE_THRESHOLD,
+    WALLET_PROVIDER_HEALTH_EWMA_ALPHA,
+    WALLET_PROVIDER_LATENCY_WINDOW,
+    WALLET_PROVIDER_MIN_HEDGE_DELAY_SECONDS,
+    WALLET_PROVIDER_MIN_LATENCY_SAMPLES,
+    WALLET_PROVIDER_RECOVERY_SECONDS,
+    WALLET_PROVIDER_TIMEOUT_SECONDS,
+)
+from app.utils.logging_util import LogLevel, log_message
+
+
+class ProviderHealth:
+    """Thread-safe health record of one provider: circuit breaker, success score and latencies."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.circuit_breaker = CircuitBreaker(
+            name=f"wallet_provider:{name}",
+            failure_threshold=WALLET_PROVIDER_FAILURE_THRESHOLD,
+            recovery_timeout=WALLET_PROVIDER_RECOVERY_SECONDS,
+        )
+        self.score = 1.0
+        self._latencies: deque[float] = deque(maxlen=WALLET_PROVIDER_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        PROVIDER_HEALTH_SCORE.labels(name).set(self.score)
+
+    def record_success(self, latency: float) -> None:
+        self.circuit_breaker.record_success()
+        self._record(1.0, latency)
+
+    def record_failure(self, latency: float) -> None:
+        self.circuit_breaker.record_failure()
+        self._record(0.0, latency)
+
+    def _record(self, outcome: float, latency: float) -> None:
+        with self._lock:
+            self.score += WALLET_PROVIDER_HEALTH_EWMA_ALPHA * (outcome - self.score)
+            self._latencies.append(latency)
+            score = self.score
+        PROVIDER_HEALTH_SCORE.labels(self.name).set(score)
+
+    @property
+    def is_degraded(self) -> bool:
+        return self.circuit_breaker.state == CircuitStateEnum.OPEN or self.score < WALLET_PROVIDER_DEGRADED_SCORE
+
+    def hedge_delay(self) -> float:
+        """p95 latency over the recent calls, WALLET_PROVIDER_DEFAULT_HEDGE_DELAY_SECONDS until there are enough."""
+        with self._lock:
+            if len(self._latencies) < WALLET_PROVIDER_MIN_LATENCY_SAMPLES:
+                return WALLET_PROVIDER_DEFAULT_HEDGE_DELAY_SECONDS
+            latencies = sorted(self._latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return max(p95, WALLET_PROVIDER_MIN_HEDGE_DELAY_SECONDS)
+
+
+@dataclass
+class WalletDataProvider:
+    """A source of wallet holdings. `fetch` is blocking, it runs in a worker thread."""
+
+    name: str
+    fetch: Callable[[str], WalletTotalResponseDTO]
+    health: ProviderHealth = field(init=False)
+
+    def __post_init__(self):
+        self.health = ProviderHealth(self.name)
+
+
+async def _call_provider(provider: WalletDataProvider, wallet_address: str) -> WalletTotalResponseDTO:
+    """
+    One call to a provider, bounded by WALLET_PROVIDER_TIMEOUT_SECONDS.
+
+    Raises:
+        CircuitOpenError: if the provider is being skipped after repeated failures
+    """
+    is_trial = provider.health.circuit_breaker.before_call()
+    start = time.perf_counter()
+
+    def record_outcome(call: asyncio.Task) -> None:
+        latency = time.perf_counter() - start
+        if call.cancelled():
+            if is_trial:
+                provider.health.circuit_breaker.release_trial()
+            return
+        if call.exception() is not None or latency > WALLET_PROVIDER_TIMEOUT_SECONDS:
+            provider.health.record_failure(latency)
+        else:
+            provider.health.record_success(latency)
+
+    # Shielded, so that cancelling the caller (lost hedge, timeout) still lets the outcome be recorded
+    call = asyncio.ensure_future(asyncio.to_thread(provider.fetch, wallet_address))
+    call.add_done_callback(record_outcome)
+    return await asyncio.wait_for(asyncio.shield(call), timeout=WALLET_PROVIDER_TIMEOUT_SECONDS)
+
+
+class WalletProviderGroup:
+    """Providers of the same data, tried in order of health with failover and optional hedging."""
+
+    def __init__(self, providers: List[WalletDataProvider], hedging_enabled: bool):
+        self.providers = providers
+        self.hedging_enabled = hedging_enabled
+
+    def ordered_providers(self) -> List[WalletDataProvider]:
+        # Stable: the configured order stays among healthy (and among degraded) providers
+        return sorted(self.providers, key=lambda provider: provider.health.is_degraded)
+
+    async def fetch(self, wallet_address: str) -> WalletTotalResponseDTO:
+        """
+        Wallet holdings from the first provider to answer successfully.
+
+        Raises:
+            Exception: the last provider error, if none of them succeeded
+        """
+        remaining = self.ordered_providers()
+        in_flight: dict[asyncio.Task, WalletDataProvider] = {}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        def launch(reason: Optional[str]) -> WalletDataProvider:
+            provider = remaining.pop(0)
+            if reason is not None:
+                PROVIDER_FALLBACKS.labels(provider.name, reason).inc()
+            in_flight[asyncio.ensure_future(_call_provider(provider, wallet_address))] = provider
+            return provider
+
+        primary = launch(None)
+        try:
+            while in_flight:
+                hedge_delay = None
+                if self.hedging_enabled and not hedged and remaining and len(in_flight) == 1:
+                    hedge_delay = primary.health.hedge_delay()
+                done, _ = await asyncio.wait(in_flight, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    fallback = launch("hedge")
+                    log_message(
+                        LogLevel.INFO,
+                        "Hedging wallet provider call",
+                        provider=primary.name,
+                        fallback=fallback.name,
+                        delay_ms=round(hedge_delay * 1000),
+                    )
+                    continue
+
+                for call in done:
+                    provider = in_flight.pop(call)
+                    error = call.exception()
+                    if error is None:
+                        return call.result()
+                    last_error = error
+                    log_message(
+                        LogLevel.WARNING,
+                        "Wallet provider call failed",
+                        provider=provider.name,
+                        error=f"{type(error).__name__}: {error}",
+                    )
+                if not in_flight and remaining:
+                    launch("failover")
+        finally:
+            for call in in_flight:
+                call.cancel()
+
+        raise last_error
+
+
+solana_wallet_providers = WalletProviderGroup(
+    providers=[
+        WalletDataProvider(name="helius", fetch=get_wallet_data_by_helius),
+        WalletDataProvider(name="solana_tracker", fetch=get_wallet_total_by_solana_tracker),
+    ],
+    hedging_enabled=settings.WALLET_PROVIDER_HEDGING_ENABLED,
+)
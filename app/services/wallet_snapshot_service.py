@@ -0,0 +1,50 @@
+"""
+Wallet portfolio snapshots.
+
+Dashboards poll a wallet's token balances constantly. The balances are fetched
+from the provider (Moralis across all MORALIS_EVM_CHAINS for EVM addresses,
+Helius with Solana Tracker as fallback for Solana, see wallet_provider_service)
+at most once per USER_HOLDINGS_CACHE_SECONDS and address, and kept as a
+ResponseSnapshot: the response serialized once, with its ETag.
+Polls within the TTL reuse the bytes, and a refetch returning the same
+balances keeps the same ETag, so clients sending `If-None-Match` get a 304
+either way. EVM portfolios missing a chain (failed or timed out) are not
+cached, the next poll tries again.
+"""
+
+from cachetools import TTLCache
+
+from app.clients.moralis_client import get_evm_portfolio_by_moralis
+from app.infrastructure.json_response import ResponseSnapshot
+from app.infrastructure.metrics import record_cache_lookup
+from app.services.wallet_provider_service import solana_wallet_providers
+from app.utils.address_util import is_evm_address
+from app.utils.constant import USER_HOLDINGS_CACHE_MAX_WALLETS, USER_HOLDINGS_CACHE_SECONDS
+
+# Only used from the event loop thread, no lock needed
+wallet_snapshot_cache: TTLCache = TTLCache(maxsize=USER_HOLDINGS_CACHE_MAX_WALLETS, ttl=USER_HOLDINGS_CACHE_SECONDS)
+
+
+async def get_wallet_snapshot(wallet_address: str) -> ResponseSnapshot:
+    """
+    Token balances response of a wallet, from the snapshot cache or the provider.
+
+    Args:
+        wallet_address: EVM or Solana address, already validated
+
+    Returns:
+        ResponseSnapshot of the WalletTotalResponseDTO
+    """
+    snapshot = wallet_snapshot_cache.get(wallet_address)
+    record_cache_lookup("wallet_snapshot", hit=snapshot is not None)
+    if snapshot is not None:
+        return snapshot
+
+    if is_evm_address(wallet_address):
+        wallet = await get_evm_portfolio_by_moralis(wallet_address)
+    else:
+        wallet = await solana_wallet_providers.fetch(wallet_address)
+    snapshot = ResponseSnapshot.from_content(wallet)
+    if not any(chain.error for chain in wallet.chains or []):
+        wallet_snapshot_cache[wallet_address] = snapshot
+    return snapshot
@@ -0,0 +1,58 @@
+"""
+Yield pool listings.
+
+Listings are read from the yield_pools table, which only changes when the
+DeFi Llama script runs. Each filter combination is kept as a ResponseSnapshot
+(serialized once, with its ETag) for YIELD_POOL_LISTING_CACHE_SECONDS, so
+repeated listings skip both the query and the serialization.
+"""
+
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+
+from app.dtos.yield_pool_dto import YieldPoolListResponseDTO, YieldPoolResponseDTO
+from app.infrastructure.database import get_db_context
+from app.infrastructure.json_response import ResponseSnapshot
+from app.infrastructure.metrics import record_cache_lookup
+from app.repositories.YieldPoolRepository import YieldPoolRepository
+from app.utils.constant import YIELD_POOL_LISTING_CACHE_SECONDS
+
+yield_pool_listing_cache: TTLCache = TTLCache(maxsize=256, ttl=YIELD_POOL_LISTING_CACHE_SECONDS)
+# Listings are built from the threadpool, TTLCache itself is not thread-safe
+yield_pool_listing_cache_lock = threading.Lock()
+
+
+def get_yield_pool_listing(
+    chain: Optional[str] = None,
+    project: Optional[str] = None,
+    min_tvl: Optional[float] = None,
+    min_apy: Optional[float] = None,
+) -> ResponseSnapshot:
+    """
+    Yield pools matching the filters (see YieldPoolRepository.get_all), highest TVL first.
+
+    Returns:
+        ResponseSnapshot of the YieldPoolListResponseDTO
+    """
+    cache_key = (chain, project, min_tvl, min_apy)
+    with yield_pool_listing_cache_lock:
+        snapshot = yield_pool_listing_cache.get(cache_key)
+    record_cache_lookup("yield_pool_listing", hit=snapshot is not None)
+    if snapshot is not None:
+        return snapshot
+
+    with get_db_context() as db:
+        pools = YieldPoolRepository(db).get_all(chain=chain, project=project, min_tvl=min_tvl, min_apy=min_apy)
+        listing = YieldPoolListResponseDTO(
+            pools=sorted(
+                (YieldPoolResponseDTO.model_validate(pool) for pool in pools),
+                key=lambda pool: pool.tvlUsd,
+                reverse=True,
+            )
+        )
+    snapshot = ResponseSnapshot.from_content(listing)
+    with yield_pool_listing_cache_lock:
+        yield_pool_listing_cache[cache_key] = snapshot
+    return snapshot
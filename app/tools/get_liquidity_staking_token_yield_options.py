@@ -0,0 +1,41 @@
+from langchain_core.tools import tool
+from sqlalchemy import select, or_
+from app.infrastructure.database import get_db_context
+from app.models.YieldPool import YieldPool
+from app.tools.get_solana_native_token_yield_options import YieldPoolDTO
+
+
+@tool(parse_docstring=True)
+def get_liquidity_staking_token_yield_options(symbols: list[str]) -> list[YieldPoolDTO]:
+    """
+    Retrieve yield options for liquidity staking tokens (e.g. MSOL, JUPSOL, JITOSOL) on Solana from the database.
+    Will return single-asset yield pools of the given tokens with TVL of 10 million USD or more.
+
+    Args:
+        symbols: Symbols of the liquidity staking tokens the user holds
+
+    Returns:
+        list: A list of yield pools for the given liquidity staking tokens
+    """
+    if not symbols:
+        return []
+
+    # Construct query based on the SQL:
+    # SELECT * FROM public.yield_pools
+    # WHERE chain = 'Solana' AND (symbol ILIKE 'JITOSOL' OR symbol ILIKE 'MSOL' ...)
+    with get_db_context() as db:
+        query = select(YieldPool).where(
+            YieldPool.chain == "Solana",
+            or_(*[YieldPool.symbol.ilike(symbol) for symbol in symbols]),
+            # Only include pools with TVL of 10 million USD or more
+            YieldPool.tvlUsd >= 10000000
+        )
+
+        result = db.execute(query)
+        liquidity_staking_yield_options = result.scalars().all()
+
+        # Convert ORM objects to YieldPoolDTO instances and return
+        return [
+            YieldPoolDTO.model_validate(pool)
+            for pool in liquidity_staking_yield_options
+        ]
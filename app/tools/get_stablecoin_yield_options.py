@@ -0,0 +1,38 @@
+from langchain_core.tools import tool
+from sqlalchemy import select
+from app.infrastructure.database import get_db_context
+from app.models.YieldPool import YieldPool
+from app.tools.get_solana_native_token_yield_options import YieldPoolDTO
+
+
+@tool(parse_docstring=True)
+def get_stablecoin_yield_options() -> list[YieldPoolDTO]:
+    """
+    Retrieve yield options for stablecoins (USDC, USDT, etc.) on Solana from the database.
+    Will return single-asset stablecoin yield pools with TVL of 10 million USD or more.
+
+    Returns:
+        list: A list of yield pools for stablecoins on Solana
+    """
+
+    # Construct query based on the SQL:
+    # SELECT * FROM public.yield_pools
+    # WHERE chain = 'Solana' AND stablecoin = true
+    with get_db_context() as db:
+        query = select(YieldPool).where(
+            YieldPool.chain == "Solana",
+            YieldPool.stablecoin.is_(True),
+            # Exclude liquidity pools (symbols containing "-")
+            ~YieldPool.symbol.like("%-%"),
+            # Only include pools with TVL of 10 million USD or more
+            YieldPool.tvlUsd >= 10000000
+        )
+
+        result = db.execute(query)
+        stablecoin_yield_options = result.scalars().all()
+
+        # Convert ORM objects to YieldPoolDTO instances and return
+        return [
+            YieldPoolDTO.model_validate(pool)
+            for pool in stablecoin_yield_options
+        ]
@@ -0,0 +1,109 @@
+import threading
+import time
+from enum import Enum
+
+from app.utils.logging_util import LogLevel, log_message
+
+
+class CircuitStateEnum(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit {name} is open, retry in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls fail
+    fast for `recovery_timeout` seconds. Then a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again. A trial whose
+    outcome never arrives (e.g. a cancelled call) is given up after `trial_timeout`
+    seconds, and the next call becomes the trial.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        trial_timeout: float | None = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.trial_timeout = recovery_timeout if trial_timeout is None else trial_timeout
+        self.state = CircuitStateEnum.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            True if the call is the half-open trial. Its outcome must be recorded,
+            or the trial given back with `release_trial` if the call never happens.
+
+        Raises:
+            CircuitOpenError: if the circuit is open, or half-open with a trial call in flight
+        """
+        with self._lock:
+            if self.state == CircuitStateEnum.CLOSED:
+                return False
+
+            now = time.monotonic()
+            if self.state == CircuitStateEnum.OPEN:
+                retry_after = self._opened_at + self.recovery_timeout - now
+            else:
+                retry_after = self._trial_started_at + self.trial_timeout - now
+            if retry_after <= 0:
+                # Let a single trial call through
+                self.state = CircuitStateEnum.HALF_OPEN
+                self._trial_started_at = now
+                return True
+            raise CircuitOpenError(self.name, retry_after)
+
+    def release_trial(self) -> None:
+        """Give back a trial call that was rejected before reaching the service: the circuit opens again."""
+        with self._lock:
+            if self.state == CircuitStateEnum.HALF_OPEN:
+                self.state = CircuitStateEnum.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CircuitStateEnum.CLOSED:
+                log_message(LogLevel.INFO, "Circuit closed", circuit=self.name)
+            self.state = CircuitStateEnum.CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if (
+                self.state == CircuitStateEnum.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                # Late failures of calls started before the circuit opened don't extend the open window
+                if self.state == CircuitStateEnum.OPEN:
+                    return
+                log_message(
+                    LogLevel.WARNING,
+                    "Circuit opened",
+                    circuit=self.name,
+                    consecutive_failures=self._consecutive_failures,
+                )
+                self.state = CircuitStateEnum.OPEN
+                self._opened_at = time.monotonic()
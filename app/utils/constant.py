@@ -5,6 +5,10 @@ APPLICATION_NAME = "execution-agents"
 SOLANA_NATIVE_TOKEN_NAME = "SOL"
 SOLANA_NATIVE_TOKEN_ADDRESS = "So11111111111111111111111111111111111111112"
 USDC_TOKEN_ADDRESS = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+USDT_TOKEN_ADDRESS = "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+JITOSOL_TOKEN_ADDRESS = "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"
+SPL_TOKEN_PROGRAM_ADDRESS = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+SPL_TOKEN_2022_PROGRAM_ADDRESS = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
 SOLANA_NETWORK_ID = 1399811149
 FISHING_TRANSACTION_THRESHOLD=0.0001
 CREATION_REMOVAL_TRANSACTION_THRESHOLD_MIN = 0.0019
@@ -22,21 +26,140 @@ NOT_SHOW_PNL_TOKEN_LIST = [
 # codex
 CODEX_API_URL = "https://graph.codex.io/graphql"
 CODEX_GET_PRICE_API_BATCH_SIZE = 25
+CODEX_GET_PRICE_API_CONCURRENCY = 4
+# Historical prices are looked up per (mint, time bucket), so nearby transactions share one price
+TOKEN_PRICE_BUCKET_SECONDS = 300
+# Historical prices never change, the TTL only bounds Redis memory
+HISTORICAL_TOKEN_PRICE_CACHE_SECONDS = 7 * 24 * 60 * 60
+# Prices Codex does not know are not asked for again before this
+MISSING_TOKEN_PRICE_CACHE_SECONDS = 60 * 60
 
 # Tolerance for considering SOL transfer amounts the same (e.g., for wrap/unwrap)
 SOL_TRANSFER_AMOUNT_TOLERANCE = 0.05
 
 # Cache time 
+# Wallet balance responses are kept (serialized, with their ETag) this long per address
 USER_HOLDINGS_CACHE_SECONDS = 10
+USER_HOLDINGS_CACHE_MAX_WALLETS = 10_000
+# Pools only change when the DeFi Llama script runs
+YIELD_POOL_LISTING_CACHE_SECONDS = 300
 TOKEN_PRICE_CACHE_SECONDS = 10
 USER_TRANSACTIONS_CACHE_SECONDS = 10
 
+# Response compression
+COMPRESSION_MINIMUM_SIZE_BYTES = 1024
+# Fast levels, responses are compressed on every request
+BROTLI_QUALITY = 4
+GZIP_COMPRESS_LEVEL = 6
+
 # Gas price
 GAS_PRICE_LAMPORTS = 1000_000_000
 MAX_PRIORITY_FEE_LAMPORTS = 1_000_000
+MIN_PRIORITY_FEE_LAMPORTS = 10_000
+# Percentile of recent prioritization fees (micro-lamports per compute unit) to pay
+PRIORITY_FEE_PERCENTILE = 75
+# Typical compute units of a routed Jupiter swap, used to turn a per-CU fee into lamports
+SWAP_COMPUTE_UNIT_ESTIMATE = 400_000
 
 # Jupiter
 JUPITER_BASE_URL = "https://api.jup.ag/swap/v1"
+JUPITER_LITE_API_BASE_URL = "https://lite-api.jup.ag/swap/v1"
+JUPITER_QUOTE_CACHE_SECONDS = 10
+JUPITER_DEFAULT_SLIPPAGE_BPS = 50
+JUPITER_BATCH_CONCURRENCY = 4
+
+# Moralis
+MORALIS_API_BASE_URL = "https://deep-index.moralis.io/api/v2.2"
+# Each chain of an EVM portfolio is given this long, slower chains are reported as failed
+MORALIS_CHAIN_TIMEOUT_SECONDS = 8
+
+# Upstream retries (transient errors: 429, 5xx, connection errors, timeouts)
+UPSTREAM_RETRY_MAX_ATTEMPTS = 3
+UPSTREAM_RETRY_BASE_DELAY_SECONDS = 0.2
+UPSTREAM_RETRY_MAX_DELAY_SECONDS = 5
+# Retries per worker are capped at this share of upstream calls (plus a floor per second)
+UPSTREAM_RETRY_BUDGET_RATIO = 0.1
+UPSTREAM_RETRY_BUDGET_MIN_PER_SECOND = 1
+UPSTREAM_RETRY_BUDGET_MAX_BALANCE = 20
+# Upstream rate limits: longest a call queues for a slot, and slots a worker leases at once
+UPSTREAM_RATE_LIMIT_MAX_WAIT_SECONDS = 5
+UPSTREAM_RATE_LIMIT_LEASE_SIZE = 5
+
+# Solana wallet providers (Helius, then Solana Tracker)
+WALLET_PROVIDER_TIMEOUT_SECONDS = 10
+# Consecutive failures before a provider is skipped, and how long it is skipped
+WALLET_PROVIDER_FAILURE_THRESHOLD = 3
+WALLET_PROVIDER_RECOVERY_SECONDS = 30
+# Health score: moving average of successes, a provider below the threshold goes last
+WALLET_PROVIDER_HEALTH_EWMA_ALPHA = 0.1
+WALLET_PROVIDER_DEGRADED_SCORE = 0.5
+# Hedge delay is the primary's p95 over its last latencies, once there are enough of them
+WALLET_PROVIDER_LATENCY_WINDOW = 200
+WALLET_PROVIDER_MIN_LATENCY_SAMPLES = 20
+WALLET_PROVIDER_DEFAULT_HEDGE_DELAY_SECONDS = 2
+WALLET_PROVIDER_MIN_HEDGE_DELAY_SECONDS = 0.2
 
 # Helius
-HELIUS_BASE_URL="https://mainnet.helius-rpc.com"
\ No newline at end of file
+HELIUS_BASE_URL="https://mainnet.helius-rpc.com"
+HELIUS_API_BASE_URL = "https://api.helius.xyz"
+# Max transactions per page of the parsed transaction history API
+HELIUS_TRANSACTION_HISTORY_PAGE_SIZE = 100
+
+# Wallet history sync
+WALLET_SYNC_INTERVAL_SECONDS = 60
+WALLET_BACKFILL_INTERVAL_SECONDS = 300
+WALLET_SYNC_CONCURRENCY = 4
+WALLET_BACKFILL_CONCURRENCY = 2
+# Wallets and history pages handled per backfill run, the rest waits for the next run
+WALLET_BACKFILL_WALLETS_PER_RUN = 20
+WALLET_BACKFILL_PAGES_PER_RUN = 10
+# Wallets registered by this process are not written again for this long, so balance polls stay off the DB
+WALLET_TRACKED_CACHE_SECONDS = 60 * 60
+WALLET_TRACKED_CACHE_MAX_WALLETS = 100_000
+
+# Helius webhooks
+HELIUS_WEBHOOK_QUEUE_KEY = "helius:webhooks:queue"
+HELIUS_WEBHOOK_FAILED_KEY = "helius:webhooks:failed"
+HELIUS_WEBHOOK_PROCESSING_KEY_PREFIX = "helius:webhooks:processing:"
+HELIUS_WEBHOOK_CONSUMERS_KEY = "helius:webhooks:consumers"
+# A worker's in-flight batch is requeued when its process stops renewing the lease for this long
+HELIUS_WEBHOOK_LEASE_SECONDS = 60
+# Webhook payloads parsed and stored per worker iteration (each payload holds up to ~100 transactions)
+HELIUS_WEBHOOK_BATCH_SIZE = 100
+HELIUS_WEBHOOK_QUEUE_FULL_RETRY_AFTER_SECONDS = 5
+TOKEN_TRANSFER_INSERT_CHUNK_SIZE = 1000
+
+# Solana RPC
+SOLANA_RPC_MAX_ACCOUNTS_PER_CALL = 100
+SOLANA_RPC_MAX_SIGNATURES_PER_CALL = 256
+SIGNATURE_CONFIRMATION_POLL_SECONDS = 0.5
+SIGNATURE_CONFIRMATION_TIMEOUT_SECONDS = 60
+NETWORK_STATE_REFRESH_SECONDS = 2
+# A blockhash stays valid for ~60-90s, older cached values are refreshed inline before use
+BLOCKHASH_MAX_AGE_SECONDS = 20
+
+# Optimization jobs
+OPTIMIZATION_JOB_RESULT_TTL_SECONDS = 60 * 60
+OPTIMIZATION_JOB_RETRY_BASE_DELAY_SECONDS = 5
+OPTIMIZATION_JOB_SSE_POLL_SECONDS = 1
+# Idle workers check the queue this often
+OPTIMIZATION_JOB_POLL_SECONDS = 0.5
+# A running job is requeued when its worker stops renewing the lease for this long
+OPTIMIZATION_JOB_LEASE_SECONDS = 60
+OPTIMIZATION_JOB_QUEUE_FULL_RETRY_AFTER_SECONDS = 10
+
+# OpenAI
+OPENAI_REQUEST_TIMEOUT_SECONDS = 60
+OPENAI_CONNECT_TIMEOUT_SECONDS = 5
+OPENAI_MAX_CONNECTIONS = 20
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+OPENAI_CIRCUIT_FAILURE_THRESHOLD = 5
+OPENAI_CIRCUIT_RECOVERY_SECONDS = 30
+
+# Portfolio encoding
+PORTFOLIO_DUST_THRESHOLD_USD = 1.0
+
+# Profiling
+PROFILER_SAMPLE_INTERVAL_SECONDS = 0.01
+PROFILER_MAX_SECONDS = 60
+SLOW_REQUEST_PROFILE_MAX_CAPTURES = 20
@@ -5,7 +5,9 @@ from sqlalchemy.orm import sessionmaker
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from app.infrastructure.logging_config import configure_logging
+from app.infrastructure.metrics import InstrumentedQueuePool
 from app.infrastructure.settings import settings
+from app.infrastructure.tracing import instrument_engine
 from app.utils.logging_util import LogLevel, log_message
 from alembic.config import Config
 
@@ -31,10 +33,13 @@ def create_db_engine():
     return create_engine(
         url=settings.POSTGRES_URL,
         pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
     )
 
 
 engine = create_db_engine()
+if settings.TRACING_ENABLED:
+    instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 DBBase = declarative_base()
@@ -1,5 +1,6 @@
+import logging
+import sys
 from enum import Enum
-import traceback
 
 from app.infrastructure.logging_config import logger
 
@@ -12,31 +13,31 @@ class LogLevel(Enum):
     DEBUG = "debug"
 
 
+LOGGING_LEVELS = {
+    LogLevel.INFO: logging.INFO,
+    LogLevel.CRITICAL: logging.CRITICAL,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
+
 def log_message(
     level: LogLevel,
     event: str,
     **kwargs,
 ):
-    """Custom log function with extra context."""
-
-    extra_info = " ".join([f"{key}={value}" for key, value in kwargs.items()])
-    full_message = f"{event} | {extra_info}"
-
-    # If there's an error in kwargs, append the stack trace
-    if level == LogLevel.ERROR and "error" in kwargs:
-        error_stack = traceback.format_exc()
-        if (
-            error_stack and error_stack != "NoneType: None\n"
-        ):  # Check if there's a valid stack trace
-            full_message = f"{full_message}\nStack trace:\n{error_stack}"
-
-    if level == LogLevel.INFO:
-        logger.info(full_message)
-    elif level == LogLevel.CRITICAL:
-        logger.critical(full_message)
-    elif level == LogLevel.WARNING:
-        logger.warning(full_message)
-    elif level == LogLevel.ERROR:
-        logger.error(full_message)
-    elif level == LogLevel.DEBUG:
-        logger.debug(full_message)
+    """
+    Custom log function with extra context.
+
+    Returns right away when `level` is disabled. Otherwise the kwargs travel
+    unformatted as structured fields; they are rendered on the logging thread.
+    """
+    logging_level = LOGGING_LEVELS[level]
+    if not logger.isEnabledFor(logging_level):
+        return
+
+    # If there's an error in kwargs, attach the stack trace of the exception being handled
+    exc_info = level == LogLevel.ERROR and "error" in kwargs and sys.exc_info()[0] is not None
+
+    logger.log(logging_level, event, exc_info=exc_info, extra={"fields": kwargs}, stacklevel=2)
@@ -0,0 +1,127 @@
+"""
+Compact portfolio encoding for LLM prompts.
+
+Prompts used to embed `json.dumps(assets, indent=2)`: every field of every token,
+including image URLs and dust, with indentation and quoted keys on every line.
+These helpers keep only the columns a stage needs, fold dust into a single row
+and emit a pipe separated table, which is several times smaller in tokens.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+
+from app.utils.constant import PORTFOLIO_DUST_THRESHOLD_USD
+
+
+def _format_number(value: Any) -> str:
+    if value is None:
+        return ""
+    # Fixed point (no exponent notation), trailing zeros dropped: 1000.0 -> "1000", 0.0451234567 -> "0.045123"
+    return f"{float(value):.6f}".rstrip("0").rstrip(".") or "0"
+
+
+def _table(columns: list[str], rows: Iterable[list[str]]) -> str:
+    lines = ["|".join(columns)]
+    lines.extend("|".join(row) for row in rows)
+    return "\n".join(lines)
+
+
+def split_dust(
+    assets: list[dict], dust_threshold_usd: float = PORTFOLIO_DUST_THRESHOLD_USD
+) -> tuple[list[tuple[int, dict]], list[dict]]:
+    """
+    Split assets into (index, asset) pairs worth keeping and dust.
+
+    Indexes refer to the position in `assets`, so LLM answers can be joined back.
+    """
+    kept = []
+    dust = []
+    for index, asset in enumerate(assets):
+        if float(asset.get("value") or 0) < dust_threshold_usd:
+            dust.append(asset)
+        else:
+            kept.append((index, asset))
+    return kept, dust
+
+
+def _dust_row(dust: list[dict], column_count: int, value_column: int) -> list[str]:
+    row = [""] * column_count
+    row[0] = "dust"
+    row[1] = f"{len(dust)} tokens"
+    row[value_column] = _format_number(sum(float(asset.get("value") or 0) for asset in dust))
+    return row
+
+
+def encode_assets_for_classification(
+    assets: list[dict], dust_threshold_usd: float = PORTFOLIO_DUST_THRESHOLD_USD
+) -> str:
+    """
+    Encode assets for the classification stage: only what identifies a token.
+
+    Dust is left out entirely since it is never classified.
+    """
+    kept, _ = split_dust(assets, dust_threshold_usd)
+    return _table(
+        ["#", "symbol", "name", "value_usd"],
+        (
+            [str(index), asset.get("symbol", ""), asset.get("name", ""), _format_number(asset.get("value"))]
+            for index, asset in kept
+        ),
+    )
+
+
+def encode_classified_assets(
+    classified_assets: list[dict], dust: list[dict] | None = None
+) -> str:
+    """
+    Encode classified assets for the advice stage, with dust folded into one row.
+    """
+    columns = ["symbol", "type", "amount", "value_usd", "pct", "mint"]
+    rows = [
+        [
+            asset.get("symbol", ""),
+            asset.get("type", ""),
+            _format_number(asset.get("amount")),
+            _format_number(asset.get("value")),
+            _format_number(asset.get("percentage")),
+            asset.get("tokenId", ""),
+        ]
+        for asset in classified_assets
+    ]
+    if dust:
+        rows.append(_dust_row(dust, len(columns), value_column=3))
+    return _table(columns, rows)
+
+
+def encode_yield_options(yield_options: list[dict]) -> str:
+    """Encode yield pool options, keeping what is needed to compare them."""
+    return _table(
+        ["project", "symbol", "apy", "apy_base", "tvl_usd"],
+        (
+            [
+                option.get("project", ""),
+                option.get("symbol", ""),
+                _format_number(option.get("apy")),
+                _format_number(option.get("apyBase")),
+                _format_number(option.get("tvlUsd")),
+            ]
+            for option in yield_options
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        # tiktoken or its encoding file is unavailable, use the usual ~4 chars per token estimate
+        return lambda text: (len(text) + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate, without tiktoken) the tokens of a prompt."""
+    return _get_token_counter()(text)
@@ -0,0 +1,40 @@
+import threading
+import time
+
+
+class RetryBudget:
+    """
+    Thread-safe retry budget.
+
+    Every request deposits `ratio` of a retry, plus `min_retries_per_second` trickle
+    in over time, up to `max_balance`; a retry spends one. While a provider fails
+    every call, retries stay around `ratio` of the traffic instead of multiplying it
+    by the number of attempts.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries_per_second: float = 1, max_balance: float = 100):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, deposit: float) -> None:
+        now = time.monotonic()
+        earned = (now - self._updated_at) * self.min_retries_per_second + deposit
+        self._balance = min(self.max_balance, self._balance + earned)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. Returns False if it is exhausted."""
+        with self._lock:
+            self._refill(0)
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
@@ -1,37 +1,66 @@
 from fastapi import HTTPException, status
 import base64
-import time
-import requests
-from solana.rpc.commitment import Confirmed
 from solders.pubkey import Pubkey
 from spl.token.instructions import (
     get_associated_token_address,
-    create_associated_token_account,
     create_idempotent_associated_token_account,
-    TOKEN_PROGRAM_ID,
-    ASSOCIATED_TOKEN_PROGRAM_ID,
-    TOKEN_2022_PROGRAM_ID,
 )
+from app.clients.solana_rpc_client import get_solana_rpc_client
 from app.utils.logging_util import log_message, LogLevel
-from app.infrastructure.settings import settings
-import base64
-import time
-from solana.rpc.commitment import Confirmed
-from solders.pubkey import Pubkey
+from app.services.mint_metadata_service import mint_metadata_registry
+from app.services.network_state_service import network_state_cache
+from app.services.signature_confirmation_service import (
+    ConfirmationTimeoutError,
+    TransactionFailedError,
+    signature_confirmation_service,
+)
+from solders.hash import Hash
 from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
 from solders.keypair import Keypair
-from solana.rpc.api import Client
 
 
-def get_client():
-    client = Client(
-        f"https://mainnet.helius-rpc.com/?api-key={settings.HELIUS_API_KEY}"
+async def get_associated_token_addresses(owner_address: str, mint_token_addresses: list[str]) -> dict[str, Pubkey]:
+    """Derive the ATA of `owner_address` for every mint, using each mint's own token program.
+
+    Args:
+        owner_address: Owner's wallet address
+        mint_token_addresses: Token mint addresses
+
+    Returns:
+        dict: ATA address by mint address
+    """
+    token_owner = Pubkey.from_string(owner_address)
+    # Token program of every mint (classic SPL or Token-2022), one bulk lookup for unknown mints
+    mint_metadata = await mint_metadata_registry.get_many(mint_token_addresses)
+    return {
+        mint: get_associated_token_address(
+            owner=token_owner,
+            mint=Pubkey.from_string(mint),
+            token_program_id=Pubkey.from_string(mint_metadata[mint].token_program),
+        )
+        for mint in mint_token_addresses
+    }
+
+
+async def get_missing_associated_token_accounts(owner_address: str, mint_token_addresses: list[str]) -> dict[str, Pubkey]:
+    """Find which ATAs of `owner_address` do not exist yet, in one round trip.
+
+    Returns:
+        dict: Missing ATA address by mint address
+    """
+    ata_addresses = await get_associated_token_addresses(owner_address, mint_token_addresses)
+    accounts = await get_solana_rpc_client().get_multiple_accounts(
+        [str(ata_address) for ata_address in ata_addresses.values()], encoding="base64"
     )
-    return client
+    return {
+        mint: ata_address
+        for mint, ata_address in ata_addresses.items()
+        if accounts[str(ata_address)] is None
+    }
 
 
-def create_ata_account_if_not_exists_using_private_key(
+async def create_ata_account_if_not_exists_using_private_key(
     mint_token_address: str, owner_address: str, fee_payer_private_key: str
 ) -> str:
     """Create Associated Token Account if it doesn't exist using a private key.
@@ -49,33 +78,35 @@ def create_ata_account_if_not_exists_using_private_key(
 
     mint_token_pubkey = Pubkey.from_string(mint_token_address)
     token_owner = Pubkey.from_string(owner_address)
-    client = get_client()
-    token_info = client.get_account_info(mint_token_pubkey)
+    client = get_solana_rpc_client()
 
-    # Convert addresses to Pubkey objects
+    # Token program of the mint (classic SPL or Token-2022), usually already cached
+    token_program_id = Pubkey.from_string(
+        (await mint_metadata_registry.get(mint_token_address)).token_program
+    )
     ata_address = get_associated_token_address(
-        owner=token_owner, mint=mint_token_pubkey, token_program_id=token_info.value.owner
+        owner=token_owner, mint=mint_token_pubkey, token_program_id=token_program_id
     )
 
     log_message(LogLevel.INFO, f"Checking ATA address: {ata_address}")
-    client = get_client()
-    ata_info = client.get_account_info(ata_address, commitment=Confirmed)
+    ata_info = await client.get_account_info(str(ata_address), encoding="base64")
 
-    if ata_info.value is None:
+    if ata_info is None:
         log_message(LogLevel.INFO, "ATA doesn't exist, creating...")
 
         instruction = create_idempotent_associated_token_account(
             payer=wallet.pubkey(),
             owner=token_owner,
             mint=mint_token_pubkey,
-            token_program_id=token_info.value.owner,
+            token_program_id=token_program_id,
         )
 
+        latest_blockhash = await network_state_cache.get_latest_blockhash()
         message = MessageV0.try_compile(
             payer=wallet.pubkey(),
             instructions=[instruction],
             address_lookup_table_accounts=[],
-            recent_blockhash=client.get_latest_blockhash().value.blockhash,
+            recent_blockhash=Hash.from_string(latest_blockhash.blockhash),
         )
         tx = VersionedTransaction(
             message=message,
@@ -86,58 +117,35 @@ def create_ata_account_if_not_exists_using_private_key(
         encoded_tx = base64.b64encode(bytes(tx)).decode("utf-8")
 
         # Send transaction
-        headers = {"Content-Type": "application/json"}
-        data = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "sendTransaction",
-            "params": [
-                encoded_tx,
-                {
-                    "skipPreflight": True,
-                    "preflightCommitment": "finalized",
-                    "encoding": "base64",
-                    "maxRetries": None,
-                    "minContextSlot": None,
-                },
-            ],
-
-            
-        }
-
-        response = requests.post(
-            f"https://mainnet.helius-rpc.com/?api-key={settings.HELIUS_API_KEY}",
-            headers=headers,
-            json=data,
-        )
+        try:
+            signature = await client.send_transaction(encoded_tx)
+        except Exception as e:
+            log_message(LogLevel.ERROR, "Failed to create ATA", error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to create ATA: {e}",
+            )
+
+        log_message(LogLevel.INFO, "ATA creation sent", signature=signature)
 
-        if response.status_code != 200:
-            log_message(LogLevel.ERROR, "Failed to create ATA", error=response.text)
+        # Wait on the shared confirmation poller instead of sleeping between account checks
+        try:
+            await signature_confirmation_service.wait_for_confirmation(signature, commitment="confirmed")
+        except TransactionFailedError as e:
+            log_message(LogLevel.ERROR, "ATA creation failed", signature=signature, error=str(e.error))
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to create ATA: {response.text}",
+                detail=f"Failed to create ATA: {e.error}",
+            )
+        except ConfirmationTimeoutError:
+            log_message(LogLevel.ERROR, "ATA creation not confirmed in time", signature=signature)
+            raise HTTPException(
+                status_code=status.HTTP_408_REQUEST_TIMEOUT,
+                detail="ATA creation not confirmed in time",
             )
 
-        result = response.json()
-        log_message(LogLevel.INFO, "ATA creation completed", result=result)
-        # return str(ata_address)
-
-        # Increase delay and add confirmation check
-        max_retries = 5
-        for _ in range(max_retries):
-            time.sleep(3)  # Increased to 3 seconds
-            ata_info = client.get_account_info(ata_address, commitment=Confirmed)
-            if ata_info.value is not None:
-                log_message(LogLevel.INFO, "ATA creation confirmed")
-                time.sleep(15)
-                log_message(LogLevel.INFO, "ATA creation confirmed 15 seconds")
-                return str(ata_address)
-
-        log_message(LogLevel.ERROR, "ATA creation not confirmed after retries")
-        raise HTTPException(
-            status_code=status.HTTP_408_REQUEST_TIMEOUT,
-            detail="ATA creation not confirmed after multiple retries",
-        )
+        log_message(LogLevel.INFO, "ATA creation confirmed", signature=signature)
+        return str(ata_address)
     else:
         log_message(LogLevel.INFO, "ATA already exists")
         return str(ata_address)
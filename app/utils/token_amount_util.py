@@ -0,0 +1,34 @@
+from decimal import Decimal, ROUND_DOWN
+
+
+def to_base_units(amount: float | Decimal | str, decimals: int) -> int:
+    """
+    Convert a UI amount to integer base units without float rounding errors.
+
+    The amount goes through its decimal string representation, so 0.1 USDC
+    (6 decimals) is exactly 100000 rather than int(0.1 * 1e6).
+    Digits beyond the token's precision are truncated, never rounded up.
+
+    Args:
+        amount: Token amount, e.g. 1.5 (SOL)
+        decimals: Decimals of the token mint
+
+    Returns:
+        int: Amount in base units, e.g. 1500000000 (lamports)
+    """
+    scaled = Decimal(str(amount)).scaleb(decimals)
+    return int(scaled.to_integral_value(rounding=ROUND_DOWN))
+
+
+def from_base_units(raw_amount: int | str, decimals: int) -> float:
+    """
+    Convert integer base units to a UI amount.
+
+    Args:
+        raw_amount: Amount in base units
+        decimals: Decimals of the token mint
+
+    Returns:
+        float: Token amount
+    """
+    return float(Decimal(int(raw_amount)).scaleb(-decimals))
@@ -1,5 +1,6 @@
+from collections import defaultdict
 from app.dtos.historical_transaction_dto import HistoricalTransactionDTO
-from typing import List
+from typing import Dict, List
 
 def filter_token_specific_txs(
     filtered_composed_historical_transaction_dto_list: List[HistoricalTransactionDTO],
@@ -36,3 +37,42 @@ def filter_token_specific_txs(
             )
         )
     ]
+
+
+def get_tx_token_addresses(tx: HistoricalTransactionDTO) -> List[str]:
+    """
+    Get the distinct token addresses a transaction touches (the same checks as filter_token_specific_txs).
+
+    Args:
+        tx (HistoricalTransactionDTO): Transaction DTO.
+
+    Returns:
+        List[str]: Token addresses, without empty values.
+    """
+    token_addresses = []
+    for token_address in (tx.input_token, tx.output_token, tx.transfer_token_address):
+        if token_address and token_address not in token_addresses:
+            token_addresses.append(token_address)
+    return token_addresses
+
+
+def group_txs_by_token(
+    historical_transaction_dto_list: List[HistoricalTransactionDTO],
+) -> Dict[str, List[HistoricalTransactionDTO]]:
+    """
+    Group transactions by token address in a single pass.
+
+    Equivalent to calling filter_token_specific_txs once per token, without
+    rescanning the whole list for every token. Input order is preserved.
+
+    Args:
+        historical_transaction_dto_list (List[HistoricalTransactionDTO]): List of transaction DTOs.
+
+    Returns:
+        Dict[str, List[HistoricalTransactionDTO]]: Transactions by token address.
+    """
+    txs_by_token: Dict[str, List[HistoricalTransactionDTO]] = defaultdict(list)
+    for tx in historical_transaction_dto_list:
+        for token_address in get_tx_token_addresses(tx):
+            txs_by_token[token_address].append(tx)
+    return dict(txs_by_token)
@@ -54,6 +54,5 @@ def check_if_transaction_needs_skip(tx: HistoricalTransactionDTO, token_address:
             transfer_price=tx.transfer_token_price_usd
         )
         return True
-    
-    
-    
\ No newline at end of file
+
+    return False
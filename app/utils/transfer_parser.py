@@ -8,13 +8,14 @@ from app.models.SolanaTransaction import TokenTransfer, TransactionType
 logger = logging.getLogger(__name__)
 
 
-def parse_transfer(item: Dict[str, Any], creator_id: str) -> List[TokenTransfer]:
+def parse_transfer(item: Dict[str, Any], creator_id: str, created_at: datetime | None = None) -> List[TokenTransfer]:
     """
     Parse a single transfer transaction from Helius webhook data.
     
     Args:
         item (Dict[str, Any]): A single transaction item from Helius webhook
         creator_id (str): ID of the creator for audit fields
+        created_at (datetime | None): Audit timestamp, defaults to now
         
     Returns:
         List[TokenTransfer]: List of TokenTransfer objects from this transaction
@@ -25,6 +26,7 @@ def parse_transfer(item: Dict[str, Any], creator_id: str) -> List[TokenTransfer]
     if item.get("type") != "TRANSFER":
         return transfers
         
+    created_at = created_at or datetime.now()
     # Extract token transfers
     for token_transfer in item.get("tokenTransfers", []):
         try:
@@ -42,10 +44,10 @@ def parse_transfer(item: Dict[str, Any], creator_id: str) -> List[TokenTransfer]
                 source=item.get("source"),
                 transaction_type=TransactionType.TRANSFER,
                 gmt_creator=creator_id,
-                gmt_created=datetime.now()
+                gmt_created=created_at
             )
             transfers.append(transfer)
-            logger.debug(f"Parsed transfer: {item.get('signature')}")
+            logger.debug("Parsed transfer: %s", item.get("signature"))
         except Exception as e:
             logger.error(f"Error parsing transfer data: {e}", exc_info=True)
     
@@ -65,9 +67,10 @@ def parse_transfers(data: List[Dict[str, Any]], creator_id: str) -> List[TokenTr
     """
     logger.info(f"Parsing transfer data from Helius webhook with {len(data)} items")
     all_transfers = []
+    created_at = datetime.now()
     
     for item in data:
-        transfers = parse_transfer(item, creator_id)
+        transfers = parse_transfer(item, creator_id, created_at)
         all_transfers.extend(transfers)
     
     logger.info(f"Successfully parsed {len(all_transfers)} transfers")
@@ -0,0 +1,77 @@
+"""
+Shared wallet response builder for the balance parsers (Helius, Moralis).
+
+Parsers collect one compact AssetRow per token while summing the total value.
+`build_wallet_response` sorts the rows once, adds the percentages while
+turning them into plain dicts, and validates the whole response in a single
+pydantic-core call. That beats building an AssetDTO per token and patching
+it afterwards, and also `model_construct`, which runs in Python per model.
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.dtos.wallet_total_asset_response_dto import WalletTotalResponseDTO
+from app.enums.chain_enum import ChainEnum
+
+
+class AssetRow(NamedTuple):
+    """One token balance as parsed from a provider."""
+
+    name: str
+    symbol: str
+    amount: float
+    value: float
+    token_id: str
+    decimals: int
+    price: float
+    currency: str
+    image_url: Optional[str] = None
+    chain: Optional[ChainEnum] = None
+
+
+def build_wallet_response(
+    address: str,
+    chain: ChainEnum,
+    rows: List[AssetRow],
+    total_value: float,
+    chains: Optional[List[Dict[str, Any]]] = None,
+) -> WalletTotalResponseDTO:
+    """
+    Build the wallet response, assets sorted by value descending.
+
+    Args:
+        address: Wallet address
+        chain: Chain of the wallet
+        rows: Parsed balances, sorted in place
+        total_value: Sum of the rows' values
+        chains: Per-chain breakdown (ChainBreakdownDTO fields) of a multi-chain portfolio
+
+    Returns:
+        WalletTotalResponseDTO with percentages of the total value
+    """
+    rows.sort(key=attrgetter("value"), reverse=True)
+    return WalletTotalResponseDTO.model_validate(
+        {
+            "chain": chain,
+            "address": address,
+            "assets": [
+                {
+                    "name": row.name,
+                    "symbol": row.symbol,
+                    "amount": row.amount,
+                    "value": row.value,
+                    "percentage": round((row.value / total_value) * 100, 1) if total_value > 0 else 0,
+                    "tokenId": row.token_id,
+                    "decimals": row.decimals,
+                    "price": row.price,
+                    "currency": row.currency,
+                    "imageUrl": row.image_url,
+                    "chain": row.chain,
+                }
+                for row in rows
+            ],
+            "totalValue": round(total_value, 2),
+            "chains": chains,
+        }
+    )
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script to measure the per-call overhead of `log_message`.
+
+Compares the queued pipeline (level check, then enqueue; formatting and writes on
+the listener thread) with the previous implementation, which built the message
+eagerly and wrote synchronously from the caller. Output goes to /dev/null so
+only the logging cost is measured; the listener drain time is the formatting
+work moved off the caller.
+
+Example:
+    python script_benchmark_logging.py --calls 200000
+"""
+
+import argparse
+import logging
+import os
+import time
+import traceback
+from typing import Callable
+
+from app.infrastructure import logging_config
+from app.utils.logging_util import LogLevel, log_message
+
+FIELDS = {
+    "wallet_address": "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM",
+    "transactions": 100,
+    "inserted": 97,
+    "elapsed_ms": 12.5,
+}
+
+
+def eager_log_message(logger: logging.Logger, level: LogLevel, event: str, **kwargs):
+    """The previous log_message: formats everything before the logger checks the level."""
+    extra_info = " ".join([f"{key}={value}" for key, value in kwargs.items()])
+    full_message = f"{event} | {extra_info}"
+    if level == LogLevel.ERROR and "error" in kwargs:
+        error_stack = traceback.format_exc()
+        if error_stack and error_stack != "NoneType: None\n":
+            full_message = f"{full_message}\nStack trace:\n{error_stack}"
+    if level == LogLevel.INFO:
+        logger.info(full_message)
+    elif level == LogLevel.DEBUG:
+        logger.debug(full_message)
+
+
+def measure(name: str, calls: int, log_call: Callable[[], None]) -> None:
+    """Time every call, so the listener thread taking the GIL shows in p99 rather than hiding in the mean."""
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter_ns()
+        log_call()
+        durations.append(time.perf_counter_ns() - start)
+    durations.sort()
+    print(
+        f"{name:<32} p50={durations[len(durations) // 2]:>7} ns  "
+        f"p99={durations[int(len(durations) * 0.99)]:>7} ns  "
+        f"mean={sum(durations) / len(durations):>9.0f} ns"
+    )
+
+
+def main():
+    """Main function to run the logging benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark log_message per-call overhead")
+    parser.add_argument("--calls", type=int, default=100_000, help="Calls per scenario")
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        # Previous setup: synchronous stream handler on the calling thread
+        eager_logger = logging.getLogger("benchmark.eager")
+        eager_logger.propagate = False
+        eager_logger.setLevel(logging.INFO)
+        eager_handler = logging.StreamHandler(devnull)
+        eager_handler.setFormatter(logging.Formatter(logging_config.TEXT_FORMAT))
+        eager_logger.addHandler(eager_handler)
+
+        measure(
+            "eager, DEBUG (filtered)",
+            args.calls,
+            lambda: eager_log_message(eager_logger, LogLevel.DEBUG, "Synced wallet", **FIELDS),
+        )
+        measure(
+            "eager, INFO (sync write)",
+            args.calls,
+            lambda: eager_log_message(eager_logger, LogLevel.INFO, "Synced wallet", **FIELDS),
+        )
+
+        logging_config.configure_logging(stream=devnull)
+        logging.getLogger().setLevel(logging.INFO)
+        measure(
+            "queued, DEBUG (filtered)",
+            args.calls,
+            lambda: log_message(LogLevel.DEBUG, "Synced wallet", **FIELDS),
+        )
+        measure(
+            "queued, INFO (enqueue only)",
+            args.calls,
+            lambda: log_message(LogLevel.INFO, "Synced wallet", **FIELDS),
+        )
+
+        # Time for the listener to format and write what was queued
+        start = time.perf_counter()
+        logging_config._stop_listener()
+        print(f"{'listener drain after INFO run':<32} {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
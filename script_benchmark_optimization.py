@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Script to load-test the /optimization/solana endpoint and report latency percentiles,
+throughput and cache hit rates.
+
+By default the app runs in-process with the offline LLM stand-in (LLM_PROVIDER=fake),
+so no network or OpenAI key is needed. Pass --base-url to drive a running server instead.
+
+Example:
+    python script_benchmark_optimization.py --requests 500 --concurrency 50 --unique-portfolios 20 --fake-yield-options
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+TOKEN_POOL = [
+    ("Solana", "SOL", "So11111111111111111111111111111111111111112", 9, 150.0),
+    ("USD Coin", "USDC", "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", 6, 1.0),
+    ("USDT", "USDT", "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB", 6, 1.0),
+    ("Jito Staked SOL", "JITOSOL", "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn", 9, 180.0),
+    ("Marinade staked SOL", "MSOL", "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So", 9, 185.0),
+    ("Jupiter", "JUP", "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN", 6, 0.5),
+    ("Bonk", "BONK", "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263", 5, 0.00002),
+    ("dogwifhat", "WIF", "EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm", 6, 0.8),
+]
+
+
+def build_portfolio(seed: int, assets_per_portfolio: int) -> List[Dict[str, Any]]:
+    """Build a deterministic, realistic looking portfolio in the wallet endpoint's asset format."""
+    rng = random.Random(seed)
+    tokens = [TOKEN_POOL[0]] + rng.sample(TOKEN_POOL[1:], k=min(assets_per_portfolio, len(TOKEN_POOL)) - 1)
+    assets = []
+    for name, symbol, mint, decimals, price in tokens:
+        value = round(rng.uniform(0.5, 2000), 2)
+        assets.append(
+            {
+                "name": name,
+                "symbol": symbol,
+                "amount": round(value / price, decimals),
+                "value": value,
+                "percentage": 0,
+                "tokenId": mint,
+                "decimals": decimals,
+                "price": price,
+                "currency": "USDC",
+                "imageUrl": None,
+            }
+        )
+    total_value = sum(asset["value"] for asset in assets)
+    for asset in assets:
+        asset["percentage"] = round(asset["value"] / total_value * 100, 1)
+    return sorted(assets, key=lambda asset: asset["value"], reverse=True)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _StaticYieldOptions:
+    """Stands in for a yield pool tool so the benchmark does not need Postgres."""
+
+    def __init__(self, pools: List[Dict[str, Any]]):
+        self.pools = pools
+
+    def invoke(self, tool_input: Dict[str, Any]) -> List[Any]:
+        from app.tools.get_solana_native_token_yield_options import YieldPoolDTO
+
+        return [YieldPoolDTO(**pool) for pool in self.pools]
+
+
+def use_static_yield_options() -> None:
+    from app.services import asset_opportunity_graph_script as graph_script
+
+    graph_script.get_solana_native_token_yield_options = _StaticYieldOptions(
+        [{"chain": "Solana", "project": "jito-liquid-staking", "pool": "jitosol", "symbol": "JITOSOL", "tvlUsd": 2.1e9, "apy": 7.2, "apyBase": 7.2}]
+    )
+    graph_script.get_stablecoin_yield_options = _StaticYieldOptions(
+        [{"chain": "Solana", "project": "kamino-lend", "pool": "usdc", "symbol": "USDC", "tvlUsd": 3.5e8, "apy": 6.1, "apyBase": 5.4}]
+    )
+    graph_script.get_liquidity_staking_token_yield_options = _StaticYieldOptions(
+        [{"chain": "Solana", "project": "kamino-lend", "pool": "jitosol-lend", "symbol": "JITOSOL", "tvlUsd": 4.0e8, "apy": 0.4, "apyBase": 0.4}]
+    )
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    total_requests: int,
+    concurrency: int,
+    portfolios: List[List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    next_request = iter(range(total_requests))
+
+    async def worker() -> None:
+        for request_number in next_request:
+            payload = {
+                "assets": portfolios[request_number % len(portfolios)],
+                "walletAddress": "benchmark",
+            }
+            start = time.perf_counter()
+            try:
+                response = await client.post("/optimization/solana", json=payload)
+                if response.status_code != 200:
+                    errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+                    continue
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def cache_stats() -> Optional[Dict[str, str]]:
+    """Hit rates of the in-process caches (only available when the app runs in this process)."""
+    from app.services import asset_opportunity_graph_script as graph_script
+
+    def rate(hits: int, misses: int) -> str:
+        total = hits + misses
+        return f"{hits / total:.1%} ({hits}/{total})" if total else "n/a"
+
+    result_cache = graph_script.generate_solana_optimization_suggestions.cache_info()
+    node_stats = graph_script.node_checkpoint_stats
+    return {
+        "optimization result cache": rate(result_cache.hits, result_cache.misses),
+        "graph node checkpoints": rate(node_stats["hits"], node_stats["misses"]),
+    }
+
+
+def main():
+    """Main function to run the optimization benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the /optimization/solana endpoint")
+    parser.add_argument("--base-url", type=str, help="Drive a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    parser.add_argument("--unique-portfolios", type=int, default=20, help="Distinct portfolios to cycle through")
+    parser.add_argument("--assets-per-portfolio", type=int, default=5, help="Tokens per portfolio")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Fake LLM latency per call (seconds)")
+    parser.add_argument("--llm-latency-jitter", type=float, default=0.5, help="Extra random fake LLM latency (seconds)")
+    parser.add_argument("--fake-yield-options", action="store_true", help="Serve static yield pools instead of querying Postgres")
+
+    args = parser.parse_args()
+
+    portfolios = [
+        build_portfolio(seed, args.assets_per_portfolio) for seed in range(args.unique_portfolios)
+    ]
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=None)
+    else:
+        # Settings are read at import time, so select the offline LLM before importing the app
+        os.environ["LLM_PROVIDER"] = "fake"
+        os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(args.llm_latency)
+        os.environ["FAKE_LLM_LATENCY_JITTER_SECONDS"] = str(args.llm_latency_jitter)
+        from app.main import app
+
+        if args.fake_yield_options:
+            use_static_yield_options()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None
+        )
+
+    async def run() -> Dict[str, Any]:
+        async with client:
+            return await run_benchmark(client, args.requests, args.concurrency, portfolios)
+
+    logger.info(
+        f"Running {args.requests} requests at concurrency {args.concurrency} "
+        f"against {args.base_url or 'in-process app (fake LLM)'}..."
+    )
+    result = asyncio.run(run())
+
+    print(f"requests:    {result['succeeded']}/{result['requests']} succeeded")
+    print(f"errors:      {result['errors'] or 'none'}")
+    print(f"elapsed:     {result['elapsed']:.2f}s")
+    print(f"throughput:  {result['throughput']:.1f} req/s")
+    print(f"latency p50: {result['p50'] * 1000:.0f} ms")
+    print(f"latency p95: {result['p95'] * 1000:.0f} ms")
+    print(f"latency p99: {result['p99'] * 1000:.0f} ms")
+    if args.base_url:
+        print("cache hit rates: n/a (only measured in-process)")
+    else:
+        for cache_name, hit_rate in cache_stats().items():
+            print(f"{cache_name} hit rate: {hit_rate}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script to compare JSON serialization paths for large WalletTotalResponseDTO payloads.
+
+    fastapi default     what a response_model endpoint did before: FastAPI's
+                        serialize_response (dump, validate, dump to a JSON-ready dict)
+                        and JSONResponse (stdlib json)
+    fastapi + orjson    same dict, rendered by FastJSONResponse (endpoints still
+                        returning plain values)
+    FastJSONResponse    the model written to JSON bytes by pydantic-core directly
+
+Example:
+    python script_benchmark_serialization.py --assets 100 500 2000 --iterations 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.dtos.wallet_total_asset_response_dto import AssetDTO, WalletTotalResponseDTO
+from app.enums.chain_enum import ChainEnum
+from app.infrastructure.json_response import FastJSONResponse
+
+WALLET_ADDRESS = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+
+
+def build_wallet(asset_count: int, seed: int = 0) -> WalletTotalResponseDTO:
+    """Wallet with `asset_count` realistic looking assets."""
+    rng = random.Random(seed)
+    assets = []
+    for index in range(asset_count):
+        price = rng.uniform(0.00001, 200)
+        amount = rng.uniform(0.1, 100_000)
+        assets.append(
+            AssetDTO(
+                name=f"Token {index}",
+                symbol=f"TKN{index}",
+                amount=amount,
+                value=amount * price,
+                percentage=rng.uniform(0, 100),
+                tokenId=f"{index:044d}",
+                decimals=rng.choice([5, 6, 8, 9]),
+                price=price,
+                currency="USDC",
+                imageUrl=f"https://arweave.net/{index:043d}",
+            )
+        )
+    return WalletTotalResponseDTO(
+        chain=ChainEnum.SOLANA,
+        address=WALLET_ADDRESS,
+        assets=assets,
+        totalValue=sum(asset.value for asset in assets),
+    )
+
+
+def measure(name: str, iterations: int, serialize: Callable[[], bytes], baseline: float | None = None) -> float:
+    serialize()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serialize()
+    elapsed_ms = (time.perf_counter() - start) / iterations * 1000
+    speedup = f"  x{baseline / elapsed_ms:.1f}" if baseline else ""
+    print(f"  {name:<20} {elapsed_ms:>8.3f} ms{speedup}")
+    return elapsed_ms
+
+
+def main():
+    """Main function to run the serialization benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--assets", type=int, nargs="+", default=[100, 500, 2000], help="Assets per wallet")
+    parser.add_argument("--iterations", type=int, default=200, help="Serializations per measurement")
+    args = parser.parse_args()
+
+    response_field = create_model_field(name="Response", type_=WalletTotalResponseDTO, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    for asset_count in args.assets:
+        wallet = build_wallet(asset_count)
+
+        def fastapi_content():
+            return loop.run_until_complete(serialize_response(field=response_field, response_content=wallet))
+
+        expected = FastJSONResponse(fastapi_content()).body
+        assert FastJSONResponse(wallet).body == expected, "FastJSONResponse output differs from FastAPI's"
+
+        print(f"{asset_count} assets ({len(expected) / 1024:.0f} KiB)")
+        baseline = measure("fastapi default", args.iterations, lambda: JSONResponse(fastapi_content()).body)
+        measure("fastapi + orjson", args.iterations, lambda: FastJSONResponse(fastapi_content()).body, baseline)
+        measure("FastJSONResponse", args.iterations, lambda: FastJSONResponse(wallet).body, baseline)
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
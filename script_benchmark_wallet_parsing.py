@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Script to compare wallet balance parsing: the previous per-token AssetDTO
+construction (HttpUrl validation, percentage patch loop, sorted copy) against
+the shared AssetRow fast path, on synthetic Helius and Moralis payloads.
+Also checks the Solana Tracker parsing against a recorded response shape.
+
+Example:
+    python script_benchmark_wallet_parsing.py --assets 1000 --iterations 50
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, HttpUrl
+
+from app.clients.helius_client import parse_helius_assets
+from app.clients.moralis_client import parse_moralis_balances
+from app.clients.solana_tracker_client import parse_solana_tracker_tokens
+from app.dtos.token_dto import WalletTokensResponse
+from app.dtos.mint_metadata_dto import MintMetadataDTO
+from app.enums.chain_enum import ChainEnum
+from app.utils.token_amount_util import from_base_units
+
+WALLET_ADDRESS = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+# Shape of a Solana Tracker /wallet/{owner} response, optional fields mostly left out
+SOLANA_TRACKER_WALLET_FIXTURE = {
+    "tokens": [
+        {
+            "token": {
+                "name": "USD Coin",
+                "symbol": "USDC",
+                "mint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                "decimals": 6,
+                "image": "https://image.solanatracker.io/proxy?url=usdc.png",
+            },
+            "pools": [],
+            "events": {"24h": {"priceChangePercentage": 0.01}},
+            "risk": {"rugged": False, "risks": [], "score": 0, "jupiterVerified": True},
+            "balance": 250.5,
+            "value": 250.45,
+        },
+        {
+            "token": {
+                "name": "Wrapped SOL",
+                "symbol": "SOL",
+                "mint": "So11111111111111111111111111111111111111112",
+                "uri": "",
+                "decimals": 9,
+                "hasFileMetaData": True,
+            },
+            "pools": [
+                {
+                    "poolId": "58oQChx4yWmvKdwLLZzBi4ChoCc2fqCUWBkwMihLYQo2",
+                    "liquidity": {"quote": 41_000_000, "usd": 82_000_000},
+                    "price": {"quote": 150.2, "usd": 150.2},
+                    "tokenSupply": 580_000_000,
+                    "lpBurn": 100,
+                    "tokenAddress": "So11111111111111111111111111111111111111112",
+                    "marketCap": {"quote": 87_116_000_000, "usd": 87_116_000_000},
+                    "market": "raydium",
+                    "quoteToken": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    "decimals": 9,
+                    "security": {"freezeAuthority": None, "mintAuthority": None},
+                    "lastUpdated": 1_760_000_000_000,
+                }
+            ],
+            "events": {"1h": {"priceChangePercentage": -0.2}, "24h": {"priceChangePercentage": 1.5}},
+            "risk": {"rugged": False, "risks": [], "score": 0, "jupiterVerified": True},
+            "holders": 1_200_000,
+            "balance": 2,
+            "value": 300.4,
+        },
+        {
+            "token": {"name": "Dust", "symbol": "DUST", "mint": "Dust111111111111111111111111111111111111111", "decimals": 6},
+            "pools": [],
+            "events": {},
+            "risk": {"rugged": True, "risks": [{"name": "Rugged", "level": "danger"}], "score": 10, "jupiterVerified": False},
+            "balance": 0,
+            "value": 0,
+        },
+    ],
+    "total": 550.85,
+    "totalSol": 3.667,
+}
+
+
+class LegacyAssetDTO(BaseModel):
+    """AssetDTO as it was, with a validated image URL."""
+
+    name: str
+    symbol: str
+    amount: float
+    value: float
+    percentage: float
+    tokenId: str
+    decimals: int
+    price: float
+    currency: str
+    imageUrl: Optional[HttpUrl] = None
+
+
+def build_helius_result(asset_count: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    items = []
+    for index in range(asset_count):
+        decimals = rng.choice([5, 6, 8, 9])
+        price = rng.uniform(0.00001, 200)
+        balance = rng.randint(1, 10 ** (decimals + 5))
+        items.append(
+            {
+                "interface": "FungibleToken",
+                "id": f"{index:044d}",
+                "content": {
+                    "metadata": {"name": f"Token {index}", "symbol": f"TKN{index}"},
+                    "links": {"image": f"https://arweave.net/{index:043d}"},
+                },
+                "token_info": {
+                    "balance": balance,
+                    "decimals": decimals,
+                    "token_program": TOKEN_PROGRAM,
+                    "price_info": {
+                        "price_per_token": price,
+                        "total_price": balance / 10 ** decimals * price,
+                        "currency": "USDC",
+                    },
+                },
+            }
+        )
+    return {
+        "items": items,
+        "nativeBalance": {"lamports": 12_345_678_901, "price_per_sol": 150.0, "total_price": 1851.85},
+    }
+
+
+def build_moralis_result(asset_count: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    tokens = []
+    for index in range(asset_count):
+        decimals = rng.choice([6, 8, 18])
+        price = rng.uniform(0.00001, 200)
+        balance = rng.randint(1, 10 ** (decimals + 5))
+        tokens.append(
+            {
+                "token_address": f"0x{index:040x}",
+                "name": f"Token {index}",
+                "symbol": f"TKN{index}",
+                "logo": f"https://logo.moralis.io/0x{index:040x}.png",
+                "decimals": decimals,
+                "balance": str(balance),
+                "usd_price": price,
+                "usd_value": balance / 10 ** decimals * price,
+            }
+        )
+    return {"result": tokens}
+
+
+def legacy_parse_helius(result: Dict[str, Any]) -> List[LegacyAssetDTO]:
+    """The previous get_wallet_data_by_helius parsing loop."""
+    assets = []
+    mint_metadata = []
+    total_value = 0.0
+    for item in result.get("items", []):
+        if item.get("interface") == "FungibleToken" and "token_info" in item:
+            meta = item.get("content", {}).get("metadata", {})
+            token_info = item.get("token_info", {})
+            price_info = token_info.get("price_info", {})
+            if "decimals" in token_info and token_info.get("token_program"):
+                mint_metadata.append(MintMetadataDTO(
+                    mint=item.get("id", ""),
+                    decimals=token_info["decimals"],
+                    token_program=token_info["token_program"],
+                ))
+            value = price_info.get("total_price", 0)
+            total_value += value
+            assets.append(LegacyAssetDTO(
+                name=meta.get("name", ""),
+                symbol=meta.get("symbol", ""),
+                amount=from_base_units(token_info.get("balance", 0), token_info.get("decimals", 0)),
+                value=value,
+                percentage=0,
+                tokenId=item.get("id", ""),
+                decimals=token_info.get("decimals", 0),
+                price=price_info.get("price_per_token", 0),
+                currency=price_info.get("currency", "USDC"),
+                imageUrl=item.get("content", {}).get("links", {}).get("image"),
+            ))
+    native_balance = result.get("nativeBalance", {})
+    total_value += native_balance["total_price"]
+    assets.append(LegacyAssetDTO(
+        name="Solana",
+        symbol="SOL",
+        amount=from_base_units(native_balance["lamports"], 9),
+        value=native_balance["total_price"],
+        percentage=0,
+        tokenId="SOL",
+        decimals=9,
+        price=native_balance["price_per_sol"],
+        currency="USDC",
+    ))
+    for asset in assets:
+        asset.percentage = round((asset.value / total_value) * 100, 1) if total_value > 0 else 0
+    return sorted(assets, key=lambda x: x.value, reverse=True)
+
+
+def legacy_parse_moralis(result: Dict[str, Any]) -> List[LegacyAssetDTO]:
+    """The previous get_wallet_data_by_moralis parsing loop."""
+    assets = []
+    total_value = 0.0
+    for token in result.get("result", []):
+        decimals = int(token.get("decimals", 0) or 0)
+        value = float(token.get("usd_value") or 0)
+        total_value += value
+        assets.append(LegacyAssetDTO(
+            name=token.get("name", ""),
+            symbol=token.get("symbol", ""),
+            amount=float(token.get("balance", 0)) / (10 ** decimals),
+            value=value,
+            percentage=0,
+            tokenId=token.get("token_address") or "",
+            decimals=decimals,
+            price=float(token.get("usd_price") or 0),
+            currency="USD",
+            imageUrl=token.get("logo") or None,
+        ))
+    for asset in assets:
+        asset.percentage = round((asset.value / total_value) * 100, 1) if total_value > 0 else 0
+    return sorted(assets, key=lambda x: x.value, reverse=True)
+
+
+def check_solana_tracker_parsing() -> None:
+    wallet = parse_solana_tracker_tokens(
+        WALLET_ADDRESS, WalletTokensResponse.model_validate(SOLANA_TRACKER_WALLET_FIXTURE)
+    )
+    assert wallet.totalValue == SOLANA_TRACKER_WALLET_FIXTURE["total"], wallet.totalValue
+    assert [asset.tokenId for asset in wallet.assets] == [
+        "SOL",
+        "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        "Dust111111111111111111111111111111111111111",
+    ], "Solana Tracker assets differ"
+    assert wallet.assets[0].price == 150.2 and wallet.assets[0].percentage == 54.5, wallet.assets[0]
+    print("Solana Tracker fixture parsed")
+
+
+def as_comparable(assets: List[BaseModel]) -> List[Dict[str, Any]]:
+    # The previous assets were not tagged with their chain
+    return [asset.model_dump(mode="json", exclude={"chain"}) for asset in assets]
+
+
+def measure(name: str, iterations: int, parse: Callable[[], Any], baseline: float | None = None) -> float:
+    parse()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse()
+    elapsed_ms = (time.perf_counter() - start) / iterations * 1000
+    speedup = f"  x{baseline / elapsed_ms:.1f}" if baseline else ""
+    print(f"  {name:<10} {elapsed_ms:>8.2f} ms{speedup}")
+    return elapsed_ms
+
+
+def main():
+    """Main function to run the wallet parsing benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark Helius/Moralis wallet parsing")
+    parser.add_argument("--assets", type=int, default=1000, help="Tokens per wallet")
+    parser.add_argument("--iterations", type=int, default=50, help="Parses per measurement")
+    args = parser.parse_args()
+
+    check_solana_tracker_parsing()
+
+    helius_result = build_helius_result(args.assets)
+    assert as_comparable(parse_helius_assets(WALLET_ADDRESS, helius_result)[0].assets) == as_comparable(
+        legacy_parse_helius(helius_result)
+    ), "Helius fast path output differs"
+    print(f"Helius, {args.assets} tokens")
+    baseline = measure("legacy", args.iterations, lambda: legacy_parse_helius(helius_result))
+    measure("fast path", args.iterations, lambda: parse_helius_assets(WALLET_ADDRESS, helius_result), baseline)
+
+    moralis_result = build_moralis_result(args.assets)
+    assert as_comparable(parse_moralis_balances(WALLET_ADDRESS, ChainEnum.BASE, moralis_result).assets) == as_comparable(
+        legacy_parse_moralis(moralis_result)
+    ), "Moralis fast path output differs"
+    print(f"Moralis, {args.assets} tokens")
+    baseline = measure("legacy", args.iterations, lambda: legacy_parse_moralis(moralis_result))
+    measure(
+        "fast path",
+        args.iterations,
+        lambda: parse_moralis_balances(WALLET_ADDRESS, ChainEnum.BASE, moralis_result),
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    main()
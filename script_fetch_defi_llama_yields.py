@@ -14,6 +14,8 @@ import requests
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database import get_db_context
+from app.infrastructure.metrics import observe_upstream
+from app.infrastructure.upstream_policy import UpstreamPolicy
 from app.repositories.YieldPoolRepository import YieldPoolRepository
 
 # Configure logging
@@ -37,6 +39,12 @@ class YieldPoolFetcher:
         )
         os.makedirs(self.data_dir, exist_ok=True)
 
+    @observe_upstream("defillama", "yields")
+    def _get_yields(self) -> requests.Response:
+        response = requests.get(self.DEFI_LLAMA_API_URL, timeout=60)
+        response.raise_for_status()  # Raise exception for HTTP errors
+        return response
+
     def fetch_yield_pools(
         self,
         chain: Optional[str] = None,
@@ -58,8 +66,8 @@ class YieldPoolFetcher:
         """
         logger.info(f"Fetching data from {self.DEFI_LLAMA_API_URL}...")
 
-        response = requests.get(self.DEFI_LLAMA_API_URL)
-        response.raise_for_status()  # Raise exception for HTTP errors
+        # Rate limited and retried on transient errors
+        response = UpstreamPolicy("defillama").call(self._get_yields)
 
         data = response.json()
         pools = data.get("data", [])